@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Mapping
 
 
 @dataclass(frozen=True)
@@ -22,6 +23,44 @@ class HistoryConfig:
     short_window: int = 60  # seconds
     medium_window: int = 300
     long_window: int = 1800
+    archive_window: int = 86400
+    medium_resolution: int = 10  # seconds per rollup bucket, kept for long_window
+    long_resolution: int = 60  # seconds per rollup bucket, kept for archive_window
+    persist: bool = True  # memory-mapped rings under DATA_DIR / "history"
+    max_series: int = 1024  # columns per family and tier (core, disk, sensor, GPU fields); more are not stored
+
+
+@dataclass(frozen=True)
+class CollectorConfig:
+    """Concurrency limits for the background data collector."""
+
+    max_workers: int = 6
+    provider_deadline: int = 800  # milliseconds per provider and tick
+    provider_deadlines: Mapping[str, int] = field(default_factory=dict)  # per-provider overrides
+    process_backend: str = "auto"  # "procfs" lee /proc directamente, "psutil" usa psutil.Process
+    statvfs_timeout: int = 200  # milliseconds the disk provider waits for statvfs answers
+    statvfs_ttl: int = 5000  # milliseconds a filesystem usage reading is reused
+    gpu_backend: str = "auto"  # "nvidia-smi" (proceso persistente con --loop-ms), "nvml" o "none"
+    gpu_command: tuple[str, ...] = ("nvidia-smi",)  # p. ej. ("python", "scripts/fake_nvidia_smi.py")
+
+    def deadline_for(self, provider: str) -> float:
+        """Return the deadline for ``provider`` in seconds."""
+
+        return self.provider_deadlines.get(provider, self.provider_deadline) / 1000.0
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Tuning for the HTTP server and its long-lived connections."""
+
+    engine: str = "threading"  # "asyncio" atiende todas las conexiones en un único bucle
+    max_connections: int = 4096  # solo motor asyncio; el resto se rechaza al aceptar
+    idle_timeout_seconds: int = 30  # conexiones keep-alive sin petición (motor asyncio)
+    max_stream_clients: int = 64
+    stream_keepalive_seconds: int = 15  # comment frame when no tick arrives
+    stream_write_timeout_seconds: int = 5  # slow consumers are dropped after this
+    compression_level: int = 6  # gzip 1-9, br 0-11, zstd 1-22; se recorta a cada rango
+    compression_min_bytes: int = 1024  # cuerpos menores se envían sin comprimir
 
 
 @dataclass(frozen=True)
@@ -42,4 +81,6 @@ APP_ID = "com.example.mission_center"
 DATA_DIR = Path.home() / ".mission_center"
 CONFIG = UpdateIntervals()
 HISTORY = HistoryConfig()
+COLLECTOR = CollectorConfig()
+SERVER = ServerConfig()
 SECURITY = SecurityConfig()
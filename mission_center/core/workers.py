@@ -0,0 +1,109 @@
+"""Worker pool whose threads never block interpreter exit."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from itertools import count
+from typing import Any, Callable
+
+
+class DaemonExecutor:
+    """Small ``ThreadPoolExecutor`` replacement built on daemon threads.
+
+    ``concurrent.futures`` joins its workers at interpreter exit, so a call
+    stuck in the kernel (hung NFS server, wedged driver) keeps the process
+    alive after Ctrl+C. These workers are daemon threads and are never
+    joined. ``max_workers`` bounds the workers serving the queue; a worker
+    busy with one call for more than ``stuck_after`` seconds stops counting
+    towards it, so stuck calls cannot starve the rest. Extra workers started
+    meanwhile retire once the pool is back under the bound.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "worker", stuck_after: float | None = None) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.thread_name_prefix = thread_name_prefix
+        self.stuck_after = stuck_after
+        self._condition = threading.Condition()
+        self._queue: deque[tuple[Future[Any], Callable[..., Any], tuple[Any, ...], dict[str, Any]]] = deque()
+        self._busy_since: dict[int, float] = {}
+        self._workers = 0
+        self._idle = 0
+        self._ids = count()
+        self._shutdown = False
+
+    def _stuck(self, now: float) -> int:
+        if self.stuck_after is None:
+            return 0
+        return sum(1 for started in self._busy_since.values() if now - started > self.stuck_after)
+
+    def _active(self) -> int:
+        """Workers that count towards ``max_workers`` (idle or busy but not stuck)."""
+
+        return self._workers - self._stuck(time.monotonic())
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("El pool está cerrado")
+            self._queue.append((future, fn, args, kwargs))
+            self._condition.notify()
+            self._grow()
+        return future
+
+    def revive(self) -> None:
+        """Start workers for queued calls if busy ones have become stuck since the last submit."""
+
+        with self._condition:
+            self._grow()
+
+    def _grow(self) -> None:
+        # Libres = vivos sin llamada en curso (en espera o recién creados)
+        while self._workers - len(self._busy_since) < len(self._queue) and self._active() < self.max_workers:
+            self._spawn()
+
+    def _spawn(self) -> None:
+        ident = next(self._ids)
+        self._workers += 1
+        threading.Thread(
+            target=self._work, args=(ident,), name=f"{self.thread_name_prefix}_{ident}", daemon=True
+        ).start()
+
+    def _work(self, ident: int) -> None:
+        while True:
+            with self._condition:
+                self._idle += 1
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                self._idle -= 1
+                if not self._queue:
+                    self._workers -= 1
+                    return
+                future, fn, args, kwargs = self._queue.popleft()
+                self._busy_since[ident] = time.monotonic()
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            with self._condition:
+                del self._busy_since[ident]
+                # Sobrante: se creó mientras otros estaban atascados y ya hay suficientes
+                if self._active() > self.max_workers:
+                    self._workers -= 1
+                    return
+
+    def shutdown(self, cancel_futures: bool = False) -> None:
+        """Stop accepting work and let idle workers exit; never waits for running calls."""
+
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                while self._queue:
+                    self._queue.popleft()[0].cancel()
+            self._condition.notify_all()
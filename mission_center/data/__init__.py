@@ -2,32 +2,43 @@
 
 from .cpu import collect_cpu_snapshot
 from .disk import collect_disk_snapshot
-from .gpu import collect_gpu_snapshot
+from .gpu import close_gpu_backend, collect_gpu_snapshot, gpu_backend, last_gpu_snapshot, set_gpu_backend
 from .io import collect_io_snapshot
 from .memory import collect_memory_snapshot
+from .mounts import configure_filesystem_usage
 from .network import collect_network_snapshot
 from .pcie import collect_pcie_snapshot
-from .processes import collect_process_snapshot
+from .pciids import resolve_pci_name
+from .processes import collect_process_snapshot, process_backend, set_process_backend
 from .sensors import (
     collect_battery_snapshot,
     collect_fan_sensors,
     collect_power_sources_snapshot,
     collect_temperature_sensors,
 )
-from .system import collect_system_info
+from .system import collect_system_info, rescan_system_info
 
 __all__ = [
     "collect_cpu_snapshot",
     "collect_disk_snapshot",
     "collect_gpu_snapshot",
+    "close_gpu_backend",
+    "gpu_backend",
+    "last_gpu_snapshot",
+    "set_gpu_backend",
     "collect_io_snapshot",
     "collect_memory_snapshot",
+    "configure_filesystem_usage",
     "collect_network_snapshot",
     "collect_pcie_snapshot",
+    "resolve_pci_name",
     "collect_process_snapshot",
+    "process_backend",
+    "set_process_backend",
     "collect_battery_snapshot",
     "collect_fan_sensors",
     "collect_power_sources_snapshot",
     "collect_temperature_sensors",
     "collect_system_info",
+    "rescan_system_info",
 ]
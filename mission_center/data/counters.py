@@ -0,0 +1,258 @@
+"""Shared sampling of kernel counters and the rate engine built on it."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Mapping, NamedTuple, Sequence
+
+import psutil
+
+from .sysfs import SYSFS
+
+SECTOR_SIZE = 512  # /proc/diskstats cuenta sectores de 512 bytes sea cual sea el disco
+_WRAP_32 = 1 << 32
+
+
+class DiskCounters(NamedTuple):
+    """One ``/proc/diskstats`` row (Documentation/admin-guide/iostats.rst).
+
+    Fields missing on older kernels are zero. ``in_flight`` is a gauge; the
+    rest are cumulative.
+    """
+
+    read_count: int = 0
+    read_merged: int = 0
+    read_sectors: int = 0
+    read_time_ms: int = 0
+    write_count: int = 0
+    write_merged: int = 0
+    write_sectors: int = 0
+    write_time_ms: int = 0
+    in_flight: int = 0
+    io_ticks_ms: int = 0
+    weighted_time_ms: int = 0
+    discard_count: int = 0
+    discard_merged: int = 0
+    discard_sectors: int = 0
+    discard_time_ms: int = 0
+    flush_count: int = 0
+    flush_time_ms: int = 0
+
+
+_DISK_FIELDS = len(DiskCounters._fields)
+_IN_FLIGHT = DiskCounters._fields.index("in_flight")
+# Columnas que diskstats imprime como unsigned int (%u): los tiempos en ms
+_DISK_WRAP32 = tuple(
+    DiskCounters._fields.index(name)
+    for name in ("read_time_ms", "write_time_ms", "io_ticks_ms", "weighted_time_ms", "discard_time_ms", "flush_time_ms")
+)
+
+
+class RateEngine:
+    """Deltas between consecutive readings of cumulative kernel counters.
+
+    Readings are keyed tuples of integers. A key seen for the first time has
+    no delta. A counter that goes backwards is either a wrap of one of the
+    ``wrap32`` columns (printed by the kernel as 32-bit; the drop exceeds half
+    the range) and is unwrapped, or a reset (device re-plugged, interface
+    re-created) and the key starts over from the new baseline. Keys that
+    disappear are forgotten. Columns listed in ``gauges`` are instantaneous
+    values and are passed through unchanged.
+    """
+
+    def __init__(self, gauges: Iterable[int] = (), wrap32: Iterable[int] = ()) -> None:
+        self._gauges = frozenset(gauges)
+        self._wrap32 = frozenset(wrap32)
+        self._previous: dict[Hashable, Sequence[int]] = {}
+        self._previous_time: float | None = None
+
+    def update(
+        self, now: float, readings: Mapping[Hashable, Sequence[int]]
+    ) -> tuple[float | None, dict[Hashable, tuple[int, ...]]]:
+        """Store ``readings`` taken at monotonic ``now``; return ``(elapsed, deltas)``."""
+
+        previous, self._previous = self._previous, dict(readings)
+        elapsed = None if self._previous_time is None else now - self._previous_time
+        self._previous_time = now
+        if elapsed is None or elapsed <= 0:
+            return None, {}
+        deltas: dict[Hashable, tuple[int, ...]] = {}
+        for key, current in readings.items():
+            before = previous.get(key)
+            if before is None or len(before) != len(current):
+                continue
+            delta = self._delta(current, before)
+            if delta is not None:
+                deltas[key] = delta
+        return elapsed, deltas
+
+    def _delta(self, current: Sequence[int], before: Sequence[int]) -> tuple[int, ...] | None:
+        values: list[int] = []
+        for column, (now_value, old_value) in enumerate(zip(current, before)):
+            if column in self._gauges:
+                values.append(now_value)
+                continue
+            difference = now_value - old_value
+            if difference < 0:
+                if column in self._wrap32 and old_value < _WRAP_32 and -difference > _WRAP_32 // 2:
+                    difference += _WRAP_32
+                else:
+                    return None
+            values.append(difference)
+        return tuple(values)
+
+
+@dataclass(slots=True)
+class DiskStatsSample:
+    """``/proc/diskstats`` at one instant plus deltas against the previous read."""
+
+    timestamp: float
+    elapsed: float | None
+    devices: dict[str, DiskCounters]
+    deltas: dict[str, DiskCounters] = field(default_factory=dict)
+    # Discos completos (no particiones): los totales del sistema suman solo estos
+    whole_disks: frozenset[str] = frozenset()
+
+    def rate(self, name: str, column: str, scale: float = 1.0) -> float | None:
+        """Per-second rate of ``column`` for ``name``; ``None`` without a baseline."""
+
+        delta = self.deltas.get(name)
+        if delta is None or not self.elapsed:
+            return None
+        return getattr(delta, column) * scale / self.elapsed
+
+    def read_bytes_per_sec(self, name: str) -> float | None:
+        return self.rate(name, "read_sectors", SECTOR_SIZE)
+
+    def write_bytes_per_sec(self, name: str) -> float | None:
+        return self.rate(name, "write_sectors", SECTOR_SIZE)
+
+    def utilization_percent(self, name: str) -> float | None:
+        """Share of wall time with I/O in flight (``io_ticks``), as ``iostat %util``."""
+
+        busy = self.rate(name, "io_ticks_ms")
+        return None if busy is None else min(100.0, busy / 10.0)
+
+    def await_ms(self, name: str, kind: str) -> float | None:
+        """Mean milliseconds per completed ``kind`` request, as ``iostat r_await``.
+
+        ``kind`` is ``read``, ``write``, ``discard`` or ``flush``; 0 when the
+        interval had no such requests.
+        """
+
+        delta = self.deltas.get(name)
+        if delta is None:
+            return None
+        count = getattr(delta, f"{kind}_count")
+        return getattr(delta, f"{kind}_time_ms") / count if count else 0.0
+
+    def queue_size(self, name: str) -> float | None:
+        """Average requests queued or in service (``weighted_time`` over wall time), as ``aqu-sz``."""
+
+        return self.rate(name, "weighted_time_ms", 0.001)
+
+    def total_delta(self) -> DiskCounters | None:
+        """Summed deltas of the whole disks; ``None`` on the first sample."""
+
+        if self.elapsed is None:
+            return None
+        rows = [delta for name, delta in self.deltas.items() if name in self.whole_disks]
+        return DiskCounters(*(sum(column) for column in zip(*rows))) if rows else DiskCounters()
+
+
+def _parse_diskstats(data: bytes) -> dict[str, DiskCounters]:
+    devices: dict[str, DiskCounters] = {}
+    for line in data.splitlines():
+        fields = line.split()
+        if len(fields) < 7:
+            continue
+        name = fields[2].decode("utf-8", "replace")
+        values = [int(value) for value in fields[3:3 + _DISK_FIELDS]]
+        if len(values) == 4:
+            # Particiones en kernels 2.6 antiguos: lecturas, sectores, escrituras, sectores
+            devices[name] = DiskCounters(read_count=values[0], read_sectors=values[1],
+                                         write_count=values[2], write_sectors=values[3])
+        else:
+            devices[name] = DiskCounters(*values)
+    return devices
+
+
+def _psutil_diskstats() -> dict[str, DiskCounters]:
+    """Portable fallback with the fields psutil exposes on every platform."""
+
+    try:
+        per_disk = psutil.disk_io_counters(perdisk=True) or {}
+    except (OSError, RuntimeError, NotImplementedError):  # pragma: no cover - platform specific
+        return {}
+    return {
+        name: DiskCounters(
+            read_count=counters.read_count,
+            read_merged=getattr(counters, "read_merged_count", 0),
+            read_sectors=counters.read_bytes // SECTOR_SIZE,
+            read_time_ms=counters.read_time,
+            write_count=counters.write_count,
+            write_merged=getattr(counters, "write_merged_count", 0),
+            write_sectors=counters.write_bytes // SECTOR_SIZE,
+            write_time_ms=counters.write_time,
+            io_ticks_ms=getattr(counters, "busy_time", 0),
+        )
+        for name, counters in per_disk.items()
+    }
+
+
+class DiskStatsSampler:
+    """Reads the block-device counters once per tick for every provider.
+
+    Calls within ``coalesce`` seconds of the last read (the disk and I/O
+    providers run in parallel in the same tick) get the same
+    :class:`DiskStatsSample`, so they share one parse, one timestamp and one
+    set of deltas from the :class:`RateEngine`. Without ``/proc/diskstats``
+    the counters come from :func:`psutil.disk_io_counters`.
+    """
+
+    def __init__(self, path: str = "/proc/diskstats", coalesce: float = 0.25) -> None:
+        self.path = path
+        self.coalesce = coalesce
+        self._lock = threading.Lock()
+        self._engine = RateEngine(gauges=(_IN_FLIGHT,), wrap32=_DISK_WRAP32)
+        self._last: DiskStatsSample | None = None
+        self._last_at = 0.0
+        self._names: frozenset[str] = frozenset()
+        self._whole_disks: frozenset[str] = frozenset()
+
+    def _classify(self, names: frozenset[str]) -> frozenset[str]:
+        # Solo se recalcula cuando cambia el conjunto de dispositivos (hotplug)
+        if names != self._names:
+            self._names = names
+            if os.path.isdir("/sys/block"):
+                self._whole_disks = frozenset(
+                    name for name in names if os.path.exists("/sys/block/" + name.replace("/", "!"))
+                )
+            else:
+                self._whole_disks = names
+        return self._whole_disks
+
+    def sample(self) -> DiskStatsSample:
+        with self._lock:
+            now = time.monotonic()
+            if self._last is not None and now - self._last_at < self.coalesce:
+                return self._last
+            data = SYSFS.read_bytes(self.path)
+            devices = _parse_diskstats(data) if data is not None else _psutil_diskstats()
+            elapsed, deltas = self._engine.update(now, devices)
+            self._last = DiskStatsSample(
+                timestamp=time.time(),
+                elapsed=elapsed,
+                devices=devices,
+                deltas={name: DiskCounters(*delta) for name, delta in deltas.items()},
+                whole_disks=self._classify(frozenset(devices)),
+            )
+            self._last_at = now
+            return self._last
+
+
+# Muestreador compartido por los proveedores de disco y E/S
+DISKSTATS = DiskStatsSampler()
@@ -4,12 +4,26 @@ from __future__ import annotations
 
 import os
 import time
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Any, Iterable
 
 import psutil
 
 from mission_center.models.resource_snapshot import CPUCoreMetric, CPUSnapshot
 
+from .sysfs import SYSFS
+
+try:
+    import numpy as np  # type: ignore[import]
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+_PROC_STAT = "/proc/stat"
+# user nice system idle iowait irq softirq steal; guest y guest_nice ya van
+# incluidos en user/nice, igual que en psutil
+_TIME_COLUMNS = 8
+_USER, _NICE, _SYSTEM, _IDLE, _IOWAIT, _IRQ, _SOFTIRQ, _STEAL = range(_TIME_COLUMNS)
+
 
 def _safe_load_average() -> tuple[float, float, float] | None:
     try:
@@ -28,10 +42,185 @@ def _core_frequencies(freqs: Iterable[object]) -> list[float | None]:
     return values
 
 
+@dataclass(slots=True)
+class CPUTimesSample:
+    """Utilisation derived from one read of ``/proc/stat``."""
+
+    usage_percent: float
+    per_core: list[float]
+    user_percent: float
+    system_percent: float
+    iowait_percent: float
+    steal_percent: float
+    context_switches: int | None
+    interrupts: int | None
+    context_switches_per_sec: float | None
+    interrupts_per_sec: float | None
+
+
+def _percentages(times: Any, previous: Any) -> tuple[list[float], list[float]]:
+    """Return ``(busy %, aggregate breakdown %)`` from two jiffy matrices.
+
+    Row 0 is the aggregate ``cpu`` line and the rest are the cores. ``previous``
+    is ``None`` on the first sample, which yields the averages since boot.
+    """
+
+    if np is not None:
+        delta = times if previous is None else np.maximum(times - previous, 0)
+        total = delta.sum(axis=1)
+        busy = total - delta[:, _IDLE] - delta[:, _IOWAIT]
+        scale = 100.0 / np.maximum(total, 1)
+        row = delta[0] * scale[0]
+        breakdown = [
+            row[_USER] + row[_NICE],
+            row[_SYSTEM] + row[_IRQ] + row[_SOFTIRQ],
+            row[_IOWAIT],
+            row[_STEAL],
+        ]
+        return np.round(busy * scale, 1).tolist(), [round(float(value), 1) for value in breakdown]
+
+    if previous is None:
+        deltas = times
+    else:
+        deltas = [[max(0, now - before) for now, before in zip(row, old)] for row, old in zip(times, previous)]
+    busy: list[float] = []
+    for row in deltas:
+        total = sum(row)
+        busy.append(round((total - row[_IDLE] - row[_IOWAIT]) * 100.0 / total, 1) if total else 0.0)
+    row = deltas[0]
+    scale = 100.0 / (sum(row) or 1)
+    breakdown = [
+        (row[_USER] + row[_NICE]) * scale,
+        (row[_SYSTEM] + row[_IRQ] + row[_SOFTIRQ]) * scale,
+        row[_IOWAIT] * scale,
+        row[_STEAL] * scale,
+    ]
+    return busy, [round(value, 1) for value in breakdown]
+
+
+class ProcStatSampler:
+    """Total, per-core and breakdown utilisation from a single ``/proc/stat`` read.
+
+    The ``cpu``/``cpuN`` lines are parsed into one jiffy matrix (NumPy when
+    available) and every percentage is computed from the delta against the
+    previous matrix in one pass. ``ctxt`` and ``intr`` come from the same read
+    and are turned into per-second rates. When the set of online cores
+    changes the baseline is reset.
+    """
+
+    def __init__(self, path: str = _PROC_STAT) -> None:
+        self.path = path
+        self._ids: list[bytes] = []
+        self._times: Any = None
+        self._counters: tuple[float, int | None, int | None] | None = None
+
+    def sample(self) -> CPUTimesSample | None:
+        data = SYSFS.read_bytes(self.path)
+        if data is None:
+            return None
+        now = time.monotonic()
+        ids: list[bytes] = []
+        rows: list[list[bytes]] = []
+        context_switches = interrupts = None
+        for line in data.splitlines():
+            if line.startswith(b"cpu"):
+                fields = line.split(None, _TIME_COLUMNS + 1)
+                ids.append(fields[0])
+                rows.append(fields[1:_TIME_COLUMNS + 1])
+            elif line.startswith(b"ctxt "):
+                context_switches = int(line[5:])
+            elif line.startswith(b"intr "):
+                interrupts = int(line.split(None, 2)[1])
+        if not rows or len(rows[0]) < _TIME_COLUMNS:
+            return None
+
+        times: Any
+        if np is not None:
+            times = np.array(rows, dtype=np.int64)
+        else:
+            times = [[int(value) for value in row] for row in rows]
+        previous = self._times if ids == self._ids else None
+        busy, (user, system, iowait, steal) = _percentages(times, previous)
+        self._ids, self._times = ids, times
+
+        context_rate = interrupt_rate = None
+        if self._counters is not None:
+            last_time, last_context, last_interrupts = self._counters
+            elapsed = now - last_time
+            if elapsed > 0 and context_switches is not None and last_context is not None:
+                context_rate = round(max(0.0, (context_switches - last_context) / elapsed), 1)
+            if elapsed > 0 and interrupts is not None and last_interrupts is not None:
+                interrupt_rate = round(max(0.0, (interrupts - last_interrupts) / elapsed), 1)
+        self._counters = (now, context_switches, interrupts)
+
+        return CPUTimesSample(
+            usage_percent=busy[0],
+            per_core=busy[1:],
+            user_percent=user,
+            system_percent=system,
+            iowait_percent=iowait,
+            steal_percent=steal,
+            context_switches=context_switches,
+            interrupts=interrupts,
+            context_switches_per_sec=context_rate,
+            interrupts_per_sec=interrupt_rate,
+        )
+
+
+_SAMPLER = ProcStatSampler()
+_PHYSICAL_CORES: list[int | None] = []  # se calcula una vez: la topología no cambia
+
+
+def _physical_cores() -> int | None:
+    if not _PHYSICAL_CORES:
+        _PHYSICAL_CORES.append(psutil.cpu_count(logical=False))
+    return _PHYSICAL_CORES[0]
+
+
 def collect_cpu_snapshot() -> CPUSnapshot:
     """Return a CPU usage snapshot."""
 
     timestamp = time.time()
+    sample = _SAMPLER.sample()
+    if sample is None:
+        return _collect_with_psutil(timestamp)
+
+    freq_per_core = psutil.cpu_freq(percpu=True) or []
+    core_freqs = _core_frequencies(freq_per_core)
+    known_freqs = [value for value in core_freqs if value is not None]
+    max_freqs = [float(getattr(freq, "max", 0.0) or 0.0) for freq in freq_per_core]
+    per_core_metrics = [
+        CPUCoreMetric(
+            core_id=i,
+            usage_percent=percent,
+            frequency_mhz=core_freqs[i] if i < len(core_freqs) else None,
+        )
+        for i, percent in enumerate(sample.per_core)
+    ]
+    return CPUSnapshot(
+        timestamp=timestamp,
+        usage_percent=sample.usage_percent,
+        per_core=per_core_metrics,
+        # Igual que psutil.cpu_freq(): media de los núcleos, sin segunda lectura de sysfs
+        frequency_current_mhz=sum(known_freqs) / len(known_freqs) if known_freqs else None,
+        frequency_max_mhz=max(max_freqs) if max_freqs else None,
+        load_average=_safe_load_average(),
+        logical_cores=len(sample.per_core) or os.cpu_count() or 1,
+        physical_cores=_physical_cores(),
+        context_switches=sample.context_switches,
+        interrupts=sample.interrupts,
+        user_percent=sample.user_percent,
+        system_percent=sample.system_percent,
+        iowait_percent=sample.iowait_percent,
+        steal_percent=sample.steal_percent,
+        context_switches_per_sec=sample.context_switches_per_sec,
+        interrupts_per_sec=sample.interrupts_per_sec,
+    )
+
+
+def _collect_with_psutil(timestamp: float) -> CPUSnapshot:
+    """Portable path for systems without a readable ``/proc/stat``."""
+
     usage_percent = psutil.cpu_percent(interval=None)
     percpu = psutil.cpu_percent(interval=None, percpu=True)
     freq = psutil.cpu_freq()
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import logging
+import os
+import shutil
 import subprocess
+import threading
 import time
-from typing import Iterator
+from typing import Iterator, Sequence
 
 from mission_center.models.resource_snapshot import GPUSnapshot
 
@@ -13,6 +17,22 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
     pynvml = None  # type: ignore[assignment]
 
+logger = logging.getLogger(__name__)
+
+# index y count van primero: cada iteración de --loop-ms son ``count`` filas
+_QUERY_FIELDS = (
+    "index",
+    "count",
+    "name",
+    "utilization.gpu",
+    "memory.total",
+    "memory.used",
+    "temperature.gpu",
+    "clocks.current.graphics",
+    "clocks.current.memory",
+)
+_MAX_RESTART_DELAY = 60.0
+
 
 def _iter_nvml_handles() -> Iterator[int]:
     assert pynvml is not None
@@ -21,121 +41,355 @@ def _iter_nvml_handles() -> Iterator[int]:
         yield pynvml.nvmlDeviceGetHandleByIndex(index)
 
 
-def _collect_nvidia_smi_data() -> list[GPUSnapshot]:
-    """Collect NVIDIA GPU data using nvidia-smi command."""
-    timestamp = time.time()
-    snapshots: list[GPUSnapshot] = []
-    
+def _number(text: str) -> float:
+    # "[Not Supported]", "[N/A]"... se publican como 0, igual que antes
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def _parse_smi_line(line: str, timestamp: float) -> tuple[int, int, GPUSnapshot] | None:
+    """Parse one ``--format=csv,noheader,nounits`` row into ``(index, count, snapshot)``."""
+
+    parts = [part.strip() for part in line.split(",")]
+    if len(parts) < 7:
+        return None
     try:
-        # Query nvidia-smi for GPU data
-        cmd = [
-            "nvidia-smi",
-            "--query-gpu=name,utilization.gpu,memory.total,memory.used,temperature.gpu,clocks.current.graphics,clocks.current.memory",
-            "--format=csv,noheader,nounits"
+        index = int(parts[0])
+        count = int(parts[1])
+        memory_total = int(_number(parts[4])) * 1024 * 1024  # MiB -> bytes
+        memory_used = int(_number(parts[5])) * 1024 * 1024
+    except ValueError:
+        return None
+    return index, count, GPUSnapshot(
+        timestamp=timestamp,
+        name=parts[2],
+        vendor="NVIDIA",
+        memory_total_bytes=memory_total,
+        memory_used_bytes=memory_used,
+        utilization_percent=_number(parts[3]),
+        temperature_celsius=_number(parts[6]),
+        extra={
+            "graphics_clock_mhz": _number(parts[7]) if len(parts) > 7 else 0.0,
+            "memory_clock_mhz": _number(parts[8]) if len(parts) > 8 else 0.0,
+        },
+    )
+
+
+class NvidiaSmiSession:
+    """One long-lived ``nvidia-smi --loop-ms`` child whose CSV stream is parsed as it arrives.
+
+    A reader thread collects the ``count`` rows of each iteration and swaps in
+    the finished batch, so :meth:`sample` only copies the latest one. The
+    health check runs on every :meth:`sample`: a child that exited or has
+    been silent for ``stale_after`` seconds is killed and restarted with an
+    exponential backoff capped at one minute. ``command`` is the executable
+    and any leading arguments (e.g. a fake script); the query options are
+    appended. When ``stdbuf`` is available the child runs under ``stdbuf -oL``
+    so each row reaches the pipe as soon as it is printed.
+    """
+
+    name = "nvidia-smi"
+
+    def __init__(
+        self,
+        command: Sequence[str] = ("nvidia-smi",),
+        loop_ms: int = 1000,
+        stale_after: float | None = None,
+    ) -> None:
+        self.command = tuple(command)
+        # Salida por líneas aunque stdout sea una tubería
+        self._prefix = ("stdbuf", "-oL") if shutil.which("stdbuf") and os.path.basename(self.command[0]) != "stdbuf" else ()
+        self.loop_ms = max(100, int(loop_ms))
+        self.stale_after = stale_after if stale_after is not None else max(5.0, 3 * self.loop_ms / 1000.0)
+        self._lock = threading.Lock()
+        self._batch_ready = threading.Condition(self._lock)
+        self._process: subprocess.Popen[str] | None = None
+        self._latest: list[GPUSnapshot] = []
+        self._latest_at = 0.0
+        self._last_line_at = 0.0
+        self._spawned_at = 0.0
+        self._started_at = 0.0  # primer intento de arranque
+        self._produced = False
+        self._restart_delay = 1.0
+        self._retry_at = 0.0
+        self.restarts = 0
+
+    def _argv(self) -> list[str]:
+        return [
+            *self._prefix,
+            *self.command,
+            f"--query-gpu={','.join(_QUERY_FIELDS)}",
+            "--format=csv,noheader,nounits",
+            f"--loop-ms={self.loop_ms}",
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-        
-        if result.returncode != 0:
-            return snapshots
-            
-        for line in result.stdout.strip().split('\n'):
-            if not line.strip():
+
+    def _spawn(self, now: float) -> None:
+        try:
+            process = subprocess.Popen(
+                self._argv(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as exc:
+            logger.debug("No se pudo lanzar %s: %s", self.command[0], exc)
+            self._backoff(now)
+            return
+        self._process = process
+        self._last_line_at = self._spawned_at = now
+        threading.Thread(
+            target=self._read, args=(process,), name="nvidia-smi-reader", daemon=True
+        ).start()
+
+    def _backoff(self, now: float) -> None:
+        self._retry_at = now + self._restart_delay
+        self._restart_delay = min(_MAX_RESTART_DELAY, self._restart_delay * 2)
+
+    def _read(self, process: subprocess.Popen[str]) -> None:
+        assert process.stdout is not None
+        batch: dict[int, GPUSnapshot] = {}
+        for line in process.stdout:
+            now = time.monotonic()
+            parsed = _parse_smi_line(line, time.time())
+            with self._lock:
+                if self._process is not process:
+                    break
+                self._last_line_at = now
+            if parsed is None:
                 continue
-                
-            parts = [p.strip() for p in line.split(',')]
-            if len(parts) >= 5:
-                name = parts[0]
-                utilization = float(parts[1]) if parts[1] != "[Not Supported]" else 0.0
-                memory_total = int(parts[2]) * 1024 * 1024  # Convert MiB to bytes
-                memory_used = int(parts[3]) * 1024 * 1024   # Convert MiB to bytes
-                temperature = float(parts[4]) if parts[4] != "[Not Supported]" else 0.0
-                graphics_clock = float(parts[5]) if len(parts) > 5 and parts[5] != "[Not Supported]" else 0.0
-                memory_clock = float(parts[6]) if len(parts) > 6 and parts[6] != "[Not Supported]" else 0.0
-                
-                extra = {
-                    "graphics_clock_mhz": graphics_clock,
-                    "memory_clock_mhz": memory_clock,
-                }
-                
-                snapshots.append(
-                    GPUSnapshot(
-                        timestamp=timestamp,
-                        name=name,
-                        vendor="NVIDIA",
-                        memory_total_bytes=memory_total,
-                        memory_used_bytes=memory_used,
-                        utilization_percent=utilization,
-                        temperature_celsius=temperature,
-                        extra=extra,
-                    )
-                )
-    except (subprocess.SubprocessError, ValueError, IndexError):
-        pass  # Fall back to empty list
-        
-    return snapshots
+            index, count, snapshot = parsed
+            if index in batch:
+                # Iteración incompleta (GPU retirada a mitad de la salida)
+                batch = {}
+            batch[index] = snapshot
+            if len(batch) >= count:
+                self._publish(batch, now)
+                batch = {}
+        process.stdout.close()
 
+    def _publish(self, batch: dict[int, GPUSnapshot], now: float) -> None:
+        with self._lock:
+            self._latest = [batch[index] for index in sorted(batch)]
+            self._latest_at = now
+            self._produced = True
+            self._restart_delay = 1.0
+            self._batch_ready.notify_all()
 
-def _collect_pynvml_data() -> list[GPUSnapshot]:
-    """Collect GPU data using pynvml library."""
-    timestamp = time.time()
-    snapshots: list[GPUSnapshot] = []
-    
-    if pynvml is None:
-        return snapshots
+    def _healthy(self, now: float) -> bool:
+        process = self._process
+        if process is None or process.poll() is not None:
+            return False
+        return now - self._last_line_at < self.stale_after
 
-    try:
+    def _stop_process(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:  # pragma: no cover - kill ignored
+            pass
+
+    def silent(self) -> bool:
+        """True when no batch at all has arrived within ``stale_after`` of the first start."""
+
+        return bool(self._started_at) and not self._produced and time.monotonic() - self._started_at >= self.stale_after
+
+    def sample(self, wait: float = 0.5) -> list[GPUSnapshot]:
+        """Latest batch; after a (re)start waits up to ``wait`` seconds for the first one."""
+
+        now = time.monotonic()
+        with self._lock:
+            if not self._started_at:
+                self._started_at = now
+            if not self._healthy(now):
+                if self._process is not None:
+                    logger.warning("nvidia-smi no responde o terminó; se reinicia")
+                    self._stop_process()
+                    self.restarts += 1
+                    self._backoff(now)
+                if now >= self._retry_at:
+                    self._spawn(now)
+            if self._process is not None and self._latest_at < self._spawned_at and wait > 0:
+                self._batch_ready.wait(wait)
+            if time.monotonic() - self._latest_at > self.stale_after:
+                return []
+            return list(self._latest)
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop_process()
+            self._latest, self._latest_at = [], 0.0
+            self._retry_at = 0.0
+
+
+class NvmlSession:
+    """NVML initialised once with the device handles and names cached.
+
+    Any ``NVMLError`` while reading (driver reload, GPU lost) shuts NVML down;
+    the next :meth:`sample` re-initialises it after the same backoff as the
+    ``nvidia-smi`` session.
+    """
+
+    name = "nvml"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._devices: list[tuple[object, str]] | None = None
+        self._restart_delay = 1.0
+        self._retry_at = 0.0
+        self.restarts = 0
+
+    def _start(self) -> None:
+        assert pynvml is not None
         pynvml.nvmlInit()
+        devices = []
         for handle in _iter_nvml_handles():
-            name = pynvml.nvmlDeviceGetName(handle).decode("utf-8")
-            vendor = "NVIDIA"
+            name = pynvml.nvmlDeviceGetName(handle)
+            devices.append((handle, name.decode("utf-8") if isinstance(name, bytes) else str(name)))
+        self._devices = devices
+
+    def _read(self, timestamp: float) -> list[GPUSnapshot]:
+        assert pynvml is not None and self._devices is not None
+        snapshots: list[GPUSnapshot] = []
+        for handle, name in self._devices:
             memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
             util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-            temperature = pynvml.nvmlDeviceGetTemperature(
-                handle, pynvml.NVML_TEMPERATURE_GPU
-            )
-            extra = {
-                "graphics_clock_mhz": pynvml.nvmlDeviceGetClockInfo(
-                    handle, pynvml.NVML_CLOCK_GRAPHICS
-                ),
-                "sm_clock_mhz": pynvml.nvmlDeviceGetClockInfo(
-                    handle, pynvml.NVML_CLOCK_SM
-                ),
-            }
+            temperature = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
             snapshots.append(
                 GPUSnapshot(
                     timestamp=timestamp,
                     name=name,
-                    vendor=vendor,
+                    vendor="NVIDIA",
                     memory_total_bytes=int(memory.total),
                     memory_used_bytes=int(memory.used),
                     utilization_percent=float(util.gpu),
                     temperature_celsius=float(temperature),
-                    extra=extra,
+                    extra={
+                        "graphics_clock_mhz": pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS),
+                        "sm_clock_mhz": pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_SM),
+                    },
                 )
             )
-    except Exception:
-        pass  # Fall back to empty list
-    finally:
+        return snapshots
+
+    def _shutdown(self) -> None:
+        self._devices = None
         try:
             pynvml.nvmlShutdown()
         except Exception:
             pass
 
-    return snapshots
+    def sample(self, wait: float = 0.0) -> list[GPUSnapshot]:
+        if pynvml is None:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            if self._devices is None:
+                if now < self._retry_at:
+                    return []
+                try:
+                    self._start()
+                except Exception as exc:
+                    logger.debug("NVML no disponible: %s", exc)
+                    self._shutdown()
+                    self._retry_at = now + self._restart_delay
+                    self._restart_delay = min(_MAX_RESTART_DELAY, self._restart_delay * 2)
+                    return []
+            try:
+                snapshots = self._read(time.time())
+            except Exception as exc:
+                logger.warning("NVML falló (%s); se reinicializa", exc)
+                self._shutdown()
+                self.restarts += 1
+                return []
+            self._restart_delay = 1.0
+            return snapshots
+
+    def close(self) -> None:
+        with self._lock:
+            if self._devices is not None:
+                self._shutdown()
+
+
+_BACKENDS = ("auto", "nvidia-smi", "nvml", "none")
+_SESSION: NvidiaSmiSession | NvmlSession | None = None
+_CONFIGURED = False
+_AUTO = False
+_LAST: list[GPUSnapshot] = []
+
+
+def set_gpu_backend(
+    backend: str = "auto",
+    command: Sequence[str] = ("nvidia-smi",),
+    loop_ms: int = 1000,
+) -> str:
+    """Replace the GPU session; returns the backend in use.
+
+    ``"auto"`` prefers a persistent ``nvidia-smi`` child when ``command`` is
+    on the ``PATH`` (it needs no Python bindings), then NVML, else ``"none"``.
+    An automatically chosen ``nvidia-smi`` that never produces a batch (driver
+    mismatch, container without devices) is replaced by NVML when available.
+    """
+
+    global _SESSION, _CONFIGURED, _AUTO
+    if backend not in _BACKENDS:
+        raise ValueError(f"Backend de GPU desconocido: {backend}")
+    _AUTO = backend == "auto"
+    if backend == "auto":
+        if command and shutil.which(command[0]):
+            backend = "nvidia-smi"
+        elif pynvml is not None:
+            backend = "nvml"
+        else:
+            backend = "none"
+    if _SESSION is not None:
+        _SESSION.close()
+    if backend == "nvidia-smi":
+        _SESSION = NvidiaSmiSession(command, loop_ms)
+    elif backend == "nvml":
+        _SESSION = NvmlSession()
+    else:
+        _SESSION = None
+    _CONFIGURED = True
+    return backend
+
+
+def gpu_backend() -> str:
+    return _SESSION.name if _SESSION is not None else "none"
+
+
+def close_gpu_backend() -> None:
+    """Stop the ``nvidia-smi`` child or shut NVML down; the next sample restarts it."""
+
+    if _SESSION is not None:
+        _SESSION.close()
 
 
 def collect_gpu_snapshot() -> list[GPUSnapshot]:
-    """Collect GPU information using available backends."""
-    
-    # Try nvidia-smi first (more reliable and doesn't require Python bindings)
-    snapshots = _collect_nvidia_smi_data()
-    if snapshots:
-        return snapshots
-    
-    # Fallback to pynvml
-    snapshots = _collect_pynvml_data()
-    if snapshots:
-        return snapshots
-        
-    # No GPU data available
-    return []
+    """Collect GPU information from the persistent backend session."""
+
+    if not _CONFIGURED:
+        set_gpu_backend()
+    global _LAST, _SESSION
+    session = _SESSION
+    snapshots = session.sample() if session is not None else []
+    if not snapshots and _AUTO and isinstance(session, NvidiaSmiSession) and pynvml is not None and session.silent():
+        logger.warning("nvidia-smi no ha dado datos en %.0f s; se usa NVML", session.stale_after)
+        session.close()
+        session = _SESSION = NvmlSession()
+        snapshots = session.sample()
+    _LAST = snapshots
+    return snapshots
+
+
+def last_gpu_snapshot() -> list[GPUSnapshot]:
+    """Result of the last :func:`collect_gpu_snapshot` call, without sampling again."""
+
+    return list(_LAST)
@@ -0,0 +1,221 @@
+"""Temperature and fan sensors read straight from hwmon with a cached layout."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from mission_center.models import FanSensorReading, TemperatureSensorGroup, TemperatureSensorReading
+
+from .sysfs import SYSFS, read_once
+
+_HWMON = "/sys/class/hwmon"
+_THERMAL = "/sys/class/thermal"
+_INPUT_RE = re.compile(r"^(temp|fan)(\d+)_input$")
+_TRIP_RE = re.compile(r"^trip_point_(\d+)_type$")
+
+
+@dataclass(frozen=True, slots=True)
+class _Channel:
+    """One ``*_input`` file plus the attributes that do not change between reads."""
+
+    source: str
+    label: str | None
+    input_path: str
+    high_celsius: float | None = None
+    critical_celsius: float | None = None
+
+
+@dataclass(slots=True)
+class HwmonSample:
+    """Temperatures and fans from one pass over the cached input files."""
+
+    timestamp: float
+    temperatures: list[TemperatureSensorGroup] = field(default_factory=list)
+    fans: list[FanSensorReading] = field(default_factory=list)
+
+
+def _millidegrees(text: str | None) -> float | None:
+    if text is None:
+        return None
+    try:
+        return int(text) / 1000.0
+    except ValueError:
+        return None
+
+
+def _listing(path: str) -> frozenset[str] | None:
+    try:
+        return frozenset(os.listdir(path))
+    except OSError:
+        return None
+
+
+def _natural(name: str) -> tuple[str, int]:
+    # hwmon2 antes que hwmon10, temp2 antes que temp10
+    digits = len(name) - len(name.rstrip("0123456789"))
+    return (name[:-digits], int(name[-digits:])) if digits else (name, -1)
+
+
+def _scan_hwmon_chip(directory: str) -> tuple[list[_Channel], list[_Channel]]:
+    source = read_once(os.path.join(directory, "name")) or os.path.basename(directory)
+    inputs: list[tuple[str, int, str]] = []
+    # Kernels antiguos exponen los canales en device/ en lugar de en el propio hwmonN
+    for base in (directory, os.path.join(directory, "device")):
+        try:
+            names = os.listdir(base)
+        except OSError:
+            continue
+        for name in names:
+            match = _INPUT_RE.match(name)
+            if match:
+                inputs.append((match.group(1), int(match.group(2)), os.path.join(base, name)))
+        if inputs:
+            break
+
+    temperatures: list[_Channel] = []
+    fans: list[_Channel] = []
+    for kind, index, path in sorted(inputs, key=lambda item: (item[0], item[1])):
+        prefix = path[: -len("_input")]
+        label = read_once(prefix + "_label")
+        if kind == "fan":
+            fans.append(_Channel(source=source, label=label, input_path=path))
+            continue
+        high = _millidegrees(read_once(prefix + "_max"))
+        critical = _millidegrees(read_once(prefix + "_crit"))
+        # Igual que psutil: si solo hay uno de los umbrales se usa para ambos
+        if high is not None and critical is None:
+            critical = high
+        elif critical is not None and high is None:
+            high = critical
+        temperatures.append(
+            _Channel(source=source, label=label, input_path=path, high_celsius=high, critical_celsius=critical)
+        )
+    return temperatures, fans
+
+
+def _scan_thermal_zone(directory: str) -> _Channel:
+    high = critical = None
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = []
+    for name in names:
+        match = _TRIP_RE.match(name)
+        if not match:
+            continue
+        trip_type = read_once(os.path.join(directory, name))
+        temperature = _millidegrees(read_once(os.path.join(directory, f"trip_point_{match.group(1)}_temp")))
+        if trip_type == "critical":
+            critical = temperature
+        elif trip_type == "hot":
+            high = temperature
+    return _Channel(
+        source=read_once(os.path.join(directory, "type")) or os.path.basename(directory),
+        label=None,
+        input_path=os.path.join(directory, "temp"),
+        high_celsius=high,
+        critical_celsius=critical,
+    )
+
+
+class HwmonSensors:
+    """Sensor layout discovered once; each sample only preads the ``*_input`` files.
+
+    A scan walks ``/sys/class/hwmon`` and records, per chip, its name, the
+    labels and ``*_max``/``*_crit`` thresholds of every temperature channel,
+    the fan labels and the input paths. The thresholds are read once: they
+    are limits set by firmware or the driver, not measurements. Without any
+    hwmon temperature the ``/sys/class/thermal`` zones are used instead. The
+    layout is rebuilt when the listing of either directory changes (a driver
+    loaded, a device plugged or removed). Temperature and fan providers run
+    in the same tick, so calls within ``coalesce`` seconds share one sample.
+    """
+
+    def __init__(self, root: str = _HWMON, thermal_root: str = _THERMAL, coalesce: float = 0.25) -> None:
+        self.root = root
+        self.thermal_root = thermal_root
+        self.coalesce = coalesce
+        self._lock = threading.Lock()
+        self._listings: tuple[frozenset[str] | None, frozenset[str] | None] | None = None
+        self._temperatures: list[_Channel] = []
+        self._fans: list[_Channel] = []
+        self._last: HwmonSample | None = None
+        self._last_at = 0.0
+
+    def available(self) -> bool:
+        return os.path.isdir(self.root) or os.path.isdir(self.thermal_root)
+
+    def _rescan(self, listings: tuple[frozenset[str] | None, frozenset[str] | None]) -> None:
+        hwmon, thermal = listings
+        temperatures: list[_Channel] = []
+        fans: list[_Channel] = []
+        for name in sorted(hwmon or (), key=_natural):
+            chip_temperatures, chip_fans = _scan_hwmon_chip(os.path.join(self.root, name))
+            temperatures.extend(chip_temperatures)
+            fans.extend(chip_fans)
+        if not temperatures:
+            temperatures = [
+                _scan_thermal_zone(os.path.join(self.thermal_root, name))
+                for name in sorted(thermal or (), key=_natural)
+                if name.startswith("thermal_zone")
+            ]
+        # Descriptores de los canales que ya no existen
+        current = {channel.input_path for channel in temperatures + fans}
+        for channel in self._temperatures + self._fans:
+            if channel.input_path not in current:
+                SYSFS.forget(channel.input_path)
+        self._temperatures, self._fans = temperatures, fans
+        self._listings = listings
+
+    def sample(self) -> HwmonSample:
+        with self._lock:
+            now = time.monotonic()
+            if self._last is not None and now - self._last_at < self.coalesce:
+                return self._last
+            listings = (_listing(self.root), _listing(self.thermal_root))
+            if listings != self._listings:
+                self._rescan(listings)
+
+            groups: dict[str, TemperatureSensorGroup] = {}
+            for channel in self._temperatures:
+                current = _millidegrees(SYSFS.read(channel.input_path))
+                if current is None:
+                    continue  # canal sin lectura este ciclo (sensor dormido, EIO)
+                group = groups.get(channel.source)
+                if group is None:
+                    group = groups[channel.source] = TemperatureSensorGroup(name=channel.source)
+                group.readings.append(
+                    TemperatureSensorReading(
+                        source=channel.source,
+                        label=channel.label,
+                        current_celsius=current,
+                        high_celsius=channel.high_celsius,
+                        critical_celsius=channel.critical_celsius,
+                    )
+                )
+            fans: list[FanSensorReading] = []
+            for channel in self._fans:
+                text = SYSFS.read(channel.input_path)
+                try:
+                    rpm = float(int(text)) if text is not None else None
+                except ValueError:
+                    rpm = None
+                if rpm is not None:
+                    fans.append(FanSensorReading(source=channel.source, label=channel.label, speed_rpm=rpm))
+
+            self._last = HwmonSample(timestamp=time.time(), temperatures=list(groups.values()), fans=fans)
+            self._last_at = now
+            return self._last
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._listings = None
+            self._last = None
+
+
+# Compartido por los proveedores de temperatura y ventiladores
+HWMON = HwmonSensors()
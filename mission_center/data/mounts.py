@@ -0,0 +1,237 @@
+"""Cached mount table and non-blocking filesystem usage."""
+
+from __future__ import annotations
+
+import os
+import select
+import threading
+import time
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+from typing import Iterable
+
+import psutil
+
+from mission_center.core.workers import DaemonExecutor
+
+_MOUNTINFO = "/proc/self/mountinfo"
+_POLL_CHANGED = getattr(select, "POLLPRI", 0) | getattr(select, "POLLERR", 0)
+
+# (total, used, free) en bytes, como psutil.disk_usage
+Usage = tuple[int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Mount:
+    device: str
+    mountpoint: str
+    fstype: str
+    st_dev: int | None  # major:minor del sistema de ficheros; None si no se conoce
+
+
+def _unescape(field: str) -> str:
+    # mountinfo escapa espacio, tabulador, salto de línea y barra invertida en octal
+    if "\\" not in field:
+        return field
+    return field.encode("latin-1").decode("unicode_escape").encode("latin-1").decode("utf-8", "replace")
+
+
+def _physical_fstypes() -> frozenset[str]:
+    """Filesystems backed by a device, as ``psutil.disk_partitions(all=False)``."""
+
+    types = {"zfs"}
+    try:
+        with open("/proc/filesystems", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.startswith("nodev"):
+                    types.add(line.strip())
+    except OSError:
+        pass
+    return frozenset(types)
+
+
+def _parse_mountinfo(text: str, fstypes: frozenset[str]) -> list[Mount]:
+    mounts: list[Mount] = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            separator = fields.index("-", 6)
+        except ValueError:
+            continue
+        fstype, device = fields[separator + 1], fields[separator + 2]
+        if device == "none" or fstype not in fstypes:
+            continue
+        major, _, minor = fields[2].partition(":")
+        mounts.append(
+            Mount(
+                device=_unescape(device),
+                mountpoint=_unescape(fields[4]),
+                fstype=fstype,
+                st_dev=os.makedev(int(major), int(minor)),
+            )
+        )
+    return mounts
+
+
+class MountTable:
+    """Mount list reloaded only when the kernel reports a change.
+
+    ``/proc/self/mountinfo`` stays open and is registered with ``poll()``;
+    the kernel raises POLLPRI/POLLERR on it after any mount or unmount, so a
+    tick without changes costs one zero-timeout ``poll`` call. Without
+    mountinfo (non-Linux) the list comes from :func:`psutil.disk_partitions`
+    and is refreshed every ``fallback_ttl`` seconds.
+    """
+
+    def __init__(self, path: str = _MOUNTINFO, fallback_ttl: float = 30.0) -> None:
+        self.path = path
+        self.fallback_ttl = fallback_ttl
+        self._lock = threading.Lock()
+        self._mounts: list[Mount] | None = None
+        self._loaded_at = 0.0
+        self._fstypes = _physical_fstypes()
+        self._handle = None
+        self._poller = None
+        try:
+            self._handle = open(path, "rb")
+        except OSError:
+            return
+        if hasattr(select, "poll"):
+            self._poller = select.poll()
+            self._poller.register(self._handle, _POLL_CHANGED)
+
+    def _changed(self) -> bool:
+        if self._mounts is None:
+            return True
+        if self._handle is None:
+            return time.monotonic() - self._loaded_at >= self.fallback_ttl
+        if self._poller is None:
+            return True
+        return bool(self._poller.poll(0))
+
+    def _load(self) -> list[Mount]:
+        if self._handle is None:
+            return [
+                Mount(device=part.device, mountpoint=part.mountpoint, fstype=part.fstype, st_dev=None)
+                for part in psutil.disk_partitions(all=False)
+            ]
+        self._handle.seek(0)
+        return _parse_mountinfo(self._handle.read().decode("utf-8", "replace"), self._fstypes)
+
+    def mounts(self) -> list[Mount]:
+        with self._lock:
+            if self._changed():
+                self._mounts = self._load()
+                self._loaded_at = time.monotonic()
+            return self._mounts or []
+
+    def by_device(self) -> dict[str, Mount]:
+        """First mount of each device; bind mounts and later mounts are skipped."""
+
+        devices: dict[str, Mount] = {}
+        for mount in self.mounts():
+            devices.setdefault(mount.device, mount)
+        return devices
+
+
+def _statvfs(mountpoint: str) -> Usage:
+    stats = os.statvfs(mountpoint)
+    total = stats.f_blocks * stats.f_frsize
+    free = stats.f_bavail * stats.f_frsize
+    used = (stats.f_blocks - stats.f_bfree) * stats.f_frsize
+    return int(total), int(used), int(free)
+
+
+class FilesystemUsage:
+    """``statvfs`` results with a TTL, computed off the caller's thread.
+
+    Expired entries are refreshed on a small pool of daemon threads and the
+    caller waits at most ``timeout`` seconds for them. A mount that does not
+    answer in time (hung NFS/FUSE server) keeps its previous value, or
+    ``None``, and is not resubmitted while its call is still blocked, so a
+    stuck mount holds at most one thread. A thread blocked for longer than
+    ``timeout`` no longer counts towards ``max_workers``, so hung mounts do
+    not starve the others, and being a daemon it does not delay exit.
+    Mounts sharing a ``st_dev`` are queried once.
+    """
+
+    def __init__(self, timeout: float = 0.2, ttl: float = 5.0, max_workers: int = 4) -> None:
+        self.ttl = ttl
+        # Reentrante: add_done_callback ejecuta _store en el acto si ya terminó
+        self._lock = threading.RLock()
+        self._executor = DaemonExecutor(max_workers, thread_name_prefix="statvfs", stuck_after=timeout)
+        self._cache: dict[object, tuple[float, Usage | None]] = {}
+        self._inflight: dict[object, Future[Usage]] = {}
+
+    @property
+    def timeout(self) -> float:
+        return self._executor.stuck_after or 0.0
+
+    @timeout.setter
+    def timeout(self, value: float) -> None:
+        self._executor.stuck_after = value
+
+    @staticmethod
+    def _key(mount: Mount) -> object:
+        return mount.st_dev if mount.st_dev is not None else mount.mountpoint
+
+    def _store(self, key: object, future: Future[Usage]) -> None:
+        try:
+            usage: Usage | None = future.result()
+        except OSError:
+            usage = None
+        with self._lock:
+            self._cache[key] = (time.monotonic(), usage)
+            self._inflight.pop(key, None)
+
+    def usage(self, mounts: Iterable[Mount]) -> dict[str, Usage | None]:
+        """Return usage keyed by mountpoint for ``mounts``."""
+
+        now = time.monotonic()
+        unique: dict[object, Mount] = {}
+        mountpoints: dict[str, object] = {}
+        for mount in mounts:
+            key = self._key(mount)
+            unique.setdefault(key, mount)
+            mountpoints[mount.mountpoint] = key
+
+        # Llamadas encoladas tras hilos que se han quedado bloqueados desde la última vez
+        self._executor.revive()
+        pending: dict[object, Future[Usage]] = {}
+        with self._lock:
+            for key, mount in unique.items():
+                if key in self._inflight:
+                    continue  # la llamada anterior sigue bloqueada: no ocupa otro hilo
+                cached = self._cache.get(key)
+                if cached is not None and now - cached[0] < self.ttl:
+                    continue
+                future = self._executor.submit(_statvfs, mount.mountpoint)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._store(key, done))
+                pending[key] = future
+            # Entradas de montajes que ya no existen
+            for key in self._cache.keys() - unique.keys() - self._inflight.keys():
+                del self._cache[key]
+        if pending:
+            done, _ = wait(pending.values(), timeout=self.timeout)
+            # Los callbacks pueden ejecutarse después de despertar a wait()
+            for key, future in pending.items():
+                if future in done:
+                    self._store(key, future)
+
+        with self._lock:
+            return {
+                mountpoint: (self._cache.get(key) or (0.0, None))[1]
+                for mountpoint, key in mountpoints.items()
+            }
+
+
+MOUNTS = MountTable()
+FILESYSTEMS = FilesystemUsage()
+
+
+def configure_filesystem_usage(timeout: float, ttl: float) -> None:
+    """Set the ``statvfs`` wait budget and cache lifetime, both in seconds."""
+
+    FILESYSTEMS.timeout = timeout
+    FILESYSTEMS.ttl = ttl
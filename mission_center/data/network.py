@@ -3,27 +3,15 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, Tuple
 
 import psutil
 
 from mission_center.models.resource_snapshot import NetworkInterfaceSnapshot, NetworkSnapshot
 
-_PREV_NET_COUNTERS: Dict[str, Tuple[float, Any]] = {}
+from .counters import RateEngine
 
-
-def _compute_rates(name: str, counters: Any, timestamp: float) -> tuple[float, float]:
-    previous = _PREV_NET_COUNTERS.get(name)
-    _PREV_NET_COUNTERS[name] = (timestamp, counters)
-    if not previous:
-        return 0.0, 0.0
-    prev_time, prev = previous
-    delta_t = timestamp - prev_time
-    if delta_t <= 0:
-        return 0.0, 0.0
-    sent_rate = (counters.bytes_sent - prev.bytes_sent) / delta_t
-    recv_rate = (counters.bytes_recv - prev.bytes_recv) / delta_t
-    return sent_rate, recv_rate
+# bytes_sent, bytes_recv por interfaz; una interfaz recreada reinicia sus contadores
+_RATES = RateEngine()
 
 
 def collect_network_snapshot() -> NetworkSnapshot:
@@ -31,10 +19,17 @@ def collect_network_snapshot() -> NetworkSnapshot:
     stats = psutil.net_if_stats()
     addrs = psutil.net_if_addrs()
     counters = psutil.net_io_counters(pernic=True)
+    elapsed, deltas = _RATES.update(
+        time.monotonic(),
+        {name: (iface.bytes_sent, iface.bytes_recv) for name, iface in counters.items()},
+    )
 
     interfaces: list[NetworkInterfaceSnapshot] = []
-    for name, iface_counters in counters.items():
-        sent_rate, recv_rate = _compute_rates(name, iface_counters, timestamp)
+    for name in counters:
+        sent_rate = recv_rate = 0.0
+        delta = deltas.get(name)
+        if delta is not None and elapsed:
+            sent_rate, recv_rate = delta[0] / elapsed, delta[1] / elapsed
         iface_stats = stats.get(name)
         is_up = bool(getattr(iface_stats, "isup", False))
         address = None
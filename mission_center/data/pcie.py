@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import os
 import re
+import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
 
 from mission_center.models.resource_snapshot import PCIELinkSnapshot, PCIESnapshot
 
+from .pciids import resolve_pci_name
+from .sysfs import SYSFS, read_attribute, read_once
+
 try:
     import pyudev  # type: ignore[import]
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
@@ -43,68 +48,131 @@ def _parse_width(value: str | None) -> int | None:
         return None
 
 
-def _collect_pyudev() -> Iterable[PCIELinkSnapshot]:
-    assert pyudev is not None
-    ctx = pyudev.Context()
-    for device in ctx.list_devices(subsystem="pci"):
-        attrs = device.attributes
-        current_speed = attrs.get("current_link_speed")
-        current_width = attrs.get("current_link_width")
-        max_speed = attrs.get("max_link_speed")
-        max_width = attrs.get("max_link_width")
-        vendor = attrs.get("vendor")
-        dev = attrs.get("device")
-        yield PCIELinkSnapshot(
-            address=device.sys_name,
-            vendor=str(vendor) if vendor else None,
-            device=str(dev) if dev else None,
-            link_speed_gtps=_parse_speed(
-                current_speed.decode() if isinstance(current_speed, bytes) else str(current_speed)
-            ),
-            link_width=_parse_width(
-                current_width.decode() if isinstance(current_width, bytes) else str(current_width)
-            ),
-            max_link_speed_gtps=_parse_speed(
-                max_speed.decode() if isinstance(max_speed, bytes) else str(max_speed)
-            ),
-            max_link_width=_parse_width(
-                max_width.decode() if isinstance(max_width, bytes) else str(max_width)
-            ),
-        )
-
-
-def _collect_sysfs() -> Iterable[PCIELinkSnapshot]:
-    if not _SYS_PCI.exists():
-        return []
-    for device_path in _SYS_PCI.iterdir():
-        def safe_read(p: Path) -> str | None:
+@dataclass(frozen=True, slots=True)
+class _PCIeDevice:
+    """Attributes fixed for the lifetime of a PCI function."""
+
+    address: str
+    vendor: str | None
+    device: str | None
+    vendor_name: str | None
+    device_name: str | None
+    max_link_speed_gtps: float | None
+    max_link_width: int | None
+    current_speed_path: str | None  # None: la función no expone enlace PCIe
+    current_width_path: str | None
+
+
+def _scan_device(address: str, path: str) -> _PCIeDevice:
+    has_link = os.path.exists(os.path.join(path, "current_link_speed"))
+    vendor = read_once(os.path.join(path, "vendor"))
+    device = read_once(os.path.join(path, "device"))
+    vendor_name, device_name = resolve_pci_name(vendor, device)
+    return _PCIeDevice(
+        address=address,
+        vendor=vendor,
+        device=device,
+        vendor_name=vendor_name,
+        device_name=device_name,
+        max_link_speed_gtps=_parse_speed(read_once(os.path.join(path, "max_link_speed"))),
+        max_link_width=_parse_width(read_once(os.path.join(path, "max_link_width"))),
+        current_speed_path=os.path.join(path, "current_link_speed") if has_link else None,
+        current_width_path=os.path.join(path, "current_link_width") if has_link else None,
+    )
+
+
+class PCIeTopology:
+    """PCI functions and their static attributes, rescanned only on change.
+
+    With pyudev a netlink monitor filtered to the ``pci`` subsystem is drained
+    on each call and any add/remove/change event marks the cache dirty.
+    Without it, the ``mtime`` and listing of ``/sys/bus/pci/devices`` are
+    compared instead. Between rescans a snapshot only re-reads
+    ``current_link_speed`` and ``current_link_width`` (preads on cached fds),
+    which is enough to notice a link training down.
+    """
+
+    def __init__(self, root: Path = _SYS_PCI) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._devices: list[_PCIeDevice] | None = None
+        self._listing: tuple[int, frozenset[str]] | None = None
+        self._context = None
+        self._monitor = None
+        if pyudev is not None and root == _SYS_PCI:
             try:
-                return p.read_text().strip()
-            except Exception:
-                return None
-
-        current_speed = safe_read(device_path / "current_link_speed") if (device_path / "current_link_speed").exists() else None
-        current_width = safe_read(device_path / "current_link_width") if (device_path / "current_link_width").exists() else None
-        max_speed = safe_read(device_path / "max_link_speed") if (device_path / "max_link_speed").exists() else None
-        max_width = safe_read(device_path / "max_link_width") if (device_path / "max_link_width").exists() else None
-        vendor = safe_read(device_path / "vendor") if (device_path / "vendor").exists() else None
-        device = safe_read(device_path / "device") if (device_path / "device").exists() else None
-        yield PCIELinkSnapshot(
-            address=device_path.name,
-            vendor=vendor,
-            device=device,
-            link_speed_gtps=_parse_speed(current_speed),
-            link_width=_parse_width(current_width),
-            max_link_speed_gtps=_parse_speed(max_speed),
-            max_link_width=_parse_width(max_width),
-        )
+                self._context = pyudev.Context()
+                self._monitor = pyudev.Monitor.from_netlink(self._context)
+                self._monitor.filter_by(subsystem="pci")
+                self._monitor.start()
+            except Exception:  # pragma: no cover - sin acceso a netlink (contenedores)
+                self._monitor = None
+
+    def _listing_changed(self) -> bool:
+        try:
+            listing = (os.stat(self.root).st_mtime_ns, frozenset(os.listdir(self.root)))
+        except OSError:
+            listing = (0, frozenset())
+        changed = listing != self._listing
+        self._listing = listing
+        return changed
+
+    def _events_pending(self) -> bool:
+        pending = False
+        while self._monitor.poll(timeout=0) is not None:
+            pending = True
+        return pending
+
+    def _changed(self) -> bool:
+        if self._devices is None:
+            if self._monitor is None:
+                self._listing_changed()
+            return True
+        if self._monitor is not None:
+            return self._events_pending()
+        return self._listing_changed()
+
+    def _enumerate(self) -> list[tuple[str, str]]:
+        if self._context is not None:
+            return sorted((device.sys_name, device.sys_path) for device in self._context.list_devices(subsystem="pci"))
+        if not self.root.exists():
+            return []
+        return sorted((entry.name, entry.path) for entry in os.scandir(self.root))
+
+    def devices(self) -> list[_PCIeDevice]:
+        with self._lock:
+            if self._changed():
+                previous = self._devices or []
+                self._devices = [_scan_device(address, path) for address, path in self._enumerate()]
+                # Descriptores de las funciones retiradas
+                current = {device.address for device in self._devices}
+                for device in previous:
+                    if device.address not in current and device.current_speed_path:
+                        SYSFS.forget(os.path.dirname(device.current_speed_path) + os.sep)
+            return self._devices
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._devices = None
+
+
+_TOPOLOGY = PCIeTopology()
 
 
 def collect_pcie_snapshot() -> PCIESnapshot:
     timestamp = time.time()
-    devices: list[PCIELinkSnapshot] = []
-    if pyudev is not None:
-        devices.extend(_collect_pyudev())
-    if not devices:
-        devices.extend(_collect_sysfs())
+    devices = [
+        PCIELinkSnapshot(
+            address=device.address,
+            vendor=device.vendor,
+            device=device.device,
+            link_speed_gtps=_parse_speed(read_attribute(device.current_speed_path)) if device.current_speed_path else None,
+            link_width=_parse_width(read_attribute(device.current_width_path)) if device.current_width_path else None,
+            max_link_speed_gtps=device.max_link_speed_gtps,
+            max_link_width=device.max_link_width,
+            vendor_name=device.vendor_name,
+            device_name=device.device_name,
+        )
+        for device in _TOPOLOGY.devices()
+    ]
     return PCIESnapshot(timestamp=timestamp, devices=devices)
@@ -0,0 +1,141 @@
+"""Vendor and device names from the local ``pci.ids`` database."""
+
+from __future__ import annotations
+
+import mmap
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Sequence
+
+# Rutas habituales según la distribución (hwdata, pciutils)
+_CANDIDATES = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/usr/local/share/pci.ids",
+    "/var/lib/pciutils/pci.ids",
+)
+# Línea de fabricante: cuatro dígitos hex en la columna 0, dos espacios y el nombre
+_VENDOR_RE = re.compile(rb"^([0-9a-f]{4})  ", re.MULTILINE)
+
+
+def _normalize(identifier: str | None) -> str | None:
+    """``"0x10DE"`` (sysfs) -> ``"10de"``; ``None`` if not a 16-bit hex id."""
+
+    if not identifier:
+        return None
+    text = identifier.strip().lower()
+    if text.startswith("0x"):
+        text = text[2:]
+    if len(text) != 4 or any(char not in "0123456789abcdef" for char in text):
+        return None
+    return text
+
+
+class PciIdDatabase:
+    """Name lookups over an mmap'd ``pci.ids`` with a vendor offset index.
+
+    Nothing is read until the first lookup. Then the file is mapped and one
+    regex pass (in C, over the mapping) records the id and byte offset of
+    every vendor line, and where its block ends, into compact arrays sorted
+    by id: about 2.5k entries instead of dicts for the whole file. A vendor
+    is found with :func:`bisect.bisect_left`; its devices are searched with
+    ``find`` only inside its block. Resolved pairs are cached, so
+    a topology rescan costs one dict lookup per known device. Without a
+    database every lookup returns ``None``.
+    """
+
+    def __init__(self, paths: Sequence[str] = _CANDIDATES) -> None:
+        self.paths = tuple(paths)
+        self.path: str | None = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._map: mmap.mmap | None = None
+        self._ids = array("H")
+        self._offsets = array("Q")
+        self._ends = array("Q")
+        self._cache: dict[tuple[str, str | None], tuple[str | None, str | None]] = {}
+
+    def _load(self) -> None:
+        self._loaded = True
+        for path in self.paths:
+            try:
+                with open(path, "rb") as handle:
+                    self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):  # ValueError: fichero vacío
+                continue
+            self.path = path
+            break
+        if self._map is None:
+            return
+        starts = [(int(match.group(1), 16), match.start()) for match in _VENDOR_RE.finditer(self._map)]
+        # Tras el último fabricante viene la lista de clases ("C 00  ...")
+        classes = self._map.find(b"\nC ", starts[-1][1]) if starts else -1
+        # Cada bloque acaba donde empieza el siguiente en el fichero, esté ordenado o no
+        ends = [offset for _, offset in starts[1:]] + [classes if classes >= 0 else len(self._map)]
+        entries = sorted((vendor, start, end) for (vendor, start), end in zip(starts, ends))
+        self._ids = array("H", (entry[0] for entry in entries))
+        self._offsets = array("Q", (entry[1] for entry in entries))
+        self._ends = array("Q", (entry[2] for entry in entries))
+
+    def _line_name(self, start: int) -> str | None:
+        # El nombre empieza tras los dos espacios que siguen al id
+        separator = self._map.find(b"  ", start)
+        end = self._map.find(b"\n", start)
+        if end < 0:
+            end = len(self._map)
+        if separator < 0 or separator > end:
+            return None
+        return self._map[separator + 2:end].decode("utf-8", "replace").strip() or None
+
+    def _lookup(self, vendor: str, device: str | None) -> tuple[str | None, str | None]:
+        if self._map is None:
+            return None, None
+        vendor_id = int(vendor, 16)
+        position = bisect_left(self._ids, vendor_id)
+        if position >= len(self._ids) or self._ids[position] != vendor_id:
+            return None, None
+        start = self._offsets[position]
+        vendor_name = self._line_name(start)
+        if device is None:
+            return vendor_name, None
+        found = self._map.find(b"\n\t" + device.encode("ascii") + b"  ", start, self._ends[position])
+        return vendor_name, self._line_name(found + 2) if found >= 0 else None
+
+    def resolve(self, vendor: str | None, device: str | None = None) -> tuple[str | None, str | None]:
+        """Return ``(vendor_name, device_name)`` for sysfs-style ids such as ``"0x10de"``."""
+
+        vendor_id = _normalize(vendor)
+        if vendor_id is None:
+            return None, None
+        key = (vendor_id, _normalize(device))
+        with self._lock:
+            names = self._cache.get(key)
+            if names is None:
+                if not self._loaded:
+                    self._load()
+                names = self._cache[key] = self._lookup(*key)
+            return names
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+            self._map = None
+            self._ids, self._offsets, self._ends = array("H"), array("Q"), array("Q")
+            self._cache.clear()
+            self._loaded = False
+
+
+PCI_IDS = PciIdDatabase()
+
+
+def resolve_pci_name(vendor: str | None, device: str | None = None) -> tuple[str | None, str | None]:
+    """Resolve ids through the shared :data:`PCI_IDS` database."""
+
+    return PCI_IDS.resolve(vendor, device)
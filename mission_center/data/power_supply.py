@@ -0,0 +1,196 @@
+"""Single scan of ``/sys/class/power_supply`` shared by the battery and power providers."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+from .sysfs import SYSFS, read_once
+
+_POWER_SUPPLY = "/sys/class/power_supply"
+# Atributos que cambian de un ciclo a otro; el resto se lee al escanear
+_DYNAMIC = (
+    "status",
+    "online",
+    "voltage_now",
+    "current_now",
+    "power_now",
+    "capacity",
+    "temp",
+    "energy_now",
+    "charge_now",
+)
+_MICRO = 1_000_000  # power_supply publica µV, µA, µW, µWh y µAh
+
+
+@dataclass(frozen=True, slots=True)
+class _Supply:
+    name: str
+    type: str | None
+    energy_full_wh: float | None
+    charge_full_ah: float | None
+    cycle_count: int | None
+    paths: tuple[tuple[str, str], ...]  # (atributo, ruta) de los dinámicos presentes
+
+
+@dataclass(slots=True)
+class PowerSupplyReading:
+    """One supply with its cached static attributes and this cycle's values."""
+
+    name: str
+    type: str | None
+    status: str | None = None
+    online: bool | None = None
+    voltage_volts: float | None = None
+    current_amperes: float | None = None
+    power_watts: float | None = None
+    capacity_percent: float | None = None
+    temperature_celsius: float | None = None
+    energy_now_wh: float | None = None
+    energy_full_wh: float | None = None
+    charge_now_ah: float | None = None
+    charge_full_ah: float | None = None
+    cycle_count: int | None = None
+
+    @property
+    def is_battery(self) -> bool:
+        # Sin ``type`` se supone batería, como hacía el proveedor original
+        return self.type is None or self.type.lower() == "battery"
+
+
+@dataclass(slots=True)
+class PowerSupplySample:
+    timestamp: float
+    supplies: list[PowerSupplyReading] = field(default_factory=list)
+
+
+def _number(text: str | None, scale: float = 1.0) -> float | None:
+    if text is None:
+        return None
+    try:
+        return float(text) / scale
+    except ValueError:
+        return None
+
+
+def _detect_temperature(value: float | None) -> float | None:
+    if value is None:
+        return None
+    if value > 1000:  # heurística para milésimas
+        return value / 1000.0
+    if value > 200:  # heurística para décimas
+        return value / 10.0
+    return value
+
+
+def _scan_supply(directory: str) -> _Supply:
+    cycle_count = _number(read_once(os.path.join(directory, "cycle_count")))
+    return _Supply(
+        name=os.path.basename(directory),
+        type=read_once(os.path.join(directory, "type")),
+        energy_full_wh=_number(read_once(os.path.join(directory, "energy_full")), _MICRO),
+        charge_full_ah=_number(read_once(os.path.join(directory, "charge_full")), _MICRO),
+        cycle_count=int(cycle_count) if cycle_count is not None else None,
+        paths=tuple(
+            (attribute, os.path.join(directory, attribute))
+            for attribute in _DYNAMIC
+            if os.path.exists(os.path.join(directory, attribute))
+        ),
+    )
+
+
+def _reading(supply: _Supply) -> PowerSupplyReading:
+    values = {attribute: SYSFS.read(path) for attribute, path in supply.paths}
+    online = _number(values.get("online"))
+    voltage = _number(values.get("voltage_now"), _MICRO)
+    current = _number(values.get("current_now"), _MICRO)
+    power = _number(values.get("power_now"), _MICRO)
+    if power is None and voltage is not None and current is not None:
+        power = voltage * current
+    return PowerSupplyReading(
+        name=supply.name,
+        type=supply.type,
+        status=values.get("status"),
+        online=bool(online) if online is not None else None,
+        voltage_volts=voltage,
+        current_amperes=current,
+        power_watts=power,
+        capacity_percent=_number(values.get("capacity")),
+        temperature_celsius=_detect_temperature(_number(values.get("temp"))),
+        energy_now_wh=_number(values.get("energy_now"), _MICRO),
+        energy_full_wh=supply.energy_full_wh,
+        charge_now_ah=_number(values.get("charge_now"), _MICRO),
+        charge_full_ah=supply.charge_full_ah,
+        cycle_count=supply.cycle_count,
+    )
+
+
+class PowerSupplySampler:
+    """Power supplies enumerated once, their dynamic attributes read in one pass.
+
+    A scan records each supply's type, the attributes that only change over
+    months (``energy_full``, ``charge_full``, ``cycle_count``) and which of
+    the dynamic attributes it exposes, so a sample is one ``pread`` per
+    present file and no lookups of absent ones. The supplies are rescanned
+    when the directory listing changes (a dock, USB-C charger or second
+    battery appears) and every ``static_ttl`` seconds to pick up capacity
+    recalibrations and new charge cycles. The battery and power providers run
+    in the same tick, so calls within ``coalesce`` seconds share one sample.
+    """
+
+    def __init__(self, root: str = _POWER_SUPPLY, coalesce: float = 0.25, static_ttl: float = 300.0) -> None:
+        self.root = root
+        self.coalesce = coalesce
+        self.static_ttl = static_ttl
+        self._lock = threading.Lock()
+        self._listing: frozenset[str] | None = None
+        self._scanned_at = 0.0
+        self._supplies: list[_Supply] = []
+        self._last: PowerSupplySample | None = None
+        self._last_at = 0.0
+
+    def available(self) -> bool:
+        return os.path.isdir(self.root)
+
+    def _rescan(self, listing: frozenset[str], now: float) -> None:
+        supplies = [
+            _scan_supply(os.path.join(self.root, name))
+            for name in sorted(listing)
+            if os.path.isdir(os.path.join(self.root, name))
+        ]
+        # Descriptores de las fuentes retiradas
+        current = {supply.name for supply in supplies}
+        for supply in self._supplies:
+            if supply.name not in current:
+                SYSFS.forget(os.path.join(self.root, supply.name) + os.sep)
+        self._supplies = supplies
+        self._listing = listing
+        self._scanned_at = now
+
+    def sample(self) -> PowerSupplySample:
+        with self._lock:
+            now = time.monotonic()
+            if self._last is not None and now - self._last_at < self.coalesce:
+                return self._last
+            try:
+                listing = frozenset(os.listdir(self.root))
+            except OSError:
+                listing = frozenset()
+            if listing != self._listing or now - self._scanned_at >= self.static_ttl:
+                self._rescan(listing, now)
+            self._last = PowerSupplySample(
+                timestamp=time.time(), supplies=[_reading(supply) for supply in self._supplies]
+            )
+            self._last_at = now
+            return self._last
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._listing = None
+            self._last = None
+
+
+# Compartido por los proveedores de batería y fuentes de alimentación
+POWER_SUPPLIES = PowerSupplySampler()
@@ -3,24 +3,19 @@
 from __future__ import annotations
 
 import time
+from dataclasses import dataclass
 from typing import Iterable
 
 import psutil
 
 from mission_center.models.process_info import ProcessInfo, ProcessSnapshot
 
-_PROCESS_ATTRS = [
-    "pid",
-    "name",
-    "status",
-    "username",
-    "create_time",
-    "cpu_percent",
-    "memory_info",
-    "cmdline",
-    "nice",
-    "io_counters",
-]
+from .procfs import ProcfsProcessTable, procfs_available
+
+# Leídos una vez por vida del proceso (pid, create_time)
+_STATIC_ATTRS = ["create_time", "username", "cmdline"]
+# Refrescados en cada ciclo; as_dict los lee dentro de un único oneshot()
+_DYNAMIC_ATTRS = ["name", "status", "cpu_percent", "memory_info", "nice", "io_counters"]
 
 _PROCESS_SAMPLE_INTERVAL = 2.0
 _LAST_SNAPSHOT: tuple[float, ProcessSnapshot] | None = None
@@ -32,44 +27,124 @@ def _safe_cmdline(cmdline: Iterable[str] | None) -> tuple[str, ...]:
     return tuple(arg for arg in cmdline if arg)
 
 
-def collect_process_snapshot() -> ProcessSnapshot:
-    global _LAST_SNAPSHOT
-    timestamp = time.time()
-    if _LAST_SNAPSHOT:
-        last_time, cached_snapshot = _LAST_SNAPSHOT
-        if (timestamp - last_time) < _PROCESS_SAMPLE_INTERVAL:
-            return cached_snapshot
-    processes: list[ProcessInfo] = []
-    total_cpu = 0.0
-    total_mem = 0
-    for proc in psutil.process_iter(attrs=_PROCESS_ATTRS):
+@dataclass(slots=True)
+class _TrackedProcess:
+    process: psutil.Process
+    create_time: float
+    username: str | None
+    command_line: tuple[str, ...]
+
+
+class ProcessTable:
+    """PID-keyed process table updated as a diff between cycles.
+
+    Entries are identified by ``(pid, create_time)``: a PID whose creation
+    time changed (checked through :meth:`psutil.Process.is_running`) is a new
+    process. psutil memoises the creation time on each ``Process``, so this
+    public check, which builds a fresh one, is the only portable way to see
+    the PID reused; the ``procfs`` backend gets it from its own ``stat``
+    parse for free. ``create_time``, ``username`` and ``cmdline`` are read once per
+    process lifetime; each refresh only reads the dynamic attributes, drops
+    exited PIDs and tracks new ones. The ``psutil.Process`` objects are kept,
+    so ``cpu_percent`` is measured against the previous cycle.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _TrackedProcess] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _track(self, pid: int) -> _TrackedProcess | None:
         try:
-            info = proc.info
+            process = psutil.Process(pid)
+            info = process.as_dict(attrs=_STATIC_ATTRS, ad_value=None)
+        except psutil.NoSuchProcess:
+            return None
+        return _TrackedProcess(
+            process=process,
+            create_time=float(info.get("create_time") or 0.0),
+            username=info.get("username"),
+            command_line=_safe_cmdline(info.get("cmdline")),
+        )
+
+    def refresh(self) -> list[ProcessInfo]:
+        pids = psutil.pids()
+        for pid in self._entries.keys() - set(pids):
+            del self._entries[pid]
+
+        processes: list[ProcessInfo] = []
+        for pid in pids:
+            entry = self._entries.get(pid)
+            if entry is not None and not entry.process.is_running():
+                entry = None  # PID reutilizado por otro proceso
+            if entry is None:
+                entry = self._track(pid)
+                if entry is None:
+                    self._entries.pop(pid, None)
+                    continue
+                self._entries[pid] = entry
+            try:
+                info = entry.process.as_dict(attrs=_DYNAMIC_ATTRS, ad_value=None)
+            except psutil.NoSuchProcess:
+                del self._entries[pid]
+                continue
             memory_info = info.get("memory_info")
-            memory_bytes = int(memory_info.rss) if memory_info else 0
-            cpu_percent = float(info.get("cpu_percent") or proc.cpu_percent(interval=None))
             io_counters = info.get("io_counters")
-            read_bytes = int(io_counters.read_bytes) if io_counters else None
-            write_bytes = int(io_counters.write_bytes) if io_counters else None
+            nice = info.get("nice")
             processes.append(
                 ProcessInfo(
-                    pid=int(info["pid"]),
+                    pid=pid,
                     name=str(info.get("name") or ""),
                     status=str(info.get("status") or "unknown"),
-                    username=info.get("username"),
-                    create_time=float(info.get("create_time") or 0.0),
-                    cpu_percent=cpu_percent,
-                    memory_bytes=memory_bytes,
-                    command_line=_safe_cmdline(info.get("cmdline")),
-                    nice=int(info.get("nice")) if info.get("nice") is not None else None,
-                    io_read_bytes=read_bytes,
-                    io_write_bytes=write_bytes,
+                    username=entry.username,
+                    create_time=entry.create_time,
+                    cpu_percent=float(info.get("cpu_percent") or 0.0),
+                    memory_bytes=int(memory_info.rss) if memory_info else 0,
+                    command_line=entry.command_line,
+                    nice=int(nice) if nice is not None else None,
+                    io_read_bytes=int(io_counters.read_bytes) if io_counters else None,
+                    io_write_bytes=int(io_counters.write_bytes) if io_counters else None,
                 )
             )
-            total_cpu += cpu_percent
-            total_mem += memory_bytes
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+        return processes
+
+
+_BACKENDS = ("auto", "psutil", "procfs")
+_TABLE: ProcessTable | ProcfsProcessTable = ProcessTable()
+
+
+def set_process_backend(backend: str = "auto", root: str = "/proc") -> str:
+    """Switch the process table implementation; returns the backend in use.
+
+    ``"procfs"`` reads ``root`` directly, ``"psutil"`` uses ``psutil.Process``
+    objects and ``"auto"`` picks procfs when ``root`` is readable.
+    """
+
+    global _TABLE, _LAST_SNAPSHOT
+    if backend not in _BACKENDS:
+        raise ValueError(f"Backend de procesos desconocido: {backend}")
+    if backend == "auto":
+        backend = "procfs" if procfs_available(root) else "psutil"
+    _TABLE = ProcfsProcessTable(root) if backend == "procfs" else ProcessTable()
+    _LAST_SNAPSHOT = None
+    return backend
+
+
+def process_backend() -> str:
+    return "procfs" if isinstance(_TABLE, ProcfsProcessTable) else "psutil"
+
+
+def collect_process_snapshot() -> ProcessSnapshot:
+    global _LAST_SNAPSHOT
+    timestamp = time.time()
+    if _LAST_SNAPSHOT:
+        last_time, cached_snapshot = _LAST_SNAPSHOT
+        if (timestamp - last_time) < _PROCESS_SAMPLE_INTERVAL:
+            return cached_snapshot
+    processes = _TABLE.refresh()
+    total_cpu = sum(process.cpu_percent for process in processes)
+    total_mem = sum(process.memory_bytes for process in processes)
 
     processes.sort(key=lambda p: (p.cpu_percent, p.memory_bytes), reverse=True)
     snapshot = ProcessSnapshot(
@@ -0,0 +1,217 @@
+"""Process table read straight from ``/proc`` without ``psutil.Process`` objects."""
+
+from __future__ import annotations
+
+import os
+import pwd
+import time
+from dataclasses import dataclass
+
+from mission_center.models.process_info import ProcessInfo
+
+# Letra de estado de /proc/<pid>/stat -> nombre usado por psutil
+_STATUS = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "Z": "zombie",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "X": "dead",
+    "x": "dead",
+    "K": "wake-kill",
+    "W": "waking",
+    "P": "parked",
+    "I": "idle",
+}
+_BUFFER_SIZE = 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def procfs_available(root: str = "/proc") -> bool:
+    return os.path.exists(os.path.join(root, "self", "stat")) or os.path.exists(os.path.join(root, "1", "stat"))
+
+
+def _boot_time(root: str) -> float:
+    try:
+        with open(os.path.join(root, "stat"), "rb") as handle:
+            for line in handle:
+                if line.startswith(b"btime "):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
+
+
+def _process_name(comm: bytearray, command_line: tuple[str, ...]) -> str:
+    name = comm.decode("utf-8", "replace")
+    # comm se trunca a 15 caracteres; psutil lo completa con el ejecutable
+    if len(comm) == 15 and command_line:
+        executable = os.path.basename(command_line[0])
+        if executable.startswith(name):
+            return executable
+    return name
+
+
+@dataclass(slots=True)
+class _Entry:
+    starttime: int  # jiffies desde el arranque; junto al pid identifica el proceso
+    create_time: float
+    username: str | None
+    command_line: tuple[str, ...]
+    stat_path: bytes
+    io_path: bytes
+    io_readable: bool = True
+    cpu_jiffies: int = -1
+    sampled_at: float = 0.0
+
+
+class ProcfsProcessTable:
+    """Process table refreshed by walking ``/proc`` with :func:`os.scandir`.
+
+    Per PID and cycle it does one ``open``/``readv``/``close`` of ``stat`` and,
+    while permitted, of ``io``, into buffers reused across PIDs; the fields are
+    parsed in place. RSS comes from ``stat`` as well, which saves the ``statm``
+    read. CPU percent is the utime+stime jiffy delta over the wall-clock time
+    since the previous cycle, like ``psutil.Process.cpu_percent``. ``status``
+    (real UID) and ``cmdline`` are read once per ``(pid, starttime)``.
+    """
+
+    def __init__(self, root: str = "/proc") -> None:
+        self.root = root
+        self._boot_time = _boot_time(root)
+        self._entries: dict[int, _Entry] = {}
+        self._stat_buffer = bytearray(_BUFFER_SIZE)
+        self._io_buffer = bytearray(_BUFFER_SIZE)
+        self._users: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _read(self, path: bytes, buffer: bytearray) -> int:
+        """Read ``path`` into ``buffer``; returns the byte count or -1 if gone."""
+
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except (FileNotFoundError, ProcessLookupError):
+            return -1
+        try:
+            return os.readv(fd, [buffer])
+        except ProcessLookupError:
+            return -1
+        finally:
+            os.close(fd)
+
+    def _username(self, uid: int) -> str:
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+        return name
+
+    def _track(self, pid: int, starttime: int) -> _Entry | None:
+        base = os.path.join(self.root, str(pid))
+        username: str | None = None
+        try:
+            with open(os.path.join(base, "status"), "rb") as handle:
+                for line in handle:
+                    if line.startswith(b"Uid:"):
+                        username = self._username(int(line.split()[1]))
+                        break
+            with open(os.path.join(base, "cmdline"), "rb") as handle:
+                command_line = tuple(arg.decode("utf-8", "replace") for arg in handle.read().split(b"\0") if arg)
+        except (FileNotFoundError, ProcessLookupError):
+            return None
+        except PermissionError:
+            command_line = ()
+        return _Entry(
+            starttime=starttime,
+            create_time=round(self._boot_time + starttime / _CLOCK_TICKS, 2),
+            username=username,
+            command_line=command_line,
+            stat_path=os.fsencode(os.path.join(base, "stat")),
+            io_path=os.fsencode(os.path.join(base, "io")),
+        )
+
+    def _io_counters(self, entry: _Entry) -> tuple[int | None, int | None]:
+        if not entry.io_readable:
+            return None, None
+        try:
+            size = self._read(entry.io_path, self._io_buffer)
+        except PermissionError:
+            # Sin permisos no cambia durante la vida del proceso: no se reintenta
+            entry.io_readable = False
+            return None, None
+        read_bytes = write_bytes = None
+        if size > 0:
+            for line in self._io_buffer[:size].splitlines():
+                if line.startswith(b"read_bytes:"):
+                    read_bytes = int(line[11:])
+                elif line.startswith(b"write_bytes:"):
+                    write_bytes = int(line[12:])
+        return read_bytes, write_bytes
+
+    def refresh(self) -> list[ProcessInfo]:
+        now = time.monotonic()
+        buffer = self._stat_buffer
+        seen: set[int] = set()
+        processes: list[ProcessInfo] = []
+        with os.scandir(self.root) as entries:
+            for dirent in entries:
+                if not dirent.name.isdigit():
+                    continue
+                pid = int(dirent.name)
+                entry = self._entries.get(pid)
+                stat_path = entry.stat_path if entry is not None else os.fsencode(dirent.path + "/stat")
+                try:
+                    size = self._read(stat_path, buffer)
+                except OSError:
+                    continue
+                if size <= 0:
+                    continue
+                # comm puede contener espacios y paréntesis: se corta en el último ')'
+                close = buffer.rfind(b")", 0, size)
+                if close < 0:
+                    continue
+                fields = buffer[close + 2:size].split()
+                if len(fields) < 22:
+                    continue
+                starttime = int(fields[19])
+                if entry is None or entry.starttime != starttime:
+                    entry = self._track(pid, starttime)
+                    if entry is None:
+                        continue
+                    self._entries[pid] = entry
+                seen.add(pid)
+
+                cpu_jiffies = int(fields[11]) + int(fields[12])
+                cpu_percent = 0.0
+                if entry.cpu_jiffies >= 0 and now > entry.sampled_at:
+                    cpu_percent = round(
+                        (cpu_jiffies - entry.cpu_jiffies) / _CLOCK_TICKS / (now - entry.sampled_at) * 100.0, 1
+                    )
+                entry.cpu_jiffies = cpu_jiffies
+                entry.sampled_at = now
+                read_bytes, write_bytes = self._io_counters(entry)
+                processes.append(
+                    ProcessInfo(
+                        pid=pid,
+                        name=_process_name(buffer[buffer.find(b"(", 0, close) + 1:close], entry.command_line),
+                        status=_STATUS.get(chr(fields[0][0]), "unknown"),
+                        username=entry.username,
+                        create_time=entry.create_time,
+                        cpu_percent=max(0.0, cpu_percent),
+                        memory_bytes=int(fields[21]) * _PAGE_SIZE,
+                        command_line=entry.command_line,
+                        nice=int(fields[16]),
+                        io_read_bytes=read_bytes,
+                        io_write_bytes=write_bytes,
+                    )
+                )
+        for pid in self._entries.keys() - seen:
+            del self._entries[pid]
+        return processes
@@ -3,8 +3,6 @@
 from __future__ import annotations
 
 import time
-from pathlib import Path
-from typing import Iterable
 
 import psutil
 
@@ -19,7 +17,8 @@ from mission_center.models import (
     TemperatureSensorsSnapshot,
 )
 
-_SYS_POWER_SUPPLY = Path("/sys/class/power_supply")
+from .hwmon import HWMON
+from .power_supply import POWER_SUPPLIES, PowerSupplyReading
 
 
 def _temperature_reading(source: str, entry: object) -> TemperatureSensorReading:
@@ -44,12 +43,15 @@ def _temperature_reading(source: str, entry: object) -> TemperatureSensorReading
 
 
 def collect_temperature_sensors() -> TemperatureSensorsSnapshot:
-    """Collect temperature sensors exposed by psutil.
+    """Collect temperature sensors from hwmon (or thermal zones).
 
-    The function gracefully handles platforms without sensor support by
-    returning an empty snapshot.
+    Without ``/sys`` the readings come from psutil; platforms without sensor
+    support get an empty snapshot.
     """
 
+    if HWMON.available():
+        sample = HWMON.sample()
+        return TemperatureSensorsSnapshot(timestamp=sample.timestamp, groups=sample.temperatures)
     timestamp = time.time()
     groups: list[TemperatureSensorGroup] = []
     try:
@@ -79,6 +81,9 @@ def _fan_reading(source: str, entry: object) -> FanSensorReading:
 
 
 def collect_fan_sensors() -> FanSensorsSnapshot:
+    if HWMON.available():
+        sample = HWMON.sample()
+        return FanSensorsSnapshot(timestamp=sample.timestamp, readings=sample.fans)
     timestamp = time.time()
     readings: list[FanSensorReading] = []
     try:
@@ -90,104 +95,107 @@ def collect_fan_sensors() -> FanSensorsSnapshot:
     return FanSensorsSnapshot(timestamp=timestamp, readings=readings)
 
 
-def _read_text(path: Path) -> str | None:
+def _psutil_battery() -> object | None:
     try:
-        value = path.read_text(encoding="utf-8", errors="replace").strip()
-    except OSError:
+        return psutil.sensors_battery()
+    except (AttributeError, NotImplementedError):  # pragma: no cover - optional
         return None
-    return value or None
-
 
-def _read_float(path: Path, scale: float | None = None) -> float | None:
-    text = _read_text(path)
-    if text is None:
-        return None
-    try:
-        value = float(text)
-    except ValueError:
-        return None
-    if scale:
-        value /= scale
-    return value
 
+def _battery_state(
+    battery: PowerSupplyReading | None, supplies: list[PowerSupplyReading]
+) -> tuple[float | None, float | None, bool | None]:
+    """``(percent, secs_left, power_plugged)`` computed like ``psutil.sensors_battery``."""
+
+    if battery is None:
+        return None, None, None
+    percent = battery.capacity_percent
+    if battery.energy_now_wh is not None and battery.energy_full_wh:
+        percent = 100.0 * battery.energy_now_wh / battery.energy_full_wh
+    elif battery.charge_now_ah is not None and battery.charge_full_ah:
+        percent = 100.0 * battery.charge_now_ah / battery.charge_full_ah
+    if percent is not None:
+        percent = min(100.0, max(0.0, percent))
+
+    # Adaptador de corriente (Mains/USB) si lo hay; si no, el estado de la batería
+    adapters = [supply.online for supply in supplies if not supply.is_battery and supply.online is not None]
+    status = (battery.status or "").lower()
+    plugged: bool | None
+    if adapters:
+        plugged = any(adapters)
+    elif status == "discharging":
+        plugged = False
+    elif status in ("charging", "full", "not charging"):
+        plugged = True
+    else:
+        plugged = None
 
-def _read_int(path: Path) -> int | None:
-    text = _read_text(path)
-    if text is None:
-        return None
-    try:
-        return int(float(text))
-    except ValueError:
-        return None
-
-
-def _detect_temperature(value: float | None) -> float | None:
-    if value is None:
-        return None
-    if value > 1000:  # heurística para milésimas
-        return value / 1000.0
-    if value > 200:  # heurística para décimas
-        return value / 10.0
-    return value
+    secs_left: float | None = None
+    if plugged is False:
+        if battery.energy_now_wh is not None and battery.power_watts:
+            secs_left = battery.energy_now_wh / abs(battery.power_watts) * 3600
+        elif battery.charge_now_ah is not None and battery.current_amperes:
+            secs_left = battery.charge_now_ah / abs(battery.current_amperes) * 3600
+    return percent, secs_left, plugged
 
 
 def collect_power_sources_snapshot() -> PowerSourcesSnapshot:
+    if POWER_SUPPLIES.available():
+        sample = POWER_SUPPLIES.sample()
+        sources = [
+            PowerSourceReading(
+                name=supply.name,
+                status=supply.status,
+                is_online=supply.online,
+                voltage_volts=supply.voltage_volts,
+                current_amperes=supply.current_amperes,
+                power_watts=supply.power_watts,
+                capacity_percent=supply.capacity_percent,
+                temperature_celsius=supply.temperature_celsius,
+            )
+            for supply in sample.supplies
+        ]
+        return PowerSourcesSnapshot(timestamp=sample.timestamp, sources=sources)
+
+    # Sin /sys: al menos la batería que exponga psutil
     timestamp = time.time()
     sources: list[PowerSourceReading] = []
-    if _SYS_POWER_SUPPLY.exists():
-        for entry in _SYS_POWER_SUPPLY.iterdir():
-            if not entry.is_dir():
-                continue
-            name = entry.name
-            status = _read_text(entry / "status")
-            online = _read_int(entry / "online")
-            voltage = _read_float(entry / "voltage_now", scale=1_000_000)
-            current = _read_float(entry / "current_now", scale=1_000_000)
-            power = _read_float(entry / "power_now", scale=1_000_000)
-            capacity = _read_float(entry / "capacity")
-            temperature = _detect_temperature(_read_float(entry / "temp"))
-            if power is None and voltage is not None and current is not None:
-                power = voltage * current
-            sources.append(
-                PowerSourceReading(
-                    name=name,
-                    status=status,
-                    is_online=bool(online) if online is not None else None,
-                    voltage_volts=voltage,
-                    current_amperes=current,
-                    power_watts=power,
-                    capacity_percent=capacity,
-                    temperature_celsius=temperature,
-                )
-            )
-    if not sources:
-        # Fallback: at least surface the battery if available
-        try:
-            battery = psutil.sensors_battery()
-        except (AttributeError, NotImplementedError):  # pragma: no cover
-            battery = None
-        if battery is not None:
-            sources.append(
-                PowerSourceReading(
-                    name="battery",
-                    status="charging" if battery.power_plugged else "discharging",
-                    is_online=battery.power_plugged,
-                    voltage_volts=None,
-                    current_amperes=None,
-                    power_watts=None,
-                    capacity_percent=float(battery.percent) if battery.percent is not None else None,
-                    temperature_celsius=None,
-                )
+    battery = _psutil_battery()
+    if battery is not None:
+        sources.append(
+            PowerSourceReading(
+                name="battery",
+                status="charging" if battery.power_plugged else "discharging",
+                is_online=battery.power_plugged,
+                voltage_volts=None,
+                current_amperes=None,
+                power_watts=None,
+                capacity_percent=float(battery.percent) if battery.percent is not None else None,
+                temperature_celsius=None,
             )
+        )
     return PowerSourcesSnapshot(timestamp=timestamp, sources=sources)
 
 
 def collect_battery_snapshot() -> BatterySnapshot:
+    if POWER_SUPPLIES.available():
+        sample = POWER_SUPPLIES.sample()
+        battery = next((supply for supply in sample.supplies if supply.is_battery), None)
+        percent, secs_left, plugged = _battery_state(battery, sample.supplies)
+        return BatterySnapshot(
+            timestamp=sample.timestamp,
+            percent=percent,
+            secs_left=secs_left,
+            power_plugged=plugged,
+            cycle_count=battery.cycle_count if battery else None,
+            power_supply=battery.name if battery else None,
+            energy_full_wh=battery.energy_full_wh if battery else None,
+            energy_now_wh=battery.energy_now_wh if battery else None,
+            temperature_celsius=battery.temperature_celsius if battery else None,
+        )
+
     timestamp = time.time()
-    try:
-        battery = psutil.sensors_battery()
-    except (AttributeError, NotImplementedError):  # pragma: no cover - optional
-        battery = None
+    battery = _psutil_battery()
     percent: float | None = None
     secs_left: float | None = None
     plugged: bool | None = None
@@ -199,34 +207,4 @@ def collect_battery_snapshot() -> BatterySnapshot:
         elif secs is not None and secs >= 0:
             secs_left = float(secs)
         plugged = bool(battery.power_plugged)
-
-    cycle_count: int | None = None
-    energy_full: float | None = None
-    energy_now: float | None = None
-    temperature: float | None = None
-    supply_name: str | None = None
-
-    if _SYS_POWER_SUPPLY.exists():
-        batteries: Iterable[Path] = [p for p in _SYS_POWER_SUPPLY.iterdir() if p.is_dir()]
-        for entry in batteries:
-            entry_type = _read_text(entry / "type")
-            if entry_type and entry_type.lower() != "battery":
-                continue
-            supply_name = entry.name
-            cycle_count = _read_int(entry / "cycle_count") or cycle_count
-            energy_full = _read_float(entry / "energy_full", scale=1_000_000) or energy_full
-            energy_now = _read_float(entry / "energy_now", scale=1_000_000) or energy_now
-            temperature = _detect_temperature(_read_float(entry / "temp")) or temperature
-            break
-
-    return BatterySnapshot(
-        timestamp=timestamp,
-        percent=percent,
-        secs_left=secs_left,
-        power_plugged=plugged,
-        cycle_count=cycle_count,
-        power_supply=supply_name,
-        energy_full_wh=energy_full,
-        energy_now_wh=energy_now,
-        temperature_celsius=temperature,
-    )
+    return BatterySnapshot(timestamp=timestamp, percent=percent, secs_left=secs_left, power_plugged=plugged)
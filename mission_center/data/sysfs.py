@@ -0,0 +1,176 @@
+"""Cached file descriptors for sysfs/procfs attribute reads."""
+
+from __future__ import annotations
+
+import errno
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_CHUNK = 4096  # los atributos de sysfs ocupan como mucho una página
+# El dispositivo desapareció: se cierra el descriptor y se reabre la ruta
+_GONE = frozenset({errno.ENOENT, errno.ENODEV, errno.ENXIO, errno.ESTALE})
+
+
+@dataclass(slots=True)
+class _Handle:
+    fd: int
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SysfsReader:
+    """Keeps attribute files open and re-reads them with :func:`os.pread`.
+
+    The first read of a path opens it; later reads are a single ``pread`` at
+    offset 0, which sysfs and seq_file-backed procfs files regenerate on each
+    call. A read failing with ENOENT/ENODEV (device removed) closes the fd and
+    reopens the path once. Paths that cannot be opened are remembered for
+    ``retry_after`` seconds so missing optional attributes cost nothing per
+    cycle. At most ``max_open`` fds are kept, least recently used first out.
+
+    Thread-safe: the table is guarded by one lock and each fd by its own, so
+    providers running in parallel never read a descriptor being closed.
+    """
+
+    def __init__(self, max_open: int = 512, retry_after: float = 30.0) -> None:
+        self.max_open = max_open
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._handles: OrderedDict[str, _Handle] = OrderedDict()
+        self._missing: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def _handle(self, path: str) -> _Handle | None:
+        with self._lock:
+            handle = self._handles.get(path)
+            if handle is not None:
+                self._handles.move_to_end(path)
+                return handle
+            retry_at = self._missing.get(path)
+            if retry_at is not None and time.monotonic() < retry_at:
+                return None
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            with self._lock:
+                self._missing[path] = time.monotonic() + self.retry_after
+            return None
+        evicted: list[_Handle] = []
+        with self._lock:
+            self._missing.pop(path, None)
+            current = self._handles.get(path)
+            if current is not None:
+                # Otro hilo abrió la misma ruta a la vez: se conserva la suya
+                os.close(fd)
+                return current
+            handle = self._handles[path] = _Handle(fd)
+            while len(self._handles) > self.max_open:
+                evicted.append(self._handles.popitem(last=False)[1])
+        for old in evicted:
+            self._close(old)
+        return handle
+
+    @staticmethod
+    def _close(handle: _Handle) -> None:
+        with handle.lock:
+            if handle.fd >= 0:
+                os.close(handle.fd)
+                handle.fd = -1
+
+    def _discard(self, path: str, handle: _Handle) -> None:
+        with self._lock:
+            if self._handles.get(path) is handle:
+                del self._handles[path]
+        self._close(handle)
+
+    @staticmethod
+    def _pread(fd: int) -> bytes:
+        data = os.pread(fd, _CHUNK, 0)
+        if len(data) < _CHUNK:
+            return data
+        # Ficheros de procfs mayores de una página (p. ej. /proc/stat)
+        chunks = [data]
+        offset = _CHUNK
+        while True:
+            chunk = os.pread(fd, _CHUNK, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b"".join(chunks)
+
+    def read_bytes(self, path: PathLike) -> bytes | None:
+        """Return the raw contents of ``path`` or ``None`` if unreadable."""
+
+        key = os.fspath(path)
+        for _ in range(2):
+            handle = self._handle(key)
+            if handle is None:
+                return None
+            with handle.lock:
+                if handle.fd < 0:
+                    continue  # cerrado por desalojo entre la búsqueda y la lectura
+                try:
+                    return self._pread(handle.fd)
+                except OSError as exc:
+                    if exc.errno not in _GONE:
+                        # EIO, EAGAIN, ENODATA...: el atributo existe pero hoy no responde
+                        return None
+            self._discard(key, handle)
+        return None
+
+    def read(self, path: PathLike) -> str | None:
+        """Return the stripped text of ``path``; ``None`` if unreadable or empty."""
+
+        data = self.read_bytes(path)
+        if data is None:
+            return None
+        return data.decode("utf-8", "replace").strip() or None
+
+    def forget(self, prefix: PathLike) -> None:
+        """Close every fd under ``prefix`` (e.g. after a device was removed)."""
+
+        prefix = os.fspath(prefix)
+        with self._lock:
+            stale = [path for path in self._handles if path.startswith(prefix)]
+            handles = [self._handles.pop(path) for path in stale]
+            for path in [path for path in self._missing if path.startswith(prefix)]:
+                del self._missing[path]
+        for handle in handles:
+            self._close(handle)
+
+    def close(self) -> None:
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+            self._missing.clear()
+        for handle in handles:
+            self._close(handle)
+
+
+# Lector compartido por todos los proveedores
+SYSFS = SysfsReader()
+
+
+def read_attribute(path: PathLike) -> str | None:
+    """Read a sysfs attribute through the shared :data:`SYSFS` reader."""
+
+    return SYSFS.read(path)
+
+
+def read_once(path: PathLike) -> str | None:
+    """Read an attribute that is not polled (identity, DMI) without keeping its fd."""
+
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read(_CHUNK)
+    except OSError:
+        return None
+    return data.decode("utf-8", "replace").strip() or None
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import dataclasses
+import os
 import platform
 import socket
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -12,20 +15,16 @@ import psutil
 
 from mission_center.models import SystemInfoSnapshot
 
-from .gpu import collect_gpu_snapshot
+from .gpu import last_gpu_snapshot
+from .sysfs import SYSFS, read_attribute, read_once
 
 _DMI_PATH = Path("/sys/class/dmi/id")
+_CPU_ONLINE = "/sys/devices/system/cpu/online"
+_MEMINFO = "/proc/meminfo"
 
 
 def _read_dmi(field: str) -> str | None:
-    path = _DMI_PATH / field
-    if not path.exists():
-        return None
-    try:
-        value = path.read_text(encoding="utf-8", errors="replace").strip()
-    except OSError:
-        return None
-    return value or None
+    return read_once(_DMI_PATH / field)
 
 
 def _detect_virtualization() -> str | None:
@@ -90,15 +89,25 @@ _CHASSIS_TYPES = {
 }
 
 
-def collect_system_info() -> SystemInfoSnapshot:
-    timestamp = time.time()
-    uname = platform.uname()
-    hostname = getattr(uname, "node", None) or socket.gethostname()
-    os_name = platform.system() or None
-    os_version = platform.version() or None
-    kernel_version = getattr(uname, "release", None)
-    architecture = getattr(uname, "machine", None)
-    cpu_model = getattr(uname, "processor", None) or platform.processor() or None
+def _scan_static() -> SystemInfoSnapshot:
+    """Everything that does not change while the machine runs; uptime is left empty."""
+
+    # os.uname() se consulta cada vez: platform.uname() queda en caché para todo el
+    # proceso y un reescaneo por cambio de hostname o kernel devolvería los valores viejos
+    if hasattr(os, "uname"):
+        uname = os.uname()
+        hostname = uname.nodename or socket.gethostname()
+        os_name = uname.sysname or None
+        os_version = uname.version or None
+        kernel_version = uname.release or None
+        architecture = uname.machine or None
+    else:  # pragma: no cover - Windows
+        hostname = socket.gethostname()
+        os_name = platform.system() or None
+        os_version = platform.version() or None
+        kernel_version = platform.release() or None
+        architecture = platform.machine() or None
+    cpu_model = platform.processor() or None
 
     logical_cores = psutil.cpu_count(logical=True)
     physical_cores = psutil.cpu_count(logical=False)
@@ -114,10 +123,6 @@ def collect_system_info() -> SystemInfoSnapshot:
     except Exception:  # pragma: no cover - psutil fallback
         boot_time = None
 
-    uptime_seconds = None
-    if boot_time:
-        uptime_seconds = max(0.0, timestamp - boot_time)
-
     bios_vendor = _read_dmi("bios_vendor")
     bios_version = _read_dmi("bios_version")
     bios_date = _read_dmi("bios_date")
@@ -129,20 +134,8 @@ def collect_system_info() -> SystemInfoSnapshot:
 
     virtualization = _detect_virtualization()
 
-    gpu_devices: list[str] = []
-    try:
-        gpu_snapshots = collect_gpu_snapshot()
-    except Exception:  # pragma: no cover - optional NVML
-        gpu_snapshots = []
-    for gpu in gpu_snapshots:
-        device_name = gpu.name
-        if gpu.vendor:
-            device_name = f"{gpu.vendor} {device_name}" if device_name else gpu.vendor
-        if device_name:
-            gpu_devices.append(device_name)
-
     return SystemInfoSnapshot(
-        timestamp=timestamp,
+        timestamp=time.time(),
         hostname=hostname,
         os_name=os_name,
         os_version=os_version,
@@ -152,7 +145,7 @@ def collect_system_info() -> SystemInfoSnapshot:
         logical_cores=logical_cores,
         physical_cores=physical_cores,
         total_memory_bytes=total_memory_bytes,
-        uptime_seconds=uptime_seconds,
+        uptime_seconds=None,
         boot_time=boot_time,
         bios_vendor=bios_vendor,
         bios_version=bios_version,
@@ -162,5 +155,71 @@ def collect_system_info() -> SystemInfoSnapshot:
         system_model=system_model,
         chassis_type=chassis_type,
         virtualization=virtualization,
-        gpu_devices=gpu_devices,
+    )
+
+
+def _hardware_fingerprint() -> tuple[object, ...]:
+    """Cheap per-tick probe of what a hotplug or rename would change.
+
+    Hostname and kernel come from one ``uname`` syscall; the online CPU list
+    and the ``MemTotal`` line are single preads through :data:`SYSFS`.
+    """
+
+    uname = os.uname() if hasattr(os, "uname") else None
+    meminfo = SYSFS.read_bytes(_MEMINFO) or b""
+    return uname.nodename if uname else None, uname.release if uname else None, read_attribute(_CPU_ONLINE), meminfo.split(b"\n", 1)[0]
+
+
+class _StaticSystemInfo:
+    """Static half of :class:`SystemInfoSnapshot`, rescanned only when asked or on hotplug."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: SystemInfoSnapshot | None = None
+        self._fingerprint: tuple[object, ...] | None = None
+
+    def get(self) -> SystemInfoSnapshot:
+        fingerprint = _hardware_fingerprint()
+        with self._lock:
+            if self._snapshot is None or fingerprint != self._fingerprint:
+                self._snapshot = _scan_static()
+                self._fingerprint = fingerprint
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
+_STATIC = _StaticSystemInfo()
+
+
+def rescan_system_info() -> None:
+    """Drop the cached static system information; the next collection rescans it."""
+
+    _STATIC.invalidate()
+
+
+def _gpu_devices() -> list[str]:
+    gpu_devices: list[str] = []
+    for gpu in last_gpu_snapshot():
+        device_name = gpu.name
+        if gpu.vendor and not (device_name or "").startswith(gpu.vendor):
+            device_name = f"{gpu.vendor} {device_name}" if device_name else gpu.vendor
+        if device_name:
+            gpu_devices.append(device_name)
+    return gpu_devices
+
+
+def collect_system_info() -> SystemInfoSnapshot:
+    static = _STATIC.get()
+    timestamp = time.time()
+    uptime_seconds = None
+    if static.boot_time:
+        uptime_seconds = max(0.0, timestamp - static.boot_time)
+    return dataclasses.replace(
+        static,
+        timestamp=timestamp,
+        uptime_seconds=uptime_seconds,
+        gpu_devices=_gpu_devices(),
     )
@@ -59,6 +59,12 @@ class CPUSnapshot:
     physical_cores: int | None
     context_switches: int | None
     interrupts: int | None
+    user_percent: float | None = None
+    system_percent: float | None = None
+    iowait_percent: float | None = None
+    steal_percent: float | None = None
+    context_switches_per_sec: float | None = None
+    interrupts_per_sec: float | None = None
 
 
 @dataclass(slots=True)
@@ -136,6 +142,8 @@ class PCIELinkSnapshot:
     link_width: int | None
     max_link_speed_gtps: float | None
     max_link_width: int | None
+    vendor_name: str | None = None  # según pci.ids; None si no hay base de datos o no figura
+    device_name: str | None = None
 
 
 @dataclass(slots=True)
@@ -0,0 +1,430 @@
+"""Single-threaded asyncio engine for the Mission Center web server."""
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import json
+import logging
+import socket
+import threading
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from http import HTTPStatus
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .collector import DataCollector, collector
+from .encoding import ResponseCompressor
+from .payload import Fields, PublishedSnapshot
+from .routes import (
+    PUBLISHED_ROUTES,
+    content_type,
+    fields_argument,
+    history_arguments,
+    published_view,
+    render_index,
+    static_file,
+)
+from .security import RequestGuard, error_body
+from mission_center.core.config import SECURITY, SERVER, ServerConfig
+
+logger = logging.getLogger(__name__)
+
+SERVER_VERSION = "MissionCenterWeb/1.0"
+_MAX_HEADER_BYTES = 16 * 1024
+_MAX_BODY_BYTES = 64 * 1024
+_BACKLOG = 1024
+_NO_BODY_STATUSES = {HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED}
+_JSON = ("Content-Type", "application/json; charset=utf-8")
+_HTML = ("Content-Type", "text/html; charset=utf-8")
+_NOT_FOUND = b"<html><body><h1>404</h1><p>File not found</p></body></html>"
+_VARY_ENCODING = ("Vary", "Accept-Encoding")
+
+
+class _BadRequest(ValueError):
+    """Malformed request line or headers; the connection is closed."""
+
+
+@dataclass(slots=True)
+class _Request:
+    method: str
+    target: str
+    version: str
+    headers: dict[str, str]  # nombres en minúsculas
+    client_ip: str
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+def _content_encoding(encoding: Optional[str]) -> list[tuple[str, str]]:
+    return [("Content-Encoding", encoding)] if encoding else []
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    # Mismo criterio que el motor con hilos para puertos ocupados
+    max_attempts = 10
+    for attempt in range(max_attempts):
+        try:
+            sock = socket.create_server((host, port + attempt), backlog=_BACKLOG)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+            if attempt == max_attempts - 1:
+                raise Exception(f"No se pudo encontrar puerto disponible después de {max_attempts} intentos")
+            continue
+        sock.setblocking(False)
+        return sock
+    raise AssertionError("unreachable")
+
+
+class AsyncMissionCenterServer:
+    """Serves the dashboard from one asyncio event loop.
+
+    Idle keep-alive and streaming connections cost a coroutine and a socket
+    instead of an OS thread, so thousands of wall-board clients share the
+    thread running :meth:`serve_forever`. Routes, security checks and CORS
+    rules match :class:`~mission_center.web.server.MissionCenterRequestHandler`;
+    only ``/api/history`` and static file reads leave the loop, on the default
+    executor.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        server_config: ServerConfig = SERVER,
+        data_collector: Optional[DataCollector] = None,
+        request_guard: Optional[RequestGuard] = None,
+    ) -> None:
+        self._collector = data_collector or collector
+        self._collector.start()
+        self._guard = request_guard or RequestGuard(SECURITY)
+        self._config = server_config
+        self._compressor = ResponseCompressor(server_config)
+        self._socket = _bind(host, port)
+        self.host = host
+        self.port = self._socket.getsockname()[1]
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shutdown: Optional[asyncio.Event] = None
+        # Se sustituye en cada tick: los streams esperan sobre el evento vigente
+        self._tick: Optional[asyncio.Event] = None
+        self._connections: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+        self._stream_clients = 0
+        self._stop_requested = threading.Event()
+
+    def serve_forever(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stop_requested.set()
+        loop, shutdown = self._loop, self._shutdown
+        if loop is not None and shutdown is not None:
+            try:
+                loop.call_soon_threadsafe(shutdown.set)
+            except RuntimeError:  # el bucle ya se cerró
+                pass
+        else:
+            self._socket.close()
+        self._collector.stop()
+
+    def server_address(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        self._tick = asyncio.Event()
+        self._loop = loop
+        if self._stop_requested.is_set():
+            self._socket.close()
+            return
+
+        def on_publish(_published: PublishedSnapshot) -> None:
+            loop.call_soon_threadsafe(self._on_publish)
+
+        self._collector.add_listener(on_publish)
+        server = await asyncio.start_server(
+            self._handle_connection, sock=self._socket, limit=_MAX_HEADER_BYTES, backlog=_BACKLOG
+        )
+        try:
+            await self._shutdown.wait()
+        finally:
+            self._collector.remove_listener(on_publish)
+            server.close()
+            # Cerrar los transportes despierta a los lectores con EOF y
+            # _on_publish a los streams; cancelar las tareas dejaría trazas
+            # de CancelledError en el callback de asyncio.streams.
+            for writer in self._connections.values():
+                writer.transport.abort()
+            self._on_publish()
+            if self._connections:
+                await asyncio.wait(list(self._connections), timeout=self._config.stream_write_timeout_seconds)
+            self._loop = None
+
+    def _on_publish(self) -> None:
+        tick, self._tick = self._tick, asyncio.Event()
+        if tick is not None:
+            tick.set()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self._connections) >= self._config.max_connections:
+            writer.close()
+            return
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else ""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader, client_ip), self._config.idle_timeout_seconds
+                    )
+                except _BadRequest as exc:
+                    body = error_body("bad_request", str(exc))
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, [_JSON], body, keep_alive=False)
+                    break
+                if request is None or not await self._dispatch(request, writer):
+                    break
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Error atendiendo a %s", client_ip, exc_info=exc)
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader, client_ip: str) -> Optional[_Request]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise _BadRequest("Cabeceras demasiado grandes") from None
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial.strip():
+                raise _BadRequest("Petición incompleta") from None
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise _BadRequest("Línea de petición inválida")
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, separator, value = line.partition(":")
+            if not separator:
+                raise _BadRequest("Cabecera inválida")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise _BadRequest("Cuerpo de petición no soportado")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise _BadRequest("Content-Length inválido") from None
+        if length < 0 or length > _MAX_BODY_BYTES:
+            raise _BadRequest("Cuerpo de petición demasiado grande")
+        if length:
+            await reader.readexactly(length)  # se descarta: la API solo admite GET
+        return _Request(parts[0].upper(), parts[1], parts[2], headers, client_ip)
+
+    async def _dispatch(self, request: _Request, writer: asyncio.StreamWriter) -> bool:
+        """Answer one request; returns whether the connection stays open."""
+
+        keep_alive = request.keep_alive
+        if request.method == "OPTIONS":
+            response = self._guard.preflight(request.headers.get("origin"), request.client_ip)
+            await self._send(writer, response.status, response.headers, response.body, keep_alive)
+            return keep_alive
+        if request.method not in {"GET", "HEAD"}:
+            body = error_body("not_implemented", f"Método no soportado: {request.method}")
+            await self._send(writer, HTTPStatus.NOT_IMPLEMENTED, [_JSON], body, keep_alive)
+            return keep_alive
+        head_only = request.method == "HEAD"
+
+        url = urlsplit(request.target)
+        route = url.path
+        query = parse_qs(url.query)
+        if route in {"/", "/index.html"}:
+            await self._send(writer, HTTPStatus.OK, [_HTML], render_index(), keep_alive, head_only)
+            return keep_alive
+        if route in PUBLISHED_ROUTES or route in {"/api/stream", "/api/history"}:
+            origin, rejection = self._guard.check_api(
+                request.headers.get("origin"), request.headers.get("authorization"), request.client_ip
+            )
+            if rejection is not None:
+                await self._send(writer, rejection.status, rejection.headers, rejection.body, keep_alive, head_only)
+                return keep_alive
+            cors = [*self._guard.cors_headers(origin), _VARY_ENCODING]
+            accept_encoding = request.headers.get("accept-encoding")
+            published = self._collector.published()
+            try:
+                if route in PUBLISHED_ROUTES:
+                    key, build = published_view(published, route, query)
+                elif route == "/api/stream":
+                    fields = fields_argument(query)
+                else:
+                    arguments = history_arguments(query)
+            except ValueError as exc:
+                body = error_body("bad_request", str(exc))
+                await self._send(writer, HTTPStatus.BAD_REQUEST, [*cors, _JSON], body, keep_alive)
+                return keep_alive
+            if route in PUBLISHED_ROUTES:
+                body, etag, encoding = self._compressor.cached(published, key, build, accept_encoding)
+                if request.headers.get("if-none-match") == etag:
+                    await self._send(writer, HTTPStatus.NOT_MODIFIED, [*cors, ("ETag", etag)], b"", keep_alive)
+                    return keep_alive
+                headers = [*cors, _JSON, *_content_encoding(encoding), ("ETag", etag)]
+                await self._send(writer, HTTPStatus.OK, headers, body, keep_alive, head_only)
+                return keep_alive
+            if route == "/api/stream":
+                return await self._stream(writer, cors, fields, keep_alive)
+            # El histórico toma el lock del colector y serializa cientos de
+            # muestras: se hace fuera del bucle para no frenar a los streams.
+            try:
+                body, encoding = await asyncio.get_running_loop().run_in_executor(
+                    None, partial(self._encode_history, arguments, accept_encoding)
+                )
+            except ValueError as exc:
+                body = error_body("bad_request", str(exc))
+                await self._send(writer, HTTPStatus.BAD_REQUEST, [*cors, _JSON], body, keep_alive)
+                return keep_alive
+            headers = [*cors, _JSON, *_content_encoding(encoding)]
+            await self._send(writer, HTTPStatus.OK, headers, body, keep_alive, head_only)
+            return keep_alive
+        return await self._send_static(writer, request, route, keep_alive, head_only)
+
+    def _encode_history(
+        self,
+        arguments: dict[str, object],
+        accept_encoding: Optional[str],
+    ) -> tuple[bytes, Optional[str]]:
+        body = json.dumps(self._collector.history(**arguments) or {}).encode("utf-8")
+        return self._compressor.encode(body, accept_encoding)
+
+    async def _send_static(
+        self,
+        writer: asyncio.StreamWriter,
+        request: _Request,
+        route: str,
+        keep_alive: bool,
+        head_only: bool,
+    ) -> bool:
+        path = static_file(route)
+        if path is None:
+            await self._send(writer, HTTPStatus.NOT_FOUND, [_HTML], _NOT_FOUND, keep_alive, head_only)
+            return keep_alive
+        loop = asyncio.get_running_loop()
+        try:
+            modified = (await loop.run_in_executor(None, path.stat)).st_mtime
+        except OSError:
+            modified = None
+        headers = [("Content-Type", content_type(path))]
+        if modified is not None:
+            headers.append(("Last-Modified", formatdate(modified, usegmt=True)))
+            since = request.headers.get("if-modified-since")
+            if since and "if-none-match" not in request.headers:
+                try:
+                    if int(modified) <= parsedate_to_datetime(since).timestamp():
+                        await self._send(writer, HTTPStatus.NOT_MODIFIED, headers[1:], b"", keep_alive)
+                        return keep_alive
+                except (TypeError, ValueError, IndexError, OverflowError):
+                    pass
+        try:
+            body = await loop.run_in_executor(None, path.read_bytes)
+        except OSError:
+            await self._send(writer, HTTPStatus.NOT_FOUND, [_HTML], _NOT_FOUND, keep_alive, head_only)
+            return keep_alive
+        await self._send(writer, HTTPStatus.OK, headers, body, keep_alive, head_only)
+        return keep_alive
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        cors: list[tuple[str, str]],
+        fields: Optional[Fields],
+        keep_alive: bool,
+    ) -> bool:
+        """Push one Server-Sent Events frame per collector tick.
+
+        Same contract as the threaded engine: the latest snapshot is sent after
+        each drain, so slow clients skip ticks, and a drain that takes longer
+        than ``stream_write_timeout_seconds`` drops the connection.
+        """
+
+        if self._stream_clients >= self._config.max_stream_clients:
+            body = error_body("unavailable", "Demasiados clientes de streaming")
+            headers = [
+                *cors,
+                _JSON,
+                ("Retry-After", str(self._config.stream_keepalive_seconds)),
+            ]
+            await self._send(writer, HTTPStatus.SERVICE_UNAVAILABLE, headers, body, keep_alive)
+            return keep_alive
+        self._stream_clients += 1
+        try:
+            headers = [
+                *cors,
+                ("Content-Type", "text/event-stream; charset=utf-8"),
+                ("Cache-Control", "no-cache"),
+                ("X-Accel-Buffering", "no"),
+            ]
+            # Sin Content-Length: el cuerpo termina al cerrar la conexión
+            await self._send(writer, HTTPStatus.OK, headers, b"retry: 3000\n\n", keep_alive=False, sized=False)
+            last_sequence = -1
+            while self._collector.is_running() and not self._shutdown.is_set():
+                tick = self._tick
+                published = self._collector.published()
+                if published.sequence > last_sequence:
+                    writer.write(published.sse_frame(fields))
+                    last_sequence = published.sequence
+                else:
+                    try:
+                        await asyncio.wait_for(tick.wait(), self._config.stream_keepalive_seconds)
+                        continue
+                    except asyncio.TimeoutError:
+                        writer.write(b": keepalive\n\n")
+                await asyncio.wait_for(writer.drain(), self._config.stream_write_timeout_seconds)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            self._stream_clients -= 1
+        return False
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        headers: list[tuple[str, str]],
+        body: bytes,
+        keep_alive: bool,
+        head_only: bool = False,
+        sized: bool = True,
+    ) -> None:
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Server: {SERVER_VERSION}",
+            f"Date: {formatdate(usegmt=True)}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        if sized and status not in _NO_BODY_STATUSES and not any(name == "Content-Length" for name, _ in headers):
+            lines.append(f"Content-Length: {len(body)}")
+        if not keep_alive:
+            lines.append("Connection: close")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        if head_only or status in _NO_BODY_STATUSES:
+            writer.write(payload)
+        else:
+            writer.writelines((payload, body))
+        await asyncio.wait_for(writer.drain(), self._config.stream_write_timeout_seconds)
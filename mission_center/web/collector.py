@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from dataclasses import asdict
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
 import logging
 import os
 import threading
 import time
-from typing import Any, Callable, Deque
+from typing import Any, Callable, Hashable, Iterable
 
-from mission_center.core import HISTORY
+from mission_center.core import CONFIG, HISTORY
+from mission_center.core.config import COLLECTOR, DATA_DIR, CollectorConfig, UpdateIntervals
+from mission_center.core.workers import DaemonExecutor
 from mission_center.data import (
+    close_gpu_backend,
     collect_battery_snapshot,
     collect_cpu_snapshot,
     collect_disk_snapshot,
@@ -25,7 +29,15 @@ from mission_center.data import (
     collect_process_snapshot,
     collect_system_info,
     collect_temperature_sensors,
+    configure_filesystem_usage,
+    gpu_backend,
+    rescan_system_info,
+    set_gpu_backend,
+    set_process_backend,
 )
+from .history import BufferFactory, RingBuffer, RollupBuffer, TieredHistory
+from .history_store import HistoryStore
+from .payload import PublishedSnapshot
 from mission_center.models import (
     BatterySnapshot,
     CPUSnapshot,
@@ -47,6 +59,15 @@ _PRIMITIVE_TYPES = (int, float, str, bool)
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _ProviderSpec:
+    """Data provider registered in the collector together with its cadence tier."""
+
+    collect: Callable[[], Any]
+    expected_type: type[Any]
+    tier: str
+
+
 def _snapshot_to_dict(snapshot: Any) -> Any:
     """Convert dataclass snapshots into plain serialisable dictionaries."""
 
@@ -67,30 +88,96 @@ def _snapshot_to_dict(snapshot: Any) -> Any:
     return snapshot
 
 
+_CPU_FIELDS = {"usage": "usage", "frequency": "frequency"}
+_MEMORY_FIELDS = {name: name for name in ("usage", "used", "available", "swap_usage", "swap_used")}
+_DISK_FIELDS = {"read": "read", "write": "write"}
+_NETWORK_FIELDS = {"sent": "sent", "recv": "recv"}
+# Series por dispositivo de bloque: nombre en el histórico -> clave de IOSnapshot.per_device
+_IO_DEVICE_FIELDS = {
+    "read": "read_bytes_per_sec",
+    "write": "write_bytes_per_sec",
+    "r_await": "r_await_ms",
+    "w_await": "w_await_ms",
+    "queue": "avg_queue_size",
+    "utilization": "utilization_percent",
+}
+# loop y ram no son almacenamiento real; multiplicarían las columnas sin aportar
+_IO_DEVICE_SKIP = ("loop", "ram")
+_GPU_FIELDS = ("memory_total_bytes", "memory_used_bytes", "utilization_percent", "temperature_celsius")
+
+# Niveles de agregación: nombre -> (segundos por cubeta, número de cubetas)
+_MEDIUM_ROLLUP = {
+    f"{HISTORY.medium_resolution}s": (
+        HISTORY.medium_resolution,
+        HISTORY.long_window // HISTORY.medium_resolution,
+    ),
+}
+_ROLLUPS = {
+    **_MEDIUM_ROLLUP,
+    f"{HISTORY.long_resolution}s": (
+        HISTORY.long_resolution,
+        HISTORY.archive_window // HISTORY.long_resolution,
+    ),
+}
+
+
+def _unique_prefixes(keys: Iterable[Hashable]) -> list[Any]:
+    """Return the first element of tuple column keys, in insertion order."""
+
+    return list(dict.fromkeys(key[0] for key in keys if isinstance(key, tuple)))
+
+
+def _keyed_readings(readings: Iterable[tuple[str, str | None, float | None]]) -> dict[Hashable, float | None]:
+    """Key sensor readings by ``(source, label, ordinal)`` so repeated labels stay distinct."""
+
+    values: dict[Hashable, float | None] = {}
+    seen: defaultdict[tuple[str, str | None], int] = defaultdict(int)
+    for source, label, value in readings:
+        ordinal = seen[(source, label)]
+        seen[(source, label)] += 1
+        values[(source, label, ordinal)] = value
+    return values
+
+
+def _reading_records(
+    buffer: RingBuffer | RollupBuffer, value_name: str, since: int | None = None
+) -> list[dict[str, Any]]:
+    """Rebuild the ``{"time", "seq", "readings": [...]}`` history shape from keyed columns."""
+
+    keys = buffer.keys()
+    columns = [buffer.column(key, since) for key in keys]
+    records: list[dict[str, Any]] = []
+    for position, (timestamp, sequence) in enumerate(zip(buffer.timestamps(since), buffer.sequences(since))):
+        readings = [
+            {"source": key[0], "label": key[1], value_name: column[position]}
+            for key, column in zip(keys, columns)
+            if column[position] is not None
+        ]
+        records.append({"time": timestamp, "seq": sequence, "readings": readings})
+    return records
+
+
 class DataCollector:
     """Polls the data providers and keeps rolling histories for the web UI."""
 
-    def __init__(self, interval: float = 1.0) -> None:
+    def __init__(
+        self,
+        interval: float = 1.0,
+        intervals: UpdateIntervals = CONFIG,
+        settings: CollectorConfig = COLLECTOR,
+    ) -> None:
         self._interval = interval
+        self._settings = settings
         self._stop = threading.Event()
         self._thread: threading.Thread | None = None
         self._lock = threading.RLock()
 
-        history_size = HISTORY.short_window
-        medium_history = HISTORY.medium_window
-
-        self.cpu_history: Deque[dict[str, Any]] = deque(maxlen=history_size)
-        self.memory_history: Deque[dict[str, Any]] = deque(maxlen=history_size)
-        self.disk_history: Deque[dict[str, Any]] = deque(maxlen=history_size)
-        self.network_history: Deque[dict[str, Any]] = deque(maxlen=history_size)
-        self.io_history: Deque[dict[str, Any]] = deque(maxlen=history_size)
-        self.gpu_history: Deque[dict[str, Any]] = deque(maxlen=medium_history)
-        self.temperature_history: Deque[dict[str, Any]] = deque(maxlen=medium_history)
-        self.fan_history: Deque[dict[str, Any]] = deque(maxlen=medium_history)
-
-        self.cpu_core_history: dict[int, Deque[dict[str, Any]]] = defaultdict(
-            lambda: deque(maxlen=history_size)
-        )
+        # Con HISTORY.persist los históricos pasan a anillos mmap bajo DATA_DIR en start():
+        # importar el módulo (scripts, herramientas) no crea ni bloquea el directorio
+        self._history_store: HistoryStore | None = None
+        self._build_histories(None)
+        # Nombre y fabricante por índice de GPU; no caben en columnas numéricas
+        self._gpu_labels: dict[int, tuple[str, str]] = {}
 
         self.current_data: dict[str, Any] = {}
 
@@ -114,25 +201,93 @@ class DataCollector:
             "consecutive_failures": 0,
             "last_error": None,
             "provider_failures": {},
+            "provider_timeouts": {},
             "last_permission_refresh": None,
+            "process_backend": set_process_backend(settings.process_backend),
+            "gpu_backend": set_gpu_backend(settings.gpu_backend, settings.gpu_command, loop_ms=intervals.medium),
         }
+        configure_filesystem_usage(settings.statvfs_timeout / 1000.0, settings.statvfs_ttl / 1000.0)
         self._provider_failures: defaultdict[str, int] = defaultdict(int)
+        self._provider_timeouts: defaultdict[str, int] = defaultdict(int)
+
+        self._providers: dict[str, _ProviderSpec] = {
+            "cpu": _ProviderSpec(collect_cpu_snapshot, CPUSnapshot, "fast"),
+            "memory": _ProviderSpec(collect_memory_snapshot, MemorySnapshot, "fast"),
+            "disk": _ProviderSpec(collect_disk_snapshot, DiskSnapshot, "fast"),
+            "network": _ProviderSpec(collect_network_snapshot, NetworkSnapshot, "medium"),
+            "io": _ProviderSpec(collect_io_snapshot, IOSnapshot, "fast"),
+            "gpu": _ProviderSpec(collect_gpu_snapshot, list, "medium"),
+            "pcie": _ProviderSpec(collect_pcie_snapshot, PCIESnapshot, "slow"),
+            "processes": _ProviderSpec(collect_process_snapshot, ProcessSnapshot, "fast"),
+            "temperature": _ProviderSpec(collect_temperature_sensors, TemperatureSensorsSnapshot, "slow"),
+            "fans": _ProviderSpec(collect_fan_sensors, FanSensorsSnapshot, "slow"),
+            "battery": _ProviderSpec(collect_battery_snapshot, BatterySnapshot, "slow"),
+            "power": _ProviderSpec(collect_power_sources_snapshot, PowerSourcesSnapshot, "slow"),
+            "system": _ProviderSpec(collect_system_info, SystemInfoSnapshot, "slow"),
+        }
 
-        self._providers: dict[str, Callable[[], Any]] = {
-            "cpu": collect_cpu_snapshot,
-            "memory": collect_memory_snapshot,
-            "disk": collect_disk_snapshot,
-            "network": collect_network_snapshot,
-            "io": collect_io_snapshot,
-            "gpu": collect_gpu_snapshot,
-            "pcie": collect_pcie_snapshot,
-            "processes": collect_process_snapshot,
-            "temperature": collect_temperature_sensors,
-            "fans": collect_fan_sensors,
-            "battery": collect_battery_snapshot,
-            "power": collect_power_sources_snapshot,
-            "system": collect_system_info,
+        # Cadencia por nivel (segundos) y estado del planificador por proveedor
+        self._tier_intervals: dict[str, float] = {
+            "fast": intervals.fast / 1000.0,
+            "medium": intervals.medium / 1000.0,
+            "slow": intervals.slow / 1000.0,
         }
+        self._next_due: dict[str, float] = {}
+        self._latest: dict[str, Any] = {}
+
+        # Ejecución concurrente: proveedores que superaron su plazo siguen en vuelo
+        # y su último valor se publica marcado como obsoleto hasta que terminen.
+        self._executor: DaemonExecutor | None = None
+        self._inflight: dict[str, Future[Any]] = {}
+        self._stale: set[str] = set()
+
+        # Cuerpo JSON ya codificado del último tick; se sustituye de forma atómica.
+        # start() la adelanta a la de los históricos persistidos para que los
+        # clientes con ``since`` no reciban números repetidos tras un reinicio.
+        self._sequence = 0
+        self._instance_tag = f"{int(time.time()):x}"
+        self._published = PublishedSnapshot.build(
+            self.snapshot(), sequence=self._sequence, instance=self._instance_tag
+        )
+        self._published_changed = threading.Condition()
+        self._listeners: list[Callable[[PublishedSnapshot], None]] = []
+
+    def _build_histories(self, store: HistoryStore | None) -> None:
+        history_size = HISTORY.short_window
+        medium_history = HISTORY.medium_window
+        max_keys = HISTORY.max_series
+
+        def factory(family: str) -> BufferFactory | None:
+            return store.factory(family) if store is not None else None
+
+        self.cpu_history = TieredHistory(history_size, _ROLLUPS, factory("cpu"), max_keys)
+        self.memory_history = TieredHistory(history_size, _ROLLUPS, factory("memory"), max_keys)
+        self.disk_history = TieredHistory(history_size, _ROLLUPS, factory("disk"), max_keys)
+        self.network_history = TieredHistory(history_size, _ROLLUPS, factory("network"), max_keys)
+        self.io_history = TieredHistory(history_size, _ROLLUPS, factory("io"), max_keys)
+        self.gpu_history = TieredHistory(medium_history, _ROLLUPS, factory("gpu"), max_keys)
+        self.temperature_history = TieredHistory(medium_history, _ROLLUPS, factory("temperature"), max_keys)
+        self.fan_history = TieredHistory(medium_history, _ROLLUPS, factory("fans"), max_keys)
+
+        # Columnas (core_id, campo) en un único buffer con marca de tiempo compartida;
+        # sin el nivel de 60 s para no multiplicar la memoria en hosts con muchos núcleos
+        self.cpu_core_history = TieredHistory(history_size, _MEDIUM_ROLLUP, factory("cpu_cores"), max_keys)
+        # Igual para las series de latencia y cola por dispositivo de bloque
+        self.io_device_history = TieredHistory(history_size, _MEDIUM_ROLLUP, factory("io_devices"), max_keys)
+
+    def _open_history_store(self) -> None:
+        """Move the histories onto the memory-mapped rings (once, before the first tick)."""
+
+        if not HISTORY.persist or self._history_store is not None:
+            return
+        store = HistoryStore.open(DATA_DIR / "history")
+        if store is None:
+            return
+        with self._lock:
+            self._history_store = store
+            self._build_histories(store)
+            # La secuencia continúa la de los históricos persistidos
+            self._sequence = max(self._sequence, *(history.last_sequence() for history in self._histories()))
 
     def _check_system_permissions(self) -> dict[str, Any]:
         """Verifica el estado de permisos del sistema."""
@@ -229,40 +384,179 @@ class DataCollector:
         if self._thread and self._thread.is_alive():
             return
         self._stop.clear()
+        self._open_history_store()
         self._thread = threading.Thread(target=self._run, name="DataCollector", daemon=True)
         self._thread.start()
         self._schedule_permission_refresh()
 
     def stop(self, timeout: float | None = None) -> None:
         self._stop.set()
+        with self._published_changed:
+            self._published_changed.notify_all()
         thread = self._thread
         if thread and thread.is_alive():
             thread.join(timeout=timeout)
         self._thread = None
+        executor = self._executor
+        self._executor = None
+        self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        close_gpu_backend()
+        if self._history_store is not None:
+            with self._lock:
+                # El cubo abierto de 10 s/60 s se guarda y se reabre al volver a arrancar
+                for history in self._histories():
+                    history.flush()
+                self._history_store.flush()
+
+    def rescan_system(self) -> None:
+        """Rescan the static system information (DMI, OS, cores) on the next tick."""
+
+        rescan_system_info()
+        self._next_due["system"] = 0.0
+
+    def published(self) -> PublishedSnapshot:
+        """Return the pre-encoded snapshot of the latest tick without locking."""
+
+        return self._published
+
+    def is_running(self) -> bool:
+        return not self._stop.is_set()
+
+    def wait_for_publication(self, after_sequence: int, timeout: float) -> PublishedSnapshot:
+        """Block until a snapshot newer than ``after_sequence`` is published.
+
+        Returns the latest snapshot, which may still be ``after_sequence`` when
+        ``timeout`` expires or the collector stops.
+        """
+
+        with self._published_changed:
+            self._published_changed.wait_for(
+                lambda: self._published.sequence > after_sequence or self._stop.is_set(),
+                timeout=timeout,
+            )
+        return self._published
+
+    def add_listener(self, callback: Callable[[PublishedSnapshot], None]) -> None:
+        """Call ``callback`` from the collector thread after every publication.
+
+        Callbacks must return quickly; event loops should hand the snapshot
+        over with ``call_soon_threadsafe``.
+        """
+
+        with self._published_changed:
+            self._listeners = [*self._listeners, callback]
+
+    def remove_listener(self, callback: Callable[[PublishedSnapshot], None]) -> None:
+        with self._published_changed:
+            self._listeners = [item for item in self._listeners if item is not callback]
 
     def snapshot(self) -> dict[str, Any]:
         with self._lock:
             data = _snapshot_to_dict(self.current_data)
+            data["sequence"] = self._sequence
             data["permissions"] = self.permission_status
             data["diagnostics"] = {
                 **self._diagnostics,
                 "provider_failures": dict(self._provider_failures),
+                "provider_timeouts": dict(self._provider_timeouts),
+                # Puede cambiar en marcha (nvidia-smi mudo -> NVML)
+                "gpu_backend": gpu_backend(),
             }
             return data
 
-    def history(self) -> dict[str, Any]:
+    def _histories(self) -> list[TieredHistory]:
+        return [
+            self.cpu_history,
+            self.cpu_core_history,
+            self.memory_history,
+            self.disk_history,
+            self.network_history,
+            self.io_history,
+            self.io_device_history,
+            self.gpu_history,
+            self.temperature_history,
+            self.fan_history,
+        ]
+
+    def history(
+        self,
+        resolution: str | None = None,
+        range_seconds: float | None = None,
+        since: int | None = None,
+    ) -> dict[str, Any]:
+        """Return the histories at ``resolution`` (``raw`` or a rollup tier).
+
+        When ``range_seconds`` is given without a resolution, the finest tier
+        covering that range is chosen and older samples are left out. With
+        ``since`` only samples whose tick sequence is newer are returned; the
+        ``sequence`` field of the result is the value to send next time.
+        """
+
+        if resolution is None:
+            resolution = self.cpu_history.resolution_for(range_seconds) if range_seconds else "raw"
+        if resolution not in self.cpu_history.resolutions():
+            raise ValueError(f"Resolución desconocida: {resolution}")
+        cutoff = time.time() - range_seconds if range_seconds else None
+
         with self._lock:
-            return {
-                "cpu": list(self.cpu_history),
-                "cpu_cores": {core: list(history) for core, history in self.cpu_core_history.items()},
-                "memory": list(self.memory_history),
-                "disk": list(self.disk_history),
-                "network": list(self.network_history),
-                "io": list(self.io_history),
-                "gpu": list(self.gpu_history),
-                "temperature": list(self.temperature_history),
-                "fans": list(self.fan_history),
+            core_tier = self.cpu_core_history.tier(resolution)
+            device_tier = self.io_device_history.tier(resolution)
+            data = {
+                "resolution": resolution,
+                # Última secuencia ya escrita en los históricos (el tick en curso puede no estarlo)
+                "sequence": max(history.last_sequence() for history in self._histories()),
+                "cpu": self.cpu_history.tier(resolution).records(_CPU_FIELDS, since=since),
+                "cpu_cores": {
+                    core: core_tier.records(
+                        {name: (core, name) for name in _CPU_FIELDS}, skip_missing=True, since=since
+                    )
+                    for core in _unique_prefixes(core_tier.keys())
+                },
+                "memory": self.memory_history.tier(resolution).records(_MEMORY_FIELDS, since=since),
+                "disk": self.disk_history.tier(resolution).records(_DISK_FIELDS, since=since),
+                "network": self.network_history.tier(resolution).records(_NETWORK_FIELDS, since=since),
+                "io": self.io_history.tier(resolution).records(_DISK_FIELDS, since=since),
+                "io_devices": {
+                    device: device_tier.records(
+                        {name: (device, name) for name in _IO_DEVICE_FIELDS}, skip_missing=True, since=since
+                    )
+                    for device in _unique_prefixes(device_tier.keys())
+                },
+                "gpu": self._gpu_records(self.gpu_history.tier(resolution), since),
+                "temperature": _reading_records(self.temperature_history.tier(resolution), "current", since),
+                "fans": _reading_records(self.fan_history.tier(resolution), "speed", since),
             }
+        if cutoff is not None:
+            for key, series in data.items():
+                if isinstance(series, list):
+                    data[key] = [record for record in series if record["time"] >= cutoff]
+                elif isinstance(series, dict):
+                    data[key] = {
+                        item: [record for record in records if record["time"] >= cutoff]
+                        for item, records in series.items()
+                    }
+        return data
+
+    def _gpu_records(self, buffer: RingBuffer | RollupBuffer, since: int | None = None) -> list[dict[str, Any]]:
+        indices = _unique_prefixes(buffer.keys())
+        columns = {
+            (index, name): buffer.column((index, name), since)
+            for index in indices
+            for name in _GPU_FIELDS
+        }
+        records: list[dict[str, Any]] = []
+        for position, (timestamp, sequence) in enumerate(zip(buffer.timestamps(since), buffer.sequences(since))):
+            gpus = []
+            for index in indices:
+                values = {name: columns[(index, name)][position] for name in _GPU_FIELDS}
+                if all(value is None for value in values.values()):
+                    continue
+                gpu_name, vendor = self._gpu_labels.get(index, ("", ""))
+                gpus.append({"name": gpu_name, "vendor": vendor, **values})
+            records.append({"time": timestamp, "seq": sequence, "gpus": gpus})
+        return records
 
     def _run(self) -> None:
         while not self._stop.is_set():
@@ -277,127 +571,185 @@ class DataCollector:
             finally:
                 if (time.time() - self._last_permission_refresh) > self._permission_refresh_interval:
                     self._schedule_permission_refresh()
+            self._publish()
             elapsed = time.perf_counter() - start_time
             delay = max(0.1, self._interval - elapsed)
             self._stop.wait(delay)
 
+    def _due_providers(self, now: float) -> list[str]:
+        """Return the providers whose tier interval has elapsed at ``now``.
+
+        Half a collector tick of slack keeps a provider whose interval equals the
+        tick from slipping to every other tick because of scheduling jitter.
+        """
+
+        slack = self._interval / 2
+        return [key for key in self._providers if now + slack >= self._next_due.get(key, 0.0)]
+
+    def _publish(self) -> None:
+        """Encode the current snapshot once and swap it in for request handlers."""
+
+        try:
+            published = PublishedSnapshot.build(
+                self.snapshot(), sequence=self._sequence, instance=self._instance_tag
+            )
+        except (TypeError, ValueError) as exc:  # pragma: no cover - non-serialisable provider output
+            logger.exception("No se pudo serializar el snapshot del tick %s", self._sequence, exc_info=exc)
+            return
+        with self._published_changed:
+            self._published = published
+            self._published_changed.notify_all()
+            listeners = self._listeners
+        for listener in listeners:
+            try:
+                listener(published)
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug("Listener de publicación falló: %s", exc)
+
     def _collect_all(self) -> None:
         timestamp = time.time()
+        now = time.monotonic()
+        self._sequence += 1
+        sequence = self._sequence
+
+        fresh = self._run_providers(now)
 
-        cpu_snapshot = self._safe_call("cpu", collect_cpu_snapshot, CPUSnapshot)
-        memory_snapshot = self._safe_call("memory", collect_memory_snapshot, MemorySnapshot)
-        disk_snapshot = self._safe_call("disk", collect_disk_snapshot, DiskSnapshot)
-        network_snapshot = self._safe_call("network", collect_network_snapshot, NetworkSnapshot)
-        io_snapshot = self._safe_call("io", collect_io_snapshot, IOSnapshot)
-        gpu_snapshot = self._safe_call("gpu", collect_gpu_snapshot, list)
-        pcie_snapshot = self._safe_call("pcie", collect_pcie_snapshot, PCIESnapshot)
-        process_snapshot = self._safe_call("processes", collect_process_snapshot, ProcessSnapshot)
-        temperature_snapshot = self._safe_call("temperature", collect_temperature_sensors, TemperatureSensorsSnapshot)
-        fan_snapshot = self._safe_call("fans", collect_fan_sensors, FanSensorsSnapshot)
-        battery_snapshot = self._safe_call("battery", collect_battery_snapshot, BatterySnapshot)
-        power_snapshot = self._safe_call("power", collect_power_sources_snapshot, PowerSourcesSnapshot)
-        system_snapshot = self._safe_call("system", collect_system_info, SystemInfoSnapshot)
+        cpu_snapshot = fresh.get("cpu")
+        memory_snapshot = fresh.get("memory")
+        disk_snapshot = fresh.get("disk")
+        network_snapshot = fresh.get("network")
+        io_snapshot = fresh.get("io")
+        gpu_snapshot = fresh.get("gpu")
+        temperature_snapshot = fresh.get("temperature")
+        fan_snapshot = fresh.get("fans")
 
         with self._lock:
             if cpu_snapshot:
-                self.cpu_history.append({
-                    "time": timestamp,
+                self.cpu_history.append(timestamp, {
                     "usage": cpu_snapshot.usage_percent,
                     "frequency": cpu_snapshot.frequency_current_mhz or 0.0,
-                })
+                }, sequence)
+                core_values: dict[Hashable, float | None] = {}
                 for core in cpu_snapshot.per_core:
-                    self.cpu_core_history[core.core_id].append({
-                        "time": timestamp,
-                        "usage": core.usage_percent,
-                        "frequency": core.frequency_mhz or 0.0,
-                    })
+                    core_values[(core.core_id, "usage")] = core.usage_percent
+                    core_values[(core.core_id, "frequency")] = core.frequency_mhz or 0.0
+                self.cpu_core_history.append(timestamp, core_values, sequence)
 
             if memory_snapshot:
-                self.memory_history.append({
-                    "time": timestamp,
+                self.memory_history.append(timestamp, {
                     "usage": memory_snapshot.percent,
                     "used": memory_snapshot.used_bytes,
                     "available": memory_snapshot.available_bytes,
                     "swap_usage": memory_snapshot.swap_percent,
                     "swap_used": memory_snapshot.swap_used_bytes,
-                })
+                }, sequence)
 
             if disk_snapshot:
                 total_read = sum(device.read_bytes_per_sec or 0 for device in disk_snapshot.devices)
                 total_write = sum(device.write_bytes_per_sec or 0 for device in disk_snapshot.devices)
-                self.disk_history.append({
-                    "time": timestamp,
+                self.disk_history.append(timestamp, {
                     "read": total_read,
                     "write": total_write,
-                })
+                }, sequence)
 
             if network_snapshot:
                 total_sent = sum(interface.sent_bytes_per_sec for interface in network_snapshot.interfaces)
                 total_recv = sum(interface.recv_bytes_per_sec for interface in network_snapshot.interfaces)
-                self.network_history.append({
-                    "time": timestamp,
+                self.network_history.append(timestamp, {
                     "sent": total_sent,
                     "recv": total_recv,
-                })
+                }, sequence)
 
             if io_snapshot:
-                self.io_history.append({
-                    "time": timestamp,
+                self.io_history.append(timestamp, {
                     "read": io_snapshot.read_bytes_per_sec,
                     "write": io_snapshot.write_bytes_per_sec,
-                })
+                }, sequence)
+                self.io_device_history.append(timestamp, {
+                    (device, name): stats.get(key)
+                    for device, stats in io_snapshot.per_device.items()
+                    if not device.startswith(_IO_DEVICE_SKIP)
+                    for name, key in _IO_DEVICE_FIELDS.items()
+                }, sequence)
 
             if gpu_snapshot:
-                self.gpu_history.append({
-                    "time": timestamp,
-                    "gpus": [_snapshot_to_dict(gpu) for gpu in gpu_snapshot],
-                })
+                gpu_values: dict[Hashable, float | None] = {}
+                for index, gpu in enumerate(gpu_snapshot):
+                    self._gpu_labels[index] = (gpu.name, gpu.vendor)
+                    for name in _GPU_FIELDS:
+                        gpu_values[(index, name)] = getattr(gpu, name)
+                self.gpu_history.append(timestamp, gpu_values, sequence)
 
             if temperature_snapshot:
-                flat_readings = [
-                    {
-                        "source": reading.source,
-                        "label": reading.label,
-                        "current": reading.current_celsius,
-                    }
+                self.temperature_history.append(timestamp, _keyed_readings(
+                    (reading.source, reading.label, reading.current_celsius)
                     for group in temperature_snapshot.groups
                     for reading in group.readings
-                ]
-                self.temperature_history.append({
-                    "time": timestamp,
-                    "readings": flat_readings,
-                })
+                ), sequence)
 
             if fan_snapshot:
-                self.fan_history.append({
-                    "time": timestamp,
-                    "readings": [
-                        {
-                            "source": reading.source,
-                            "label": reading.label,
-                            "speed": reading.speed_rpm,
-                        }
-                        for reading in fan_snapshot.readings
-                    ],
-                })
+                self.fan_history.append(timestamp, _keyed_readings(
+                    (reading.source, reading.label, reading.speed_rpm)
+                    for reading in fan_snapshot.readings
+                ), sequence)
 
+            for key, result in fresh.items():
+                self._latest[key] = _snapshot_to_dict(result)
             self.current_data = {
                 "timestamp": timestamp,
-                "cpu": _snapshot_to_dict(cpu_snapshot),
-                "memory": _snapshot_to_dict(memory_snapshot),
-                "disk": _snapshot_to_dict(disk_snapshot),
-                "network": _snapshot_to_dict(network_snapshot),
-                "io": _snapshot_to_dict(io_snapshot),
-                "gpu": _snapshot_to_dict(gpu_snapshot),
-                "pcie": _snapshot_to_dict(pcie_snapshot),
-                "processes": _snapshot_to_dict(process_snapshot),
-                "temperature": _snapshot_to_dict(temperature_snapshot),
-                "fans": _snapshot_to_dict(fan_snapshot),
-                "battery": _snapshot_to_dict(battery_snapshot),
-                "power": _snapshot_to_dict(power_snapshot),
-                "system": _snapshot_to_dict(system_snapshot),
+                **{key: self._latest.get(key) for key in self._providers},
+                "stale": sorted(self._stale),
             }
 
+    def _run_providers(self, now: float) -> dict[str, Any]:
+        """Run the due providers on the worker pool and wait up to their deadlines.
+
+        A provider that misses its deadline keeps running in the background; its
+        result is harvested on a later tick and, until then, the previous value
+        is published and listed under ``stale``.
+        """
+
+        if self._executor is None:
+            # Hilos demonio: un proveedor atascado en una llamada al sistema no impide salir
+            # con Ctrl+C, y pasado el plazo más largo deja de contar para max_workers
+            deadlines = [self._settings.deadline_for(key) for key in self._providers]
+            self._executor = DaemonExecutor(
+                self._settings.max_workers,
+                thread_name_prefix="DataProvider",
+                stuck_after=max(deadlines, default=self._settings.provider_deadline / 1000.0),
+            )
+        self._executor.revive()
+
+        fresh: dict[str, Any] = {}
+        for key, future in list(self._inflight.items()):
+            if future.done():
+                del self._inflight[key]
+                fresh[key] = future.result()
+                self._stale.discard(key)
+
+        pending: list[tuple[float, str, Future[Any]]] = []
+        for key in self._due_providers(now):
+            spec = self._providers[key]
+            self._next_due[key] = now + self._tier_intervals[spec.tier]
+            if key in self._inflight:
+                continue
+            future = self._executor.submit(self._safe_call, key, spec.collect, spec.expected_type)
+            pending.append((now + self._settings.deadline_for(key), key, future))
+
+        for deadline, key, future in sorted(pending, key=lambda item: item[0]):
+            try:
+                fresh[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                logger.warning("Proveedor '%s' superó su plazo; se publica el valor anterior", key)
+                self._inflight[key] = future
+                self._stale.add(key)
+                with self._lock:
+                    self._provider_timeouts[key] += 1
+                    self._diagnostics["provider_timeouts"] = dict(self._provider_timeouts)
+            else:
+                self._stale.discard(key)
+        return fresh
+
     def _safe_call(self, key: str, fn: Callable[[], Any], expected_type: type[Any] | tuple[type[Any], ...]) -> Any:
         try:
             result = fn()
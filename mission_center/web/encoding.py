@@ -0,0 +1,126 @@
+"""``Accept-Encoding`` negotiation and compression of API responses."""
+
+from __future__ import annotations
+
+import gzip
+from typing import Any, Callable, Mapping, Optional
+
+from .payload import PublishedSnapshot
+from mission_center.core.config import SERVER, ServerConfig
+
+try:
+    import brotli  # type: ignore[import]
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore[assignment]
+
+try:
+    import zstandard  # type: ignore[import]
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    # mtime fijo: el mismo cuerpo produce siempre los mismos bytes
+    return gzip.compress(body, compresslevel=min(9, max(1, level)), mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=min(11, max(0, level)))
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=min(22, max(1, level))).compress(body)
+
+
+# Orden de preferencia del servidor cuando el cliente da el mismo peso
+CODECS: dict[str, Callable[[bytes, int], bytes]] = {}
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+if brotli is not None:
+    CODECS["br"] = _brotli
+CODECS["gzip"] = _gzip
+
+
+def negotiate(header: Optional[str], available: Mapping[str, object] = CODECS) -> Optional[str]:
+    """Return the best encoding in ``available`` for an ``Accept-Encoding`` value.
+
+    ``None`` means identity. Ties are broken by the order of ``available``.
+    """
+
+    if not header:
+        return None
+    weights: dict[str, float] = {}
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best: Optional[str] = None
+    best_weight = 0.0
+    for name in available:
+        weight = weights.get(name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def representation_etag(etag: str, encoding: Optional[str]) -> str:
+    """Strong ETags must differ between encodings of the same tick."""
+
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class ResponseCompressor:
+    """Applies the negotiated ``Content-Encoding`` at ``compression_level``.
+
+    Bodies shorter than ``compression_min_bytes`` are sent as-is. Published
+    snapshots are compressed through :meth:`PublishedSnapshot.variant`, so
+    every encoding costs one compression per tick whatever the client count.
+    """
+
+    def __init__(self, config: ServerConfig = SERVER) -> None:
+        self.level = config.compression_level
+        self.min_bytes = config.compression_min_bytes
+
+    def choose(self, accept_encoding: Optional[str], size: int) -> Optional[str]:
+        if size < self.min_bytes:
+            return None
+        return negotiate(accept_encoding)
+
+    def compress(self, body: bytes, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return body
+        return CODECS[encoding](body, self.level)
+
+    def encode(self, body: bytes, accept_encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        """Compress a one-off body for the client; returns ``(body, encoding)``."""
+
+        encoding = self.choose(accept_encoding, len(body))
+        return self.compress(body, encoding), encoding
+
+    def cached(
+        self,
+        published: PublishedSnapshot,
+        key: Any,
+        build: Callable[[], bytes],
+        accept_encoding: Optional[str],
+    ) -> tuple[bytes, str, Optional[str]]:
+        """Return ``(body, etag, encoding)`` for a per-tick body identified by ``key``.
+
+        ``build`` returns the uncompressed body (itself cached on ``published``).
+        """
+
+        plain = build()
+        encoding = self.choose(accept_encoding, len(plain))
+        if encoding is None:
+            return plain, published.etag, None
+        body = published.variant(("encoding", encoding, key), lambda: self.compress(plain, encoding))
+        return body, representation_etag(published.etag, encoding), encoding
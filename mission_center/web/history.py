@@ -0,0 +1,432 @@
+"""Columnar ring buffers backing the collector histories."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_right
+from typing import Any, Callable, Hashable, Iterable, Mapping
+
+try:
+    import numpy as np  # type: ignore[import]
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+def _allocate(capacity: int) -> Any:
+    """Return a float64 column of ``capacity`` slots filled with NaN."""
+
+    if np is not None:
+        return np.full(capacity, math.nan, dtype=np.float64)
+    return array("d", [math.nan]) * capacity
+
+
+def _empty(column: Any) -> bool:
+    """True when every slot of ``column`` is NaN."""
+
+    if np is not None:
+        return bool(np.isnan(np.asarray(column)).all())
+    return all(value != value for value in column)
+
+
+def _nan_to_none(values: Iterable[float]) -> list[float | None]:
+    return [None if value != value else value for value in values]
+
+
+class RingBuffer:
+    """Fixed-size columnar store with shared timestamp and sequence columns.
+
+    Every metric lives in its own typed float64 column (NumPy when installed,
+    stdlib :mod:`array` otherwise). Columns are keyed by any hashable, so a
+    family such as per-core usage is stored as ``(core_id, "usage")`` keys in a
+    single buffer. Columns created after the first sample are back-filled with
+    NaN, which reads as ``None``. Each sample also records the collector tick
+    sequence, which readers use to ask only for samples newer than ``since``.
+
+    Keys come and go (hot-plugged disks, sensors, GPUs), so columns are not
+    permanent: a key gets a column on its first non-``None`` value, and when
+    new keys arrive the columns without a single value left in the ring
+    (absent for a whole window) are dropped first. ``max_columns`` caps what
+    is left; keys beyond it are not stored until a window later.
+    """
+
+    def __init__(self, capacity: int, max_columns: int | None = None) -> None:
+        self.capacity = max(1, int(capacity))
+        self.max_columns = max_columns
+        self._timestamps = _allocate(self.capacity)
+        self._sequences = _allocate(self.capacity)
+        self._columns: dict[Hashable, Any] = {}
+        self._head = 0  # next slot to write
+        self._size = 0
+        # Claves rechazadas por max_columns; se reintentan tras una ventana completa
+        self._refused: set[Hashable] = set()
+        self._refused_countdown = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def keys(self) -> list[Hashable]:
+        return list(self._columns)
+
+    def append(self, timestamp: float, values: Mapping[Hashable, float | None], sequence: int = 0) -> None:
+        slot = self._head
+        self._timestamps[slot] = timestamp
+        self._sequences[slot] = sequence
+        if self._refused:
+            self._refused_countdown -= 1
+            if self._refused_countdown <= 0:
+                self._refused.clear()
+        missing = [
+            key
+            for key, value in values.items()
+            if value is not None and key not in self._columns and key not in self._refused
+        ]
+        if missing:
+            self._admit(missing, values)
+        for key, column in self._columns.items():
+            value = values.get(key)
+            column[slot] = math.nan if value is None else value
+        self._head = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self._commit()
+
+    def _admit(self, keys: list[Hashable], values: Mapping[Hashable, float | None]) -> None:
+        stale = [key for key, column in self._columns.items() if values.get(key) is None and _empty(column)]
+        if stale:
+            self._drop_columns(stale)
+        if self.max_columns is not None:
+            room = max(0, self.max_columns - len(self._columns))
+            if len(keys) > room:
+                self._refused.update(keys[room:])
+                self._refused_countdown = self.capacity
+                keys = keys[:room]
+        if keys:
+            self._new_columns(keys)
+
+    def _new_columns(self, keys: list[Hashable]) -> None:
+        """Register empty columns for ``keys``, all at once; storage hook."""
+
+        for key in keys:
+            self._columns[key] = _allocate(self.capacity)
+
+    def _drop_columns(self, keys: list[Hashable]) -> None:
+        """Forget the columns of ``keys``; storage hook."""
+
+        for key in keys:
+            del self._columns[key]
+
+    def _commit(self) -> None:
+        """Called after every append; storage hook."""
+
+    def _skip(self, since: int | None) -> int:
+        """Number of oldest samples whose sequence is not newer than ``since``."""
+
+        if since is None:
+            return 0
+        return bisect_right(self._ordered(self._sequences), since)
+
+    def _ordered(self, column: Any, skip: int = 0) -> list[float]:
+        count = self._size - skip
+        if count <= 0:
+            return []
+        start = (self._head - count) % self.capacity
+        if start + count <= self.capacity:
+            return column[start:start + count].tolist()
+        return column[start:].tolist() + column[:self._head].tolist()
+
+    def last_sequence(self) -> int:
+        if not self._size:
+            return 0
+        sequence = self._sequences[(self._head - 1) % self.capacity]
+        return int(sequence) if sequence == sequence else 0
+
+    def newest(self) -> tuple[float, int, dict[Hashable, float | None]] | None:
+        """Return ``(timestamp, sequence, values)`` of the newest sample."""
+
+        if not self._size:
+            return None
+        slot = (self._head - 1) % self.capacity
+        values = {key: column[slot] for key, column in self._columns.items()}
+        return (
+            self._timestamps[slot],
+            int(self._sequences[slot]),
+            {key: None if value != value else value for key, value in values.items()},
+        )
+
+    def discard_newest(self) -> None:
+        if self._size:
+            self._head = (self._head - 1) % self.capacity
+            self._size -= 1
+            self._commit()
+
+    def sequences(self, since: int | None = None) -> list[int]:
+        return [int(value) for value in self._ordered(self._sequences, self._skip(since))]
+
+    def timestamps(self, since: int | None = None) -> list[float]:
+        return self._ordered(self._timestamps, self._skip(since))
+
+    def column(self, key: Hashable, since: int | None = None) -> list[float | None]:
+        skip = self._skip(since)
+        column = self._columns.get(key)
+        if column is None:
+            return [None] * max(0, self._size - skip)
+        return _nan_to_none(self._ordered(column, skip))
+
+    def records(
+        self,
+        fields: Mapping[str, Hashable],
+        *,
+        skip_missing: bool = False,
+        since: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return one ``{"time": ..., "seq": ..., name: value}`` dict per sample.
+
+        ``fields`` maps output names to column keys. With ``skip_missing`` the
+        samples where every requested column is empty are left out, which keeps
+        series that appeared late (e.g. a hot-plugged core) as short as before.
+        ``since`` limits the result to samples with a newer sequence.
+        """
+
+        columns = {name: self.column(key, since) for name, key in fields.items()}
+        return _build_records(self.timestamps(since), self.sequences(since), columns, skip_missing)
+
+
+def _build_records(
+    timestamps: list[float],
+    sequences: list[int],
+    columns: Mapping[str, list[float | None]],
+    skip_missing: bool,
+) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    for index, (timestamp, sequence) in enumerate(zip(timestamps, sequences)):
+        row = {name: values[index] for name, values in columns.items()}
+        if skip_missing and all(value is None for value in row.values()):
+            continue
+        records.append({"time": timestamp, "seq": sequence, **row})
+    return records
+
+
+_ROLLUP_STATS = ("min", "max", "avg", "last")
+
+
+class RollupBuffer:
+    """Fixed-width time buckets aggregated incrementally as samples arrive.
+
+    Each bucket stores ``min``, ``max``, ``avg`` and ``last`` per column in a
+    :class:`RingBuffer` keyed ``(stat, key)``. The bucket being filled is kept
+    as running accumulators and is included in reads, so the newest bucket is
+    visible before it closes. A bucket carries the sequence of the last sample
+    folded into it, so an open bucket is returned again by ``since`` reads
+    whenever it changes. :meth:`flush` stores the open bucket together with
+    its per-key sample counts; a sample falling in the same bucket later
+    (after a restart over a persistent buffer) reopens it and keeps folding.
+    """
+
+    def __init__(self, bucket_seconds: int, capacity: int, buffer: RingBuffer | None = None) -> None:
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.capacity = max(1, int(capacity))
+        self._buckets = buffer if buffer is not None else RingBuffer(self.capacity)
+        self._bucket_start: float | None = None
+        self._bucket_sequence = 0
+        # key -> [count, total, min, max, last]
+        self._pending: dict[Hashable, list[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets) + (1 if self._bucket_start is not None else 0)
+
+    @property
+    def span(self) -> int:
+        """Seconds of history covered when the buffer is full."""
+
+        return self.bucket_seconds * self.capacity
+
+    def add(self, timestamp: float, values: Mapping[Hashable, float | None], sequence: int = 0) -> None:
+        start = timestamp - timestamp % self.bucket_seconds
+        if self._bucket_start is None:
+            self._reopen(start)
+        if self._bucket_start is not None and start != self._bucket_start:
+            self._buckets.append(self._bucket_start, self._pending_values(), self._bucket_sequence)
+            self._pending = {}
+        self._bucket_start = start
+        self._bucket_sequence = sequence
+        for key, value in values.items():
+            if value is None or value != value:
+                continue
+            accumulator = self._pending.get(key)
+            if accumulator is None:
+                self._pending[key] = [1, value, value, value, value]
+                continue
+            accumulator[0] += 1
+            accumulator[1] += value
+            accumulator[2] = min(accumulator[2], value)
+            accumulator[3] = max(accumulator[3], value)
+            accumulator[4] = value
+
+    def flush(self) -> None:
+        """Store the open bucket so that it survives a restart."""
+
+        if self._bucket_start is None:
+            return
+        values = self._pending_values()
+        values.update({("count", key): accumulator[0] for key, accumulator in self._pending.items()})
+        self._buckets.append(self._bucket_start, values, self._bucket_sequence)
+        self._bucket_start = None
+        self._pending = {}
+
+    def _reopen(self, start: float) -> None:
+        # Solo los cubos guardados por flush() llevan recuentos con los que seguir la media
+        newest = self._buckets.newest()
+        if newest is None or newest[0] != start:
+            return
+        _, sequence, values = newest
+        pending: dict[Hashable, list[float]] = {}
+        for (stat, key), count in values.items():
+            if stat != "count" or not count:
+                continue
+            average, low, high, last = (values.get((name, key)) for name in ("avg", "min", "max", "last"))
+            if None in (average, low, high, last):
+                continue
+            pending[key] = [count, average * count, low, high, last]
+        if not pending:
+            return
+        self._buckets.discard_newest()
+        self._bucket_start = start
+        self._bucket_sequence = sequence
+        self._pending = pending
+
+    def _pending_stat(self, key: Hashable, stat: str) -> float | None:
+        accumulator = self._pending.get(key)
+        if accumulator is None:
+            return None
+        count, total, low, high, last = accumulator
+        return {"min": low, "max": high, "avg": total / count, "last": last}[stat]
+
+    def _pending_values(self) -> dict[Hashable, float | None]:
+        return {
+            (stat, key): self._pending_stat(key, stat)
+            for key in self._pending
+            for stat in _ROLLUP_STATS
+        }
+
+    def _pending_visible(self, since: int | None) -> bool:
+        return self._bucket_start is not None and (since is None or self._bucket_sequence > since)
+
+    def keys(self) -> list[Hashable]:
+        stored = [key[1] for key in self._buckets.keys() if key[0] == "avg"]
+        return list(dict.fromkeys([*stored, *self._pending]))
+
+    def last_sequence(self) -> int:
+        if self._bucket_start is not None:
+            return self._bucket_sequence
+        return self._buckets.last_sequence()
+
+    def sequences(self, since: int | None = None) -> list[int]:
+        sequences = self._buckets.sequences(since)
+        if self._pending_visible(since):
+            sequences.append(self._bucket_sequence)
+        return sequences
+
+    def timestamps(self, since: int | None = None) -> list[float]:
+        timestamps = self._buckets.timestamps(since)
+        if self._pending_visible(since):
+            timestamps.append(self._bucket_start)
+        return timestamps
+
+    def column(self, key: Hashable, since: int | None = None, stat: str = "avg") -> list[float | None]:
+        values = self._buckets.column((stat, key), since)
+        if self._pending_visible(since):
+            values.append(self._pending_stat(key, stat))
+        return values
+
+    def records(
+        self,
+        fields: Mapping[str, Hashable],
+        *,
+        skip_missing: bool = False,
+        since: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return one dict per bucket; ``name`` holds the average and
+        ``name_min``/``name_max``/``name_last`` the other aggregates."""
+
+        columns = {
+            (f"{name}_{stat}" if stat != "avg" else name): self.column(key, since, stat)
+            for name, key in fields.items()
+            for stat in _ROLLUP_STATS
+        }
+        return _build_records(self.timestamps(since), self.sequences(since), columns, skip_missing)
+
+
+BufferFactory = Callable[[str, int], RingBuffer]
+"""Build the ring buffer of one tier from ``(tier_name, capacity)``."""
+
+
+def _memory_buffer(tier: str, capacity: int) -> RingBuffer:
+    return RingBuffer(capacity)
+
+
+class TieredHistory:
+    """Raw samples plus coarser rollup tiers fed from the same appends.
+
+    ``raw_span`` is the number of seconds the raw tier covers (its capacity at
+    the nominal one-second collector tick). ``factory`` decides where each
+    tier's buffer lives (in memory by default). ``max_keys`` bounds the
+    series of every tier (see :class:`RingBuffer`).
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        rollups: Mapping[str, tuple[int, int]] | None = None,
+        factory: BufferFactory | None = None,
+        max_keys: int | None = None,
+    ) -> None:
+        factory = factory or _memory_buffer
+        self.raw = factory("raw", capacity)
+        self.raw.max_columns = max_keys
+        self.raw_span = self.raw.capacity
+        self.rollups: dict[str, RollupBuffer] = {}
+        for name, (bucket_seconds, bucket_count) in (rollups or {}).items():
+            buffer = factory(name, bucket_count)
+            # Cada clave ocupa una columna por estadístico y otra para el recuento
+            buffer.max_columns = None if max_keys is None else max_keys * (len(_ROLLUP_STATS) + 1)
+            self.rollups[name] = RollupBuffer(bucket_seconds, bucket_count, buffer)
+
+    def append(self, timestamp: float, values: Mapping[Hashable, float | None], sequence: int = 0) -> None:
+        self.raw.append(timestamp, values, sequence)
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, values, sequence)
+
+    def last_sequence(self) -> int:
+        return self.raw.last_sequence()
+
+    def flush(self) -> None:
+        """Store the open rollup buckets (see :meth:`RollupBuffer.flush`)."""
+
+        for rollup in self.rollups.values():
+            rollup.flush()
+
+    def resolutions(self) -> list[str]:
+        return ["raw", *self.rollups]
+
+    def tier(self, resolution: str | None) -> RingBuffer | RollupBuffer:
+        """Return the requested tier, or the coarsest available one when this
+        series does not keep ``resolution``."""
+
+        if not resolution or resolution == "raw":
+            return self.raw
+        rollup = self.rollups.get(resolution)
+        if rollup is not None:
+            return rollup
+        if self.rollups:
+            return max(self.rollups.values(), key=lambda item: item.span)
+        return self.raw
+
+    def resolution_for(self, range_seconds: float) -> str:
+        """Return the finest tier whose span covers ``range_seconds``."""
+
+        if range_seconds <= self.raw_span:
+            return "raw"
+        for name, rollup in sorted(self.rollups.items(), key=lambda item: item[1].span):
+            if range_seconds <= rollup.span:
+                return name
+        return max(self.rollups, key=lambda name: self.rollups[name].span, default="raw")
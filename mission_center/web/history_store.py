@@ -0,0 +1,237 @@
+"""Persistent history backend made of memory-mapped ring files.
+
+Each metric family and tier lives in its own file under ``DATA_DIR/history``::
+
+    header (28 bytes) | column keys as JSON | padding to a page
+    timestamps: capacity x float64
+    tick sequences: capacity x float64
+    one column per key (``null`` for a free slot): capacity x float64
+
+The buffers are :class:`~mission_center.web.history.RingBuffer` instances whose
+columns are ``memoryview`` slices of the mapping, so an append writes one slot
+per column plus the head/size fields of the header, and reads slice the
+mapping directly. A column left without values for a whole window (an
+unplugged disk, a sensor that went away) is dropped when new keys arrive and
+its slot is reused in place, rewriting only the key list. The file is only
+rewritten when no slot is free, and then grows with spare slots; together
+with ``HISTORY.max_series`` this bounds each file however many devices come
+and go across restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Hashable
+
+from .history import BufferFactory, RingBuffer
+
+try:
+    import fcntl
+except ModuleNotFoundError:  # pragma: no cover - platform specific
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"MCRB"
+_VERSION = 2
+# magic, version, reserved, capacity, head, size, data_offset, keys_length
+_HEADER = struct.Struct("<4sHHIIIII")
+_HEAD_OFFSET = 12  # head y size, reescritos en cada append
+_SLOT = struct.Struct("<d")
+_NAN_SLOT = _SLOT.pack(math.nan)
+_PAGE = mmap.PAGESIZE
+_KEYS_LENGTH_OFFSET = 24
+
+
+def _encode_key(key: Hashable) -> Any:
+    if isinstance(key, tuple):
+        return [_encode_key(item) for item in key]
+    return key
+
+
+def _decode_key(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(_decode_key(item) for item in value)
+    return value
+
+
+class MappedRingBuffer(RingBuffer):
+    """:class:`RingBuffer` stored in a memory-mapped file."""
+
+    def __init__(self, path: Path, capacity: int) -> None:
+        super().__init__(capacity)
+        self.path = path
+        self._mmap: mmap.mmap | None = None
+        self._slots: list[Hashable | None] = []  # clave de cada columna del fichero; None = libre
+        self._data_offset = 0
+        try:
+            self._open()
+        except (OSError, ValueError, struct.error) as exc:
+            logger.warning("Histórico %s ilegible, se recrea: %s", path, exc)
+            self._rewrite([])
+
+    def _open(self) -> None:
+        if not self.path.exists():
+            self._rewrite([])
+            return
+        with open(self.path, "r+b") as handle:
+            mapping = mmap.mmap(handle.fileno(), 0)
+        magic, version, _, capacity, head, size, data_offset, keys_length = _HEADER.unpack_from(mapping, 0)
+        keys = [_decode_key(item) for item in json.loads(mapping[_HEADER.size:_HEADER.size + keys_length])]
+        expected = data_offset + (len(keys) + 2) * capacity * _SLOT.size
+        if magic != _MAGIC or version != _VERSION or capacity != self.capacity or len(mapping) != expected:
+            raise ValueError("cabecera incompatible")
+        self._map(mapping, keys, data_offset)
+        self._head = head % self.capacity
+        self._size = min(size, self.capacity)
+
+    def _map(self, mapping: mmap.mmap, keys: list[Hashable | None], data_offset: int) -> None:
+        view = memoryview(mapping)
+        width = self.capacity * _SLOT.size
+        self._mmap = mapping
+        self._slots = list(keys)
+        self._data_offset = data_offset
+        self._timestamps = view[data_offset:data_offset + width].cast("d")
+        self._sequences = view[data_offset + width:data_offset + 2 * width].cast("d")
+        self._columns = {}
+        for index, key in enumerate(keys, start=2):
+            if key is None:
+                continue
+            start = data_offset + index * width
+            self._columns[key] = view[start:start + width].cast("d")
+
+    def _rewrite(self, keys: list[Hashable | None]) -> None:
+        """Write a new file with ``keys`` as columns, keeping the current data."""
+
+        blob = json.dumps([_encode_key(key) for key in keys]).encode("utf-8")
+        # Holgura para que la lista de claves crezca sin mover los datos
+        data_offset = -(-(_HEADER.size + 2 * len(blob)) // _PAGE) * _PAGE
+        empty = _NAN_SLOT * self.capacity
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(_HEADER.pack(
+                _MAGIC, _VERSION, 0, self.capacity, self._head, self._size, data_offset, len(blob)
+            ))
+            handle.write(blob)
+            handle.write(b"\0" * (data_offset - _HEADER.size - len(blob)))
+            handle.write(self._timestamps.tobytes() if self._mmap is not None else empty)
+            handle.write(self._sequences.tobytes() if self._mmap is not None else empty)
+            for key in keys:
+                column = self._columns.get(key) if key is not None else None
+                handle.write(column.tobytes() if column is not None else empty)
+        os.replace(temporary, self.path)
+        # La proyección anterior se libera junto con sus memoryview
+        with open(self.path, "r+b") as handle:
+            mapping = mmap.mmap(handle.fileno(), 0)
+        self._map(mapping, keys, data_offset)
+
+    def _write_keys(self) -> bool:
+        """Store the slot keys in the header gap; ``False`` if they no longer fit."""
+
+        blob = json.dumps([_encode_key(key) for key in self._slots]).encode("utf-8")
+        if self._mmap is None or _HEADER.size + len(blob) > self._data_offset:
+            return False
+        self._mmap[_HEADER.size:self._data_offset] = blob + b"\0" * (self._data_offset - _HEADER.size - len(blob))
+        struct.pack_into("<I", self._mmap, _KEYS_LENGTH_OFFSET, len(blob))
+        return True
+
+    def _new_columns(self, keys: list[Hashable]) -> None:
+        free = [index for index, key in enumerate(self._slots) if key is None]
+        if len(free) >= len(keys):
+            # Huecos de columnas retiradas: ya están a NaN
+            width = self.capacity * _SLOT.size
+            view = memoryview(self._mmap)
+            for index, key in zip(free, keys):
+                self._slots[index] = key
+                start = self._data_offset + (index + 2) * width
+                self._columns[key] = view[start:start + width].cast("d")
+            if self._write_keys():
+                return
+            slots = self._slots
+        else:
+            # Todas las columnas nuevas de un append en una sola reescritura, con huecos de reserva
+            live = [key for key in self._slots if key is not None]
+            spare = max(0, len(live) // 4 - len(free))
+            slots = [*self._slots, *keys[len(free):], *[None] * spare]
+            for index, key in zip(free, keys):
+                slots[index] = key
+        try:
+            self._rewrite(slots)
+        except OSError as exc:
+            logger.warning("No se pudo ampliar %s; %d columnas quedan en memoria: %s", self.path, len(keys), exc)
+            super()._new_columns([key for key in keys if key not in self._columns])
+
+    def _drop_columns(self, keys: list[Hashable]) -> None:
+        width = self.capacity * _SLOT.size
+        for key in keys:
+            del self._columns[key]
+            if key in self._slots:
+                index = self._slots.index(key)
+                self._slots[index] = None
+                start = self._data_offset + (index + 2) * width
+                self._mmap[start:start + width] = _NAN_SLOT * self.capacity
+        if not self._write_keys():  # pragma: no cover - la lista solo encoge
+            logger.warning("No se pudo actualizar la lista de columnas de %s", self.path)
+
+    def _commit(self) -> None:
+        if self._mmap is not None:
+            struct.pack_into("<II", self._mmap, _HEAD_OFFSET, self._head, self._size)
+
+    def flush(self) -> None:
+        if self._mmap is not None:
+            self._mmap.flush()
+
+
+class HistoryStore:
+    """Directory of ring files shared by the collector histories.
+
+    A lock file keeps a second Mission Center instance from writing into the
+    same rings; that instance falls back to in-memory histories.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._buffers: list[MappedRingBuffer] = []
+        directory.mkdir(parents=True, exist_ok=True)
+        self._lock_handle = open(directory / ".lock", "a+b")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_handle.close()
+                raise
+
+    @classmethod
+    def open(cls, directory: Path) -> HistoryStore | None:
+        """Return a store for ``directory`` or ``None`` when it cannot be used."""
+
+        try:
+            return cls(directory)
+        except OSError as exc:
+            logger.warning("Históricos persistentes deshabilitados en %s: %s", directory, exc)
+            return None
+
+    def factory(self, family: str) -> BufferFactory:
+        """Return a buffer factory writing ``<family>.<tier>.ring`` files."""
+
+        def build(tier: str, capacity: int) -> RingBuffer:
+            path = self.directory / f"{family}.{tier}.ring"
+            try:
+                buffer = MappedRingBuffer(path, capacity)
+            except OSError as exc:
+                logger.warning("Histórico %s en memoria: %s", path, exc)
+                return RingBuffer(capacity)
+            self._buffers.append(buffer)
+            return buffer
+
+        return build
+
+    def flush(self) -> None:
+        for buffer in self._buffers:
+            buffer.flush()
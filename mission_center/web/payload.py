@@ -0,0 +1,222 @@
+"""Immutable API payloads encoded once per collector tick."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from .process_index import ProcessIndex, ProcessQuery
+
+# Secciones incluidas siempre en una proyección
+_ENVELOPE_KEYS = ("timestamp", "sequence", "stale")
+_MAX_VARIANTS = 64
+
+
+def encode_json(payload: Any) -> bytes:
+    """Encode ``payload`` as compact UTF-8 JSON."""
+
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+# Lista principal de cada sección a la que se aplica ``<sección>.top=N``
+_LIST_KEYS = {
+    "processes": "processes",
+    "disk": "devices",
+    "network": "interfaces",
+    "pcie": "devices",
+    "temperature": "groups",
+    "fans": "readings",
+    "power": "sources",
+}
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class FieldSelector:
+    """One ``fields`` item: a section, an optional nested path and a list limit."""
+
+    section: str
+    path: tuple[str, ...] = ()
+    top: int | None = None
+
+
+Fields = tuple[FieldSelector, ...]
+"""Canonical, hashable field selection; also the per-tick cache key."""
+
+
+def _parse_selector(item: str) -> FieldSelector:
+    name, separator, limit = item.partition("=")
+    section, *path = name.split(".")
+    if not section or any(not part for part in path):
+        raise ValueError(f"Selector inválido: {item}")
+    if not separator:
+        return FieldSelector(section, tuple(path))
+    if path != ["top"]:
+        raise ValueError(f"Selector inválido: {item}")
+    if section not in _LIST_KEYS:
+        raise ValueError(f"La sección {section} no admite top")
+    try:
+        top = int(limit)
+    except ValueError:
+        raise ValueError(f"Límite inválido: {item}") from None
+    if top < 0:
+        raise ValueError(f"Límite inválido: {item}")
+    return FieldSelector(section, top=top)
+
+
+def parse_fields(value: str | None) -> Fields | None:
+    """Parse ``cpu,memory.percent,processes.top=25``; ``None`` means everything.
+
+    The result is sorted and de-duplicated so equivalent queries share one
+    cached body. Raises ``ValueError`` on malformed selectors.
+    """
+
+    if not value:
+        return None
+    selectors = {_parse_selector(item.strip()) for item in value.split(",") if item.strip()}
+    ordered = sorted(selectors, key=lambda item: (item.section, item.path, -1 if item.top is None else item.top))
+    return tuple(ordered) or None
+
+
+def _pick(value: Any, path: tuple[str, ...]) -> Any:
+    """Keep only ``path`` of ``value``, mapping over lists of records."""
+
+    if not path:
+        return value
+    if isinstance(value, list):
+        # Como en los dicts: los registros sin la ruta se omiten y sin ninguno falta
+        picked = [item for item in (_pick(item, path) for item in value) if item is not _MISSING]
+        return picked if picked or not value else _MISSING
+    if isinstance(value, dict) and path[0] in value:
+        picked = _pick(value[path[0]], path[1:])
+        return _MISSING if picked is _MISSING else {path[0]: picked}
+    return _MISSING
+
+
+def _merge(left: Any, right: Any) -> Any:
+    if isinstance(left, dict) and isinstance(right, dict):
+        merged = dict(left)
+        for key, value in right.items():
+            merged[key] = _merge(merged[key], value) if key in merged else value
+        return merged
+    if isinstance(left, list) and isinstance(right, list) and len(left) == len(right):
+        return [_merge(a, b) for a, b in zip(left, right)]
+    return right
+
+
+def _project_section(name: str, value: Any, selectors: list[FieldSelector]) -> Any:
+    list_key = _LIST_KEYS.get(name)
+    paths = [selector.path for selector in selectors if selector.path]
+    if paths and not any(not selector.path and selector.top is None for selector in selectors):
+        # Junto a otras rutas, ``top`` también selecciona la lista que recorta
+        paths.extend((list_key,) for selector in selectors if not selector.path and list_key)
+        projected: Any = _MISSING
+        for path in paths:
+            picked = _pick(value, path)
+            if picked is not _MISSING:
+                projected = picked if projected is _MISSING else _merge(projected, picked)
+        value = {} if projected is _MISSING else projected
+    limits = [selector.top for selector in selectors if selector.top is not None]
+    if limits and isinstance(value, dict) and isinstance(value.get(list_key), list):
+        value = {**value, list_key: value[list_key][:min(limits)]}
+    return value
+
+
+def project(data: dict[str, Any], fields: Fields | Iterable[str] | None) -> dict[str, Any]:
+    """Return the envelope keys plus the selected parts of a snapshot dict.
+
+    ``fields`` is a :data:`Fields` selection or a plain list of section names.
+    """
+
+    if fields is None:
+        return data
+    grouped: dict[str, list[FieldSelector]] = {}
+    for selector in fields:
+        if isinstance(selector, str):
+            selector = FieldSelector(selector)
+        grouped.setdefault(selector.section, []).append(selector)
+    projected = {key: data[key] for key in _ENVELOPE_KEYS if key in data}
+    for section, selectors in grouped.items():
+        if section in data:
+            projected[section] = _project_section(section, data[section], selectors)
+    return projected
+
+
+@dataclass(frozen=True, slots=True)
+class PublishedSnapshot:
+    """Snapshot body shared by every request handler until the next tick.
+
+    The collector builds a new instance per tick and swaps the reference, so
+    readers never need the collector lock: they only write ``body``. Derived
+    encodings (projections, stream frames) are built on first use and cached
+    on the instance, so they are computed at most once per tick.
+    """
+
+    sequence: int
+    timestamp: float
+    etag: str
+    body: bytes
+    data: dict[str, Any] = field(repr=False, compare=False)
+    _variants: dict[Any, bytes] = field(default_factory=dict, repr=False, compare=False)
+    _derived: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, payload: dict[str, Any], *, sequence: int, instance: str) -> PublishedSnapshot:
+        return cls(
+            sequence=sequence,
+            timestamp=float(payload.get("timestamp") or 0.0),
+            etag=f'"{instance}-{sequence}"',
+            body=encode_json(payload),
+            data=payload,
+        )
+
+    def variant(self, key: Any, build: Callable[[], bytes]) -> bytes:
+        """Return the cached encoding for ``key``, building it on first use.
+
+        Concurrent builders may both compute the value; the last write wins,
+        which is harmless because both results are identical.
+        """
+
+        cached = self._variants.get(key)
+        if cached is None:
+            cached = build()
+            if len(self._variants) < _MAX_VARIANTS:
+                self._variants[key] = cached
+        return cached
+
+    def derived(self, key: str, build: Callable[[], Any]) -> Any:
+        """Return a per-tick helper structure (e.g. an index), built on first use."""
+
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build()
+        return value
+
+    def processes(self, query: ProcessQuery) -> bytes:
+        """Return one sorted, filtered page of the process table as JSON."""
+
+        def build() -> bytes:
+            index = self.derived(
+                "processes",
+                lambda: ProcessIndex((self.data.get("processes") or {}).get("processes") or []),
+            )
+            envelope = {key: self.data[key] for key in _ENVELOPE_KEYS if key in self.data}
+            return encode_json({**envelope, **index.query(query)})
+
+        return self.variant(("processes", query), build)
+
+    def projected(self, fields: Fields | None = None) -> bytes:
+        """Return the JSON body restricted to ``fields``, encoded once per tick."""
+
+        if fields is None:
+            return self.body
+        return self.variant(("fields", fields), lambda: encode_json(project(self.data, fields)))
+
+    def sse_frame(self, fields: Fields | None = None) -> bytes:
+        """Return a Server-Sent Events frame carrying ``fields`` of this tick."""
+
+        def build() -> bytes:
+            return b"id: %d\nevent: snapshot\ndata: %s\n\n" % (self.sequence, self.projected(fields))
+
+        return self.variant(("sse", fields), build)
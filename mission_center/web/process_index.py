@@ -0,0 +1,125 @@
+"""Sorted, filtered and paginated views of the published process table."""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+
+def _io_total(process: dict[str, Any]) -> int:
+    return (process.get("io_read_bytes") or 0) + (process.get("io_write_bytes") or 0)
+
+
+# Claves de orden: menor primero, por eso las métricas van negadas
+_SORT_KEYS: dict[str, Callable[[dict[str, Any]], float]] = {
+    "cpu": lambda process: -(process.get("cpu_percent") or 0.0),
+    "memory": lambda process: -(process.get("memory_bytes") or 0),
+    "io": lambda process: -_io_total(process),
+    "pid": lambda process: process.get("pid") or 0,
+}
+_FILTER_KINDS = ("user", "name")
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessQuery:
+    """Validated ``/api/processes`` parameters; hashable so pages cache per tick."""
+
+    sort: str = "cpu"
+    limit: int = DEFAULT_LIMIT
+    offset: int = 0
+    filters: tuple[tuple[str, str], ...] = ()
+
+
+def _parse_count(name: str, value: Optional[str], default: int, maximum: Optional[int] = None) -> int:
+    if value is None or value == "":
+        return default
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError(f"{name} inválido: {value}") from None
+    if count < 0:
+        raise ValueError(f"{name} inválido: {value}")
+    return min(count, maximum) if maximum is not None else count
+
+
+def parse_process_query(
+    sort: Optional[str] = None,
+    limit: Optional[str] = None,
+    offset: Optional[str] = None,
+    filter_value: Optional[str] = None,
+) -> ProcessQuery:
+    """Build a :class:`ProcessQuery` from raw query values; raises ``ValueError``."""
+
+    sort = (sort or "cpu").lower()
+    if sort not in _SORT_KEYS:
+        raise ValueError(f"Orden desconocido: {sort} (cpu, memory, io, pid)")
+    filters: set[tuple[str, str]] = set()
+    for item in (filter_value or "").split(","):
+        if not item.strip():
+            continue
+        kind, separator, needle = item.strip().partition(":")
+        if not separator or kind not in _FILTER_KINDS or not needle:
+            raise ValueError(f"Filtro inválido: {item} (user:<usuario>, name:<texto>)")
+        filters.add((kind, needle if kind == "user" else needle.lower()))
+    return ProcessQuery(
+        sort=sort,
+        limit=_parse_count("limit", limit, DEFAULT_LIMIT, MAX_LIMIT),
+        offset=_parse_count("offset", offset, 0),
+        filters=tuple(sorted(filters)),
+    )
+
+
+class ProcessIndex:
+    """Lookup structures over one snapshot's process list.
+
+    Built once per published tick. Per-user positions and lower-cased names
+    narrow the candidates, then :func:`heapq.nsmallest` selects only
+    ``offset + limit`` rows, so a page costs O(n log k) instead of a sort.
+    Sort keys are materialised on first use of each order.
+    """
+
+    def __init__(self, processes: list[dict[str, Any]]) -> None:
+        self._processes = processes
+        self._by_user: dict[Optional[str], list[int]] = {}
+        for position, process in enumerate(processes):
+            self._by_user.setdefault(process.get("username"), []).append(position)
+        self._names = [str(process.get("name") or "").lower() for process in processes]
+        self._keys: dict[str, list[tuple[float, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._processes)
+
+    def _sort_keys(self, sort: str) -> list[tuple[float, int]]:
+        keys = self._keys.get(sort)
+        if keys is None:
+            key = _SORT_KEYS[sort]
+            # La posición desempata y mantiene el orden del colector
+            keys = self._keys[sort] = [(key(process), position) for position, process in enumerate(self._processes)]
+        return keys
+
+    def _candidates(self, filters: tuple[tuple[str, str], ...]) -> list[int] | range:
+        candidates: list[int] | range = range(len(self._processes))
+        for kind, needle in filters:
+            if kind == "user":
+                allowed = set(self._by_user.get(needle, ()))
+                candidates = [position for position in candidates if position in allowed]
+            else:
+                candidates = [position for position in candidates if needle in self._names[position]]
+        return candidates
+
+    def query(self, query: ProcessQuery) -> dict[str, Any]:
+        candidates = self._candidates(query.filters)
+        wanted = query.offset + query.limit
+        keys = self._sort_keys(query.sort)
+        selected = heapq.nsmallest(wanted, candidates, key=keys.__getitem__) if wanted else []
+        return {
+            "sort": query.sort,
+            "offset": query.offset,
+            "limit": query.limit,
+            "total": len(candidates),
+            "processes": [self._processes[position] for position in selected[query.offset:]],
+        }
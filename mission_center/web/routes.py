@@ -0,0 +1,147 @@
+"""Request parsing and page rendering shared by the server engines."""
+
+from __future__ import annotations
+
+import mimetypes
+import posixpath
+from pathlib import Path
+from functools import partial
+from typing import Any, Callable, Optional
+from urllib.parse import unquote
+
+from .payload import Fields, PublishedSnapshot, parse_fields
+from .process_index import ProcessQuery, parse_process_query
+from .template_renderer import SimpleTemplateRenderer
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+TEMPLATES_DIR = BASE_DIR / "templates"
+
+# Initialize template renderer
+template_renderer = SimpleTemplateRenderer(TEMPLATES_DIR)
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+# Rutas servidas desde el snapshot publicado (ETag y caché por tick)
+PUBLISHED_ROUTES = frozenset({"/api/current", "/api/processes"})
+
+
+def query_value(query: dict[str, list[str]], name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[-1] if values else None
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse ``range`` values such as ``900``, ``30m``, ``6h`` or ``1d`` into seconds."""
+
+    if not value:
+        return None
+    multiplier = _DURATION_UNITS.get(value[-1].lower())
+    number = value[:-1] if multiplier else value
+    try:
+        seconds = float(number) * (multiplier or 1)
+    except ValueError:
+        raise ValueError(f"Rango inválido: {value}") from None
+    if seconds <= 0:
+        raise ValueError(f"Rango inválido: {value}")
+    return seconds
+
+
+def parse_sequence(value: Optional[str]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        sequence = int(value)
+    except ValueError:
+        raise ValueError(f"Secuencia inválida: {value}") from None
+    if sequence < 0:
+        raise ValueError(f"Secuencia inválida: {value}")
+    return sequence
+
+
+def history_arguments(query: dict[str, list[str]]) -> dict[str, Any]:
+    """Keyword arguments for :meth:`DataCollector.history`; raises ``ValueError``."""
+
+    return {
+        "resolution": query_value(query, "resolution"),
+        "range_seconds": parse_duration(query_value(query, "range")),
+        "since": parse_sequence(query_value(query, "since")),
+    }
+
+
+def fields_argument(query: dict[str, list[str]]) -> Optional[Fields]:
+    """``fields=`` selection; ``sections=`` is kept as an alias for streams."""
+
+    return parse_fields(query_value(query, "fields") or query_value(query, "sections"))
+
+
+def process_arguments(query: dict[str, list[str]]) -> ProcessQuery:
+    return parse_process_query(
+        sort=query_value(query, "sort"),
+        limit=query_value(query, "limit"),
+        offset=query_value(query, "offset"),
+        filter_value=query_value(query, "filter"),
+    )
+
+
+def published_view(
+    published: PublishedSnapshot,
+    route: str,
+    query: dict[str, list[str]],
+) -> tuple[Any, Callable[[], bytes]]:
+    """Cache key and body builder for a :data:`PUBLISHED_ROUTES` request.
+
+    Raises ``ValueError`` on invalid parameters.
+    """
+
+    if route == "/api/processes":
+        process_query = process_arguments(query)
+        return ("processes", process_query), partial(published.processes, process_query)
+    fields = fields_argument(query)
+    return ("fields", fields), partial(published.projected, fields)
+
+
+def render_index() -> bytes:
+    try:
+        html = template_renderer.render("index_new.html")
+        content = html.encode("utf-8")
+    except Exception as template_error:
+        print(f"Template rendering error: {template_error}")
+        content = None
+
+    if content is None:
+        fallback_files = ["index_clean.html", "index.html"]
+        for candidate in fallback_files:
+            candidate_path = TEMPLATES_DIR / candidate
+            if candidate_path.exists():
+                try:
+                    content = candidate_path.read_text(encoding="utf-8").encode("utf-8")
+                    break
+                except Exception as read_error:
+                    print(f"Error loading fallback template {candidate}: {read_error}")
+                    continue
+
+    if content is None:
+        content = b"<html><body><h1>Mission Center</h1><p>Template error</p></body></html>"
+    return content
+
+
+def static_file(route: str) -> Optional[Path]:
+    """Map a URL path to a file under ``STATIC_DIR``; ``None`` if outside or missing."""
+
+    parts = [part for part in posixpath.normpath(unquote(route)).split("/") if part not in {"", ".", ".."}]
+    candidate = STATIC_DIR.joinpath(*parts)
+    if candidate.is_dir():
+        candidate = candidate / "index.html"
+    try:
+        candidate.resolve().relative_to(STATIC_DIR.resolve())
+    except ValueError:
+        return None
+    return candidate if candidate.is_file() else None
+
+
+def content_type(path: Path) -> str:
+    guessed, _ = mimetypes.guess_type(path.name)
+    guessed = guessed or "application/octet-stream"
+    if guessed.startswith("text/") or guessed in {"application/javascript", "application/json"}:
+        return f"{guessed}; charset=utf-8"
+    return guessed
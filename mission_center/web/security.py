@@ -0,0 +1,162 @@
+"""Origin, authentication and rate-limit checks shared by the server engines."""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Deque, Optional
+
+from mission_center.core.config import SECURITY, SecurityConfig
+
+logger = logging.getLogger(__name__)
+
+
+def error_body(error: str, message: str, **extra: str) -> bytes:
+    return json.dumps({"error": error, "message": message, **extra}).encode("utf-8")
+
+
+@dataclass(slots=True)
+class GuardResponse:
+    """Response an engine must send instead of handling the request."""
+
+    status: HTTPStatus
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    body: bytes = b""
+
+
+class RequestGuard:
+    """Applies the :class:`SecurityConfig` rules to one request at a time.
+
+    The guard only inspects header values and returns headers or a
+    :class:`GuardResponse`, so the threaded and asyncio engines render the
+    same decisions. One instance is shared per server because it holds the
+    rate-limit windows.
+    """
+
+    def __init__(self, security: SecurityConfig = SECURITY) -> None:
+        self.security = security
+        self._rate_lock = threading.Lock()
+        self._request_log: dict[str, Deque[float]] = {}
+
+    def check_api(
+        self,
+        origin: Optional[str],
+        authorization: Optional[str],
+        client_ip: str,
+    ) -> tuple[Optional[str], Optional[GuardResponse]]:
+        """Return the CORS origin to echo and, if rejected, the response to send."""
+
+        allowed, response_origin = self.resolve_origin(origin)
+        if not allowed:
+            logger.warning("Solicitud bloqueada por CORS desde %s: Origin no autorizado", client_ip)
+            return None, self._forbidden("Origin no autorizado")
+        if not self.check_basic_auth(authorization):
+            return response_origin, GuardResponse(
+                HTTPStatus.UNAUTHORIZED,
+                [
+                    *self.cors_headers(response_origin),
+                    ("WWW-Authenticate", 'Basic realm="Mission Center", charset="UTF-8"'),
+                    ("Content-Length", "0"),
+                ],
+            )
+        if not self.allow_request(client_ip):
+            logger.warning("Rate limit excedido para %s", client_ip)
+            retry_after = str(self.security.rate_limit_window_seconds)
+            body = json.dumps({"error": "rate_limit", "retry_after": retry_after}).encode("utf-8")
+            return response_origin, GuardResponse(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                [
+                    *self.cors_headers(response_origin),
+                    ("Content-Type", "application/json; charset=utf-8"),
+                    ("Retry-After", retry_after),
+                    ("Content-Length", str(len(body))),
+                ],
+                body,
+            )
+        return response_origin, None
+
+    def preflight(self, origin: Optional[str], client_ip: str) -> GuardResponse:
+        """Return the answer to an ``OPTIONS`` request."""
+
+        allowed, response_origin = self.resolve_origin(origin)
+        if not allowed:
+            logger.warning("Solicitud bloqueada por CORS desde %s: Origin no autorizado", client_ip)
+            return self._forbidden("Origin no autorizado")
+        return GuardResponse(
+            HTTPStatus.NO_CONTENT,
+            [
+                *self.cors_headers(response_origin),
+                ("Access-Control-Allow-Methods", "GET, OPTIONS"),
+                ("Access-Control-Allow-Headers", "Authorization, Content-Type"),
+                ("Access-Control-Max-Age", "600"),
+            ],
+        )
+
+    def resolve_origin(self, origin: Optional[str]) -> tuple[bool, Optional[str]]:
+        allowed = self.security.allowed_origins
+        if origin:
+            if "*" in allowed or origin in allowed:
+                if "*" in allowed and not self.security.allow_credentials:
+                    return True, "*"
+                return True, origin
+            return False, None
+        if "*" in allowed and not self.security.allow_credentials:
+            return True, "*"
+        return True, None
+
+    def cors_headers(self, origin: Optional[str]) -> list[tuple[str, str]]:
+        allowed = self.security.allowed_origins
+        header_value: Optional[str] = origin
+        if origin is None and "*" in allowed and not self.security.allow_credentials:
+            header_value = "*"
+        headers: list[tuple[str, str]] = []
+        if header_value:
+            headers.append(("Access-Control-Allow-Origin", header_value))
+        if self.security.allow_credentials and header_value and header_value != "*":
+            headers.append(("Access-Control-Allow-Credentials", "true"))
+        headers.append(("Vary", "Origin"))
+        return headers
+
+    def check_basic_auth(self, header: Optional[str]) -> bool:
+        username = self.security.basic_auth_username
+        password = self.security.basic_auth_password
+        if not username or not password:
+            return True
+        if not header or not header.startswith("Basic "):
+            return False
+        token = header.split(" ", 1)[1]
+        try:
+            decoded = base64.b64decode(token).decode("utf-8")
+        except Exception:
+            return False
+        provided_user, _, provided_pass = decoded.partition(":")
+        return provided_user == username and provided_pass == password
+
+    def allow_request(self, client_ip: str) -> bool:
+        if not self.security.enable_rate_limit:
+            return True
+        now = time.monotonic()
+        window = max(1, self.security.rate_limit_window_seconds)
+        max_requests = max(1, self.security.rate_limit_requests)
+        with self._rate_lock:
+            bucket = self._request_log.setdefault(client_ip, deque())
+            while bucket and now - bucket[0] > window:
+                bucket.popleft()
+            if len(bucket) >= max_requests:
+                return False
+            bucket.append(now)
+        return True
+
+    def _forbidden(self, message: str) -> GuardResponse:
+        body = error_body("forbidden", message)
+        return GuardResponse(
+            HTTPStatus.FORBIDDEN,
+            [("Content-Type", "application/json; charset=utf-8"), ("Content-Length", str(len(body)))],
+            body,
+        )
@@ -2,28 +2,24 @@
 
 from __future__ import annotations
 
-import base64
 import json
 import logging
+import socket
 import threading
-import time
-from collections import deque
 from functools import partial
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
-from pathlib import Path
-from typing import Any, ClassVar, Deque, Optional
+from typing import Any, ClassVar, Optional, Union
+from urllib.parse import parse_qs, urlsplit
 
+from .async_server import AsyncMissionCenterServer
 from .collector import DataCollector, collector
-from .template_renderer import SimpleTemplateRenderer
-from mission_center.core.config import SECURITY
+from .encoding import ResponseCompressor
+from .payload import Fields
+from .routes import PUBLISHED_ROUTES, STATIC_DIR, fields_argument, history_arguments, published_view, render_index
+from .security import GuardResponse, RequestGuard, error_body
+from mission_center.core.config import SECURITY, SERVER, ServerConfig
 
-BASE_DIR = Path(__file__).resolve().parent
-STATIC_DIR = BASE_DIR / "static"
-TEMPLATES_DIR = BASE_DIR / "templates"
-
-# Initialize template renderer
-template_renderer = SimpleTemplateRenderer(TEMPLATES_DIR)
 logger = logging.getLogger(__name__)
 
 
@@ -31,77 +27,80 @@ class MissionCenterRequestHandler(SimpleHTTPRequestHandler):
     """Custom handler that serves static assets and JSON APIs."""
 
     server_version: ClassVar[str] = "MissionCenterWeb/1.0"
-    _rate_lock: ClassVar[threading.Lock] = threading.Lock()
-    _request_log: ClassVar[dict[str, Deque[float]]] = {}
+    _stream_lock: ClassVar[threading.Lock] = threading.Lock()
+    _stream_clients: ClassVar[int] = 0
 
     def __init__(
         self,
         *args: Any,
         data_collector: DataCollector,
-        security_config = SECURITY,
+        request_guard: RequestGuard,
+        server_config = SERVER,
         **kwargs: Any,
     ) -> None:
         self._collector = data_collector
-        self._security = security_config
+        self._guard = request_guard
+        self._server_config = server_config
+        self._compressor = ResponseCompressor(server_config)
         self._response_origin: Optional[str] = None
         super().__init__(*args, directory=str(STATIC_DIR), **kwargs)
 
     def do_GET(self) -> None:  # noqa: N802
         self._response_origin = None
-        if self.path in {"/", "/index.html"}:
+        url = urlsplit(self.path)
+        route = url.path
+        query = parse_qs(url.query)
+        if route in {"/", "/index.html"}:
             self._send_index()
             return
-        if self.path == "/api/current":
+        if route in PUBLISHED_ROUTES:
             if not self._prepare_api_request():
                 return
-            self._send_json(self._collector.snapshot())
+            published = self._collector.published()
+            try:
+                key, build = published_view(published, route, query)
+            except ValueError as exc:
+                self._bad_request(str(exc))
+                return
+            body, etag, encoding = self._compressor.cached(
+                published, key, build, self.headers.get("Accept-Encoding")
+            )
+            if self.headers.get("If-None-Match") == etag:
+                self._send_not_modified(etag)
+                return
+            self._send_body(body, etag=etag, encoding=encoding)
             return
-        if self.path == "/api/history":
+        if route == "/api/stream":
             if not self._prepare_api_request():
                 return
-            self._send_json(self._collector.history())
+            try:
+                fields = fields_argument(query)
+            except ValueError as exc:
+                self._bad_request(str(exc))
+                return
+            self._stream(fields)
+            return
+        if route == "/api/history":
+            if not self._prepare_api_request():
+                return
+            try:
+                history = self._collector.history(**history_arguments(query))
+            except ValueError as exc:
+                self._bad_request(str(exc))
+                return
+            self._send_json(history)
             return
         super().do_GET()
 
     def do_OPTIONS(self) -> None:  # noqa: N802
-        allowed, origin = self._resolve_origin()
-        if not allowed:
-            return
-        self._response_origin = origin
-        self.send_response(HTTPStatus.NO_CONTENT)
-        self._apply_cors_headers(origin)
-        self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
-        self.send_header("Access-Control-Max-Age", "600")
-        self.end_headers()
+        self._send_guard_response(self._guard.preflight(self.headers.get("Origin"), self.client_address[0]))
 
     def log_message(self, format: str, *args: Any) -> None:  # noqa: A003 - parity with BaseHTTPRequestHandler
         # Silence default stdout logging to keep console clean.
         return
 
     def _send_index(self) -> None:
-        try:
-            html = template_renderer.render("index_new.html")
-            content = html.encode("utf-8")
-        except Exception as template_error:
-            print(f"Template rendering error: {template_error}")
-            content = None
-
-        if content is None:
-            fallback_files = ["index_clean.html", "index.html"]
-            for candidate in fallback_files:
-                candidate_path = TEMPLATES_DIR / candidate
-                if candidate_path.exists():
-                    try:
-                        content = candidate_path.read_text(encoding="utf-8").encode("utf-8")
-                        break
-                    except Exception as read_error:
-                        print(f"Error loading fallback template {candidate}: {read_error}")
-                        continue
-
-        if content is None:
-            content = b"<html><body><h1>Mission Center</h1><p>Template error</p></body></html>"
-
+        content = render_index()
         self.send_response(HTTPStatus.OK)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", str(len(content)))
@@ -109,107 +108,111 @@ class MissionCenterRequestHandler(SimpleHTTPRequestHandler):
         self.wfile.write(content)
 
     def _send_json(self, payload: Any) -> None:
-        body = json.dumps(payload or {}).encode("utf-8")
+        body, encoding = self._compressor.encode(
+            json.dumps(payload or {}).encode("utf-8"), self.headers.get("Accept-Encoding")
+        )
+        self._send_body(body, encoding=encoding)
+
+    def _send_body(self, body: bytes, *, etag: Optional[str] = None, encoding: Optional[str] = None) -> None:
         self.send_response(HTTPStatus.OK)
         self._apply_cors_headers(self._response_origin)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
-    def _prepare_api_request(self) -> bool:
-        allowed, origin = self._resolve_origin()
-        if not allowed:
-            return False
-        self._response_origin = origin
-        if not self._check_basic_auth():
-            self._require_auth()
-            return False
-        if not self._enforce_rate_limit():
-            return False
-        return True
-
-    def _resolve_origin(self) -> tuple[bool, Optional[str]]:
-        origin = self.headers.get("Origin")
-        allowed = self._security.allowed_origins
-        if origin:
-            if "*" in allowed or origin in allowed:
-                if "*" in allowed and not self._security.allow_credentials:
-                    return True, "*"
-                return True, origin
-            self._respond_forbidden("Origin no autorizado")
-            return False, None
-        if "*" in allowed and not self._security.allow_credentials:
-            return True, "*"
-        return True, None
+    def _stream(self, fields: Optional[Fields]) -> None:
+        """Push one Server-Sent Events frame per collector tick.
+
+        Each iteration sends the latest published snapshot, so a client that
+        cannot keep up skips intermediate ticks instead of queueing them, and a
+        write blocked longer than ``stream_write_timeout_seconds`` drops the
+        connection.
+        """
+
+        if not self._acquire_stream_slot():
+            body = error_body("unavailable", "Demasiados clientes de streaming")
+            self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+            self._apply_cors_headers(self._response_origin)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Retry-After", str(self._server_config.stream_keepalive_seconds))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        try:
+            self.send_response(HTTPStatus.OK)
+            self._apply_cors_headers(self._response_origin)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            self.connection.settimeout(self._server_config.stream_write_timeout_seconds)
+            self.wfile.write(b"retry: 3000\n\n")
+
+            last_sequence = -1
+            while self._collector.is_running():
+                published = self._collector.wait_for_publication(
+                    last_sequence, timeout=self._server_config.stream_keepalive_seconds
+                )
+                if published.sequence > last_sequence:
+                    self.wfile.write(published.sse_frame(fields))
+                    last_sequence = published.sequence
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass
+        finally:
+            self.close_connection = True
+            with self._stream_lock:
+                MissionCenterRequestHandler._stream_clients -= 1
 
-    def _apply_cors_headers(self, origin: Optional[str]) -> None:
-        allowed = self._security.allowed_origins
-        header_value: Optional[str] = origin
-        if origin is None and "*" in allowed and not self._security.allow_credentials:
-            header_value = "*"
-        if header_value:
-            self.send_header("Access-Control-Allow-Origin", header_value)
-        if self._security.allow_credentials and header_value and header_value != "*":
-            self.send_header("Access-Control-Allow-Credentials", "true")
-        self.send_header("Vary", "Origin")
-
-    def _check_basic_auth(self) -> bool:
-        username = self._security.basic_auth_username
-        password = self._security.basic_auth_password
-        if not username or not password:
+    def _acquire_stream_slot(self) -> bool:
+        with self._stream_lock:
+            if MissionCenterRequestHandler._stream_clients >= self._server_config.max_stream_clients:
+                return False
+            MissionCenterRequestHandler._stream_clients += 1
             return True
-        header = self.headers.get("Authorization")
-        if not header or not header.startswith("Basic "):
-            return False
-        token = header.split(" ", 1)[1]
-        try:
-            decoded = base64.b64decode(token).decode("utf-8")
-        except Exception:
-            return False
-        provided_user, _, provided_pass = decoded.partition(":")
-        return provided_user == username and provided_pass == password
 
-    def _require_auth(self) -> None:
-        self.send_response(HTTPStatus.UNAUTHORIZED)
+    def _send_not_modified(self, etag: str) -> None:
+        self.send_response(HTTPStatus.NOT_MODIFIED)
         self._apply_cors_headers(self._response_origin)
-        self.send_header("WWW-Authenticate", 'Basic realm="Mission Center", charset="UTF-8"')
-        self.send_header("Content-Length", "0")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", etag)
         self.end_headers()
 
-    def _enforce_rate_limit(self) -> bool:
-        if not self._security.enable_rate_limit:
-            return True
-        client_ip = self.client_address[0]
-        now = time.monotonic()
-        window = max(1, self._security.rate_limit_window_seconds)
-        max_requests = max(1, self._security.rate_limit_requests)
-        with self._rate_lock:
-            bucket = self._request_log.setdefault(client_ip, deque())
-            while bucket and now - bucket[0] > window:
-                bucket.popleft()
-            if len(bucket) >= max_requests:
-                self._too_many_requests()
-                return False
-            bucket.append(now)
+    def _prepare_api_request(self) -> bool:
+        origin, rejection = self._guard.check_api(
+            self.headers.get("Origin"), self.headers.get("Authorization"), self.client_address[0]
+        )
+        self._response_origin = origin
+        if rejection is not None:
+            self._send_guard_response(rejection)
+            return False
         return True
 
-    def _too_many_requests(self) -> None:
-        retry_after = str(self._security.rate_limit_window_seconds)
-        body = json.dumps({"error": "rate_limit", "retry_after": retry_after}).encode("utf-8")
-        logger.warning("Rate limit excedido para %s", self.client_address[0])
-        self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
-        self._apply_cors_headers(self._response_origin)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Retry-After", retry_after)
-        self.send_header("Content-Length", str(len(body)))
+    def _apply_cors_headers(self, origin: Optional[str]) -> None:
+        for name, value in self._guard.cors_headers(origin):
+            self.send_header(name, value)
+
+    def _send_guard_response(self, response: GuardResponse) -> None:
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(body)
+        if response.body:
+            self.wfile.write(response.body)
 
-    def _respond_forbidden(self, message: str) -> None:
-        logger.warning("Solicitud bloqueada por CORS desde %s: %s", self.client_address[0], message)
-        body = json.dumps({"error": "forbidden", "message": message}).encode("utf-8")
-        self.send_response(HTTPStatus.FORBIDDEN)
+    def _bad_request(self, message: str) -> None:
+        body = error_body("bad_request", message)
+        self.send_response(HTTPStatus.BAD_REQUEST)
+        self._apply_cors_headers(self._response_origin)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
@@ -219,13 +222,19 @@ class MissionCenterRequestHandler(SimpleHTTPRequestHandler):
 class MissionCenterServer:
     """Wraps the HTTP server and manages the shared data collector."""
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        server_config: ServerConfig = SERVER,
+    ) -> None:
         self._collector = collector
         self._collector.start()
         handler = partial(
             MissionCenterRequestHandler,
             data_collector=self._collector,
-            security_config=SECURITY,
+            request_guard=RequestGuard(SECURITY),
+            server_config=server_config,
         )
 
         # Mejorar manejo de puertos ocupados
@@ -234,7 +243,7 @@ class MissionCenterServer:
             try:
                 self._httpd = ThreadingHTTPServer((host, port + attempt), handler)
                 self.host = host
-                self.port = port + attempt
+                self.port = self._httpd.server_address[1]
                 break
             except OSError as e:
                 if e.errno == 98:  # Address already in use
@@ -271,10 +280,24 @@ class MissionCenterServer:
         return f"http://{host}:{port}"
 
 
-def create_app(host: str = "127.0.0.1", port: int = 8080) -> MissionCenterServer:
-    """Factory helper used by CLI scripts and tests."""
-
-    return MissionCenterServer(host=host, port=port)
+def create_app(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    engine: Optional[str] = None,
+    server_config: ServerConfig = SERVER,
+) -> Union[MissionCenterServer, AsyncMissionCenterServer]:
+    """Factory helper used by CLI scripts and tests.
+
+    ``engine`` selects ``"threading"`` (one thread per connection) or
+    ``"asyncio"`` (single event loop); it defaults to ``SERVER.engine``.
+    """
+
+    engine = engine or server_config.engine
+    if engine == "asyncio":
+        return AsyncMissionCenterServer(host=host, port=port, server_config=server_config)
+    if engine == "threading":
+        return MissionCenterServer(host=host, port=port, server_config=server_config)
+    raise ValueError(f"Motor de servidor desconocido: {engine}")
 
 
 def main() -> None:
@@ -1,4 +1,13 @@
 const DEFAULT_TIMEOUT = 5000;
+const PROCESS_ROWS = 20;
+// Secciones que pinta el tablero. Los procesos van en la misma respuesta, recortados
+// a las primeras filas (el colector ya los ordena por CPU): así cada ciclo hace solo
+// dos peticiones y queda por debajo del límite por defecto de 120 peticiones/minuto.
+const DASHBOARD_FIELDS = [
+    "cpu", "memory", "disk", "io", "network", "gpu", "pcie",
+    "temperature", "fans", "battery", "power", "system", "permissions",
+    `processes.top=${PROCESS_ROWS}`,
+].join(",");
 const DEFAULT_HEADERS = {
     Accept: "application/json",
     "Content-Type": "application/json",
@@ -43,6 +52,7 @@ export async function fetchJSON(url, { timeout = DEFAULT_TIMEOUT, headers = {},
     }
 }
 
-export async function fetchDashboardData() {
-    return Promise.all([fetchJSON("/api/current"), fetchJSON("/api/history")]);
+export async function fetchDashboardData(historySequence = null) {
+    const historyUrl = historySequence === null ? "/api/history" : `/api/history?since=${historySequence}`;
+    return Promise.all([fetchJSON(`/api/current?fields=${DASHBOARD_FIELDS}`), fetchJSON(historyUrl)]);
 }
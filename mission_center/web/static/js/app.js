@@ -6,6 +6,9 @@ const miniCharts = new Map();
 const coresHistory = new Map();
 let currentSection = "overview";
 const CORE_HISTORY_LENGTH = 60;
+const HISTORY_LIMITS = { gpu: 300, temperature: 300, fans: 300 };
+const DEFAULT_HISTORY_LIMIT = 60;
+let historyState = null;
 
 const NAV_ITEMS = Array.from(document.querySelectorAll(".nav-item"));
 
@@ -598,11 +601,11 @@ function updatePerformance(data) {
     }
 }
 
-function updateProcesses(data) {
+function updateProcesses(section) {
     const container = document.getElementById("processes-list");
     container.innerHTML = "";
-    const processes = data.processes?.processes || [];
-    processes.slice(0, 20).forEach((proc) => {
+    const processes = section?.processes || [];
+    processes.forEach((proc) => {
         const row = document.createElement("div");
         row.className = "table-row";
         row.innerHTML = `
@@ -757,14 +760,22 @@ function updateSystemInfo(data) {
     const devices = data.pcie?.devices || [];
     devices.forEach((device) => {
         const row = document.createElement("tr");
+        const ids = [device.vendor, device.device].filter(Boolean).join(" ");
+        const names = [device.vendor_name, device.device_name].filter(Boolean).join(" ");
         row.innerHTML = `
             <td>${device.address}</td>
-            <td>${[device.vendor, device.device].filter(Boolean).join(" ")}</td>
+            <td></td>
             <td class="numeric">${device.link_speed_gtps ? device.link_speed_gtps.toFixed(2) + " GT/s" : "--"}</td>
             <td class="numeric">${device.link_width ?? "--"}</td>
             <td class="numeric">${device.max_link_speed_gtps ? device.max_link_speed_gtps.toFixed(2) + " GT/s" : "--"}</td>
             <td class="numeric">${device.max_link_width ?? "--"}</td>
         `;
+        // Los nombres vienen de pci.ids: se insertan como texto, no como HTML
+        const nameCell = row.children[1];
+        nameCell.textContent = names || ids;
+        if (names && ids) {
+            nameCell.title = ids;
+        }
         tbody.appendChild(row);
     });
 }
@@ -779,7 +790,8 @@ async function updateLoop() {
     updateLoopRunning = true;
     
     try {
-        const [current, history] = await fetchDashboardData();
+        const [current, historyUpdate] = await fetchDashboardData(historyState ? historyState.sequence : null);
+        const history = mergeHistory(historyUpdate);
         
         // Reset retry count on successful fetch
         updateLoopRetryCount = 0;
@@ -790,7 +802,7 @@ async function updateLoop() {
             updateStatusMeta(current);
             updateOverview(current);
             updatePerformance(current);
-            updateProcesses(current);
+            updateProcesses(current.processes);
             updateSensorTables(current);
             updateSystemInfo(current);
             
@@ -826,6 +838,43 @@ async function updateLoop() {
     }
 }
 
+function appendSeries(existing = [], incoming = [], limit = DEFAULT_HISTORY_LIMIT) {
+    const lastSeq = existing.length ? existing[existing.length - 1].seq : -1;
+    const merged = existing.concat(incoming.filter((entry) => entry.seq > lastSeq));
+    return merged.length > limit ? merged.slice(merged.length - limit) : merged;
+}
+
+// Combina las muestras nuevas de /api/history?since=<seq> con el histórico local
+function mergeHistory(update) {
+    if (!update) return historyState;
+    if (!historyState) {
+        historyState = update;
+        return historyState;
+    }
+    if (update.sequence < historyState.sequence) {
+        // Servidor reiniciado sin históricos persistidos: recarga completa en el siguiente ciclo
+        historyState = null;
+        return null;
+    }
+    Object.entries(update).forEach(([key, series]) => {
+        if (Array.isArray(series)) {
+            historyState[key] = appendSeries(historyState[key], series, HISTORY_LIMITS[key] ?? DEFAULT_HISTORY_LIMIT);
+        }
+    });
+    const cores = historyState.cpu_cores || {};
+    Object.entries(update.cpu_cores || {}).forEach(([core, series]) => {
+        cores[core] = appendSeries(cores[core], series, CORE_HISTORY_LENGTH);
+    });
+    historyState.cpu_cores = cores;
+    const ioDevices = historyState.io_devices || {};
+    Object.entries(update.io_devices || {}).forEach(([device, series]) => {
+        ioDevices[device] = appendSeries(ioDevices[device], series, DEFAULT_HISTORY_LIMIT);
+    });
+    historyState.io_devices = ioDevices;
+    historyState.sequence = update.sequence;
+    return historyState;
+}
+
 function updateHistoryCharts(history) {
     if (!history) return;
     if (charts.cpu && history.cpu) {
@@ -1081,7 +1130,10 @@ function updateIODevicesGrid(io) {
             write_bytes_per_sec: 0, 
             read_count_per_sec: 0, 
             write_count_per_sec: 0, 
-            utilization_percent: 0 
+            utilization_percent: 0,
+            r_await_ms: 0,
+            w_await_ms: 0,
+            avg_queue_size: 0
         }]);
 
     const existingCards = grid.querySelectorAll('.io-device-card');
@@ -1133,6 +1185,14 @@ function createIODeviceCard(deviceName, stats) {
                 <span class="io-stat-label">W-IOPS</span>
                 <span class="io-stat-value io-write-iops">--</span>
             </div>
+            <div class="io-stat">
+                <span class="io-stat-label">Latencia R/W</span>
+                <span class="io-stat-value io-await">--</span>
+            </div>
+            <div class="io-stat">
+                <span class="io-stat-label">Cola</span>
+                <span class="io-stat-value io-queue">--</span>
+            </div>
         </div>
         <div class="io-utilization-bar">
             <div class="io-utilization-fill"></div>
@@ -1151,6 +1211,8 @@ function updateIODeviceCardData(card, deviceName, stats) {
     const readIopsEl = card.querySelector('.io-read-iops');
     const writeIopsEl = card.querySelector('.io-write-iops');
     const utilizationFillEl = card.querySelector('.io-utilization-fill');
+    const awaitEl = card.querySelector('.io-await');
+    const queueEl = card.querySelector('.io-queue');
     
     const readRate = formatBytes(stats.read_bytes_per_sec);
     const writeRate = formatBytes(stats.write_bytes_per_sec);
@@ -1162,6 +1224,8 @@ function updateIODeviceCardData(card, deviceName, stats) {
     if (writeRateEl) writeRateEl.textContent = `${writeRate}/s`;
     if (readIopsEl) readIopsEl.textContent = readOps;
     if (writeIopsEl) writeIopsEl.textContent = writeOps;
+    if (awaitEl) awaitEl.textContent = `${(stats.r_await_ms || 0).toFixed(1)} / ${(stats.w_await_ms || 0).toFixed(1)} ms`;
+    if (queueEl) queueEl.textContent = (stats.avg_queue_size || 0).toFixed(2);
     if (utilizationFillEl) {
         utilizationFillEl.style.width = `${utilization}%`;
     }
@@ -0,0 +1,106 @@
+"""Compara los backends de procesos (psutil y /proc) sobre un árbol sintético.
+
+Genera un directorio con la forma de ``/proc`` (``stat``, ``statm``, ``io``,
+``status`` y ``cmdline`` por PID) y mide cada backend apuntándolo allí: el de
+psutil mediante ``psutil.PROCFS_PATH`` y el nativo con su raíz configurable.
+Con ``--real`` se mide además sobre el ``/proc`` del sistema.
+
+    python scripts/bench_processes.py --processes 10000 --cycles 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import psutil
+
+from mission_center.data import processes
+from mission_center.data.processes import ProcessTable
+from mission_center.data.procfs import ProcfsProcessTable
+
+
+def build_tree(root: Path, count: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    uid = os.getuid()
+    btime = int(time.time()) - 86400
+    (root / "stat").write_text(f"cpu  1 0 1 1 0 0 0 0 0 0\nbtime {btime}\n")
+    (root / "uptime").write_text("86400.00 80000.00\n")
+    for pid in range(1000, 1000 + count):
+        directory = root / str(pid)
+        directory.mkdir()
+        name = rng.choice(["python3", "bash", "cc1plus", "ld.gold", "node", "rustc"])
+        utime, stime = rng.randint(0, 10**6), rng.randint(0, 10**5)
+        rss_pages = rng.randint(100, 500_000)
+        starttime = rng.randint(100, 8_000_000)
+        fields = [
+            "S", "1", str(pid), str(pid), "0", "-1", "4194304", "100", "0", "0", "0",
+            str(utime), str(stime), "0", "0", "20", str(rng.choice([0, 5, 10])), "1", "0",
+            str(starttime), str(rss_pages * 4096), str(rss_pages),
+            *(["0"] * 30),
+        ]
+        (directory / "stat").write_text(f"{pid} ({name}) {' '.join(fields)}\n")
+        (directory / "statm").write_text(f"{rss_pages * 2} {rss_pages} 100 10 0 {rss_pages} 0\n")
+        (directory / "io").write_text(
+            f"rchar: 1\nwchar: 1\nsyscr: 1\nsyscw: 1\nread_bytes: {rng.randint(0, 10**9)}\n"
+            f"write_bytes: {rng.randint(0, 10**9)}\ncancelled_write_bytes: 0\n"
+        )
+        (directory / "status").write_text(f"Name:\t{name}\nState:\tS (sleeping)\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n")
+        (directory / "cmdline").write_bytes(f"/usr/bin/{name}\0--jobs\0{pid}\0".encode())
+
+
+def measure(label: str, refresh: Callable[[], list], cycles: int) -> None:
+    started = time.perf_counter()
+    rows = refresh()  # primer ciclo: descubre procesos y lee atributos estáticos
+    first = time.perf_counter() - started
+    timings = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        rows = refresh()
+        timings.append(time.perf_counter() - started)
+    steady = sorted(timings)[len(timings) // 2]
+    print(f"{label:<18} {len(rows):>7} procesos  primer ciclo {first * 1000:8.1f} ms  "
+          f"ciclo estable (mediana) {steady * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=10_000)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--real", action="store_true", help="medir también sobre /proc")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mc-proc-") as directory:
+        root = Path(directory)
+        started = time.perf_counter()
+        build_tree(root, args.processes)
+        print(f"Árbol sintético con {args.processes} procesos en {time.perf_counter() - started:.1f} s")
+
+        # psutil lee nice con getpriority() sobre el PID real, que no existe
+        # en el árbol sintético: se omite solo en esta medición.
+        original_path, original_attrs = psutil.PROCFS_PATH, processes._DYNAMIC_ATTRS
+        psutil.PROCFS_PATH = str(root)
+        processes._DYNAMIC_ATTRS = [attr for attr in original_attrs if attr != "nice"]
+        try:
+            measure("psutil (sintético)", ProcessTable().refresh, args.cycles)
+        finally:
+            psutil.PROCFS_PATH, processes._DYNAMIC_ATTRS = original_path, original_attrs
+        measure("procfs (sintético)", ProcfsProcessTable(str(root)).refresh, args.cycles)
+
+    if args.real:
+        measure("psutil (/proc)", ProcessTable().refresh, args.cycles)
+        measure("procfs (/proc)", ProcfsProcessTable().refresh, args.cycles)
+
+
+if __name__ == "__main__":
+    main()
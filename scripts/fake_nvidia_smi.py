@@ -0,0 +1,64 @@
+"""Imita ``nvidia-smi --query-gpu ... --loop-ms`` para probar el backend de GPU sin hardware.
+
+Emite una fila CSV por GPU simulada y por iteración con los campos pedidos en
+``--query-gpu``. Sirve como ``COLLECTOR.gpu_command``:
+
+    gpu_command=("python", "scripts/fake_nvidia_smi.py", "--gpus", "2")
+
+``--exit-after N`` termina tras N iteraciones y ``--hang-after N`` deja de
+escribir sin salir, para ejercitar el reinicio automático.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+
+_NAMES = ("NVIDIA GeForce RTX 4090", "NVIDIA A100-SXM4-80GB", "NVIDIA L4", "NVIDIA T4")
+
+
+def _value(field: str, index: int, gpus: int, iteration: int) -> str:
+    wave = (math.sin(iteration / 5 + index) + 1) / 2
+    values = {
+        "index": str(index),
+        "count": str(gpus),
+        "name": _NAMES[index % len(_NAMES)],
+        "utilization.gpu": str(round(wave * 100)),
+        "memory.total": "24564",
+        "memory.used": str(round(1024 + wave * 20000)),
+        "temperature.gpu": str(round(40 + wave * 40)),
+        "clocks.current.graphics": str(round(1200 + wave * 1300)),
+        "clocks.current.memory": "10501",
+    }
+    return values.get(field, "[Not Supported]")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gpus", type=int, default=1)
+    parser.add_argument("--exit-after", type=int, default=0)
+    parser.add_argument("--hang-after", type=int, default=0)
+    parser.add_argument("--query-gpu", default="index,name")
+    parser.add_argument("--format", default="csv,noheader,nounits")
+    parser.add_argument("--loop-ms", type=int, default=0)
+    args = parser.parse_args(argv)
+    fields = args.query_gpu.split(",")
+
+    iteration = 0
+    while True:
+        iteration += 1
+        for index in range(args.gpus):
+            print(", ".join(_value(field, index, args.gpus, iteration) for field in fields))
+        sys.stdout.flush()
+        if not args.loop_ms or iteration == args.exit_after:
+            return 0
+        if iteration == args.hang_after:
+            while True:
+                time.sleep(3600)
+        time.sleep(args.loop_ms / 1000)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ import json
 import sys
 import threading
 import time
+import urllib.error
 import urllib.request
 from pathlib import Path
 
@@ -37,6 +38,14 @@ def run_smoke() -> None:
         assert "cpu" in current, "Snapshot sin datos de CPU"
         assert "memory" in current, "Snapshot sin datos de memoria"
         assert "cpu" in history, "Histórico sin serie de CPU"
+        # Un selector con erratas devuelve la sección vacía (o un 400), nunca corta la conexión
+        try:
+            typo = fetch_json(f"{address}/api/current?fields=processes.processes.bogus,disk.devices.bogus")
+        except urllib.error.HTTPError as error:
+            assert error.code == 400, f"Selector erróneo respondió {error.code}"
+        else:
+            assert typo.get("processes", {}) == {}, "Selector erróneo en lista de procesos"
+            assert typo.get("disk", {}) == {}, "Selector erróneo en lista de discos"
         print("SMOKE_OK", {
             "cpu_usage": current.get("cpu", {}).get("usage_percent"),
             "history_points": len(history.get("cpu", [])),